@@ -0,0 +1,87 @@
+'''Benchmark the Connect client against the mock Connect server.
+
+Measures commands/s (one at a time and batched), report throughput, and
+the time to build a scenario, so client-side regressions can be tracked
+without STK. Use --latency to add a delay before each response.
+
+    python benchmarks/bench_connect.py [--commands 10000] [--report-rows 86400] [--satellites 100]
+'''
+import sys
+import argparse
+import datetime
+import time as timer
+
+from systemstoolkit.connect import Connect, ConnectMetrics, protocol
+from systemstoolkit.connect.mock_server import MockConnectServer, make_report
+
+
+EPOCH = datetime.datetime(2022, 7, 1)
+
+
+def elapsed(func, *args) -> float:
+    start = timer.perf_counter()
+    func(*args)
+    return timer.perf_counter() - start
+
+
+def send_commands(c: Connect, n: int) -> None:
+    for i in range(n):
+        c.send(f'SetAttitude */Satellite/Sat{i} Profile Fixed')
+
+
+def send_batch(c: Connect, n: int) -> None:
+    with c.batch():
+        send_commands(c, n)
+
+
+def get_report(c: Connect, repeat: int, array: bool) -> None:
+    for _ in range(repeat):
+        c.send('Report_RM */Satellite/Sat1 Style "Cartesian Position"')
+        c.get_report_array() if array else c.get_report()
+
+
+def build_scenario(c: Connect, nsats: int) -> None:
+    c.new_scenario('Bench')
+    for i in range(nsats):
+        sat = c.new_satellite(f'Sat{i}')
+        sat.set_state_classical(EPOCH, [7000e3, 0, 45, 0, 0, i], coord='J2000')
+        sat.report('Cartesian Position')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--commands', type=int, default=10_000)
+    parser.add_argument('--report-rows', type=int, default=86_400)
+    parser.add_argument('--reports', type=int, default=3)
+    parser.add_argument('--satellites', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0, help='Server delay per read of commands [s]')
+    parser.add_argument('--metrics', action='store_true',
+                        help='Collect ConnectMetrics, and print them for each connection')
+    args = parser.parse_args()
+    hooks = lambda: [ConnectMetrics(sys.stdout)] if args.metrics else []
+
+    rows = make_report(args.report_rows)
+    with MockConnectServer(latency=args.latency) as server:
+        server.report(rows)
+        with Connect(*server.address, hooks=hooks()) as c:
+            t = elapsed(send_commands, c, args.commands)
+            print(f'send:           {args.commands / t:>12,.0f} commands/s')
+
+            t = elapsed(send_batch, c, args.commands)
+            print(f'batch:          {args.commands / t:>12,.0f} commands/s')
+
+            size = len(protocol.encode_multi_message('REPORT_RM', rows))
+            print(f'report ({args.report_rows} rows, {size / 1e6:.1f} MB):')
+            for array in (False, True):
+                t = elapsed(get_report, c, args.reports, array)
+                name = 'get_report_array' if array else 'get_report'
+                print(f'  {name + ":":<16}{args.reports * size / t / 1e6:>10,.1f} MB/s')
+
+        server.report(make_report(60))
+        with Connect(*server.address, hooks=hooks()) as c:
+            t = elapsed(build_scenario, c, args.satellites)
+            print(f'scenario build: {t:>12.3f} s ({args.satellites} satellites)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+'''Time writing one Attitude File per satellite of a constellation.
+
+Compares calling attitude_file() in a loop, without and with a shared
+TimeCache, with attitude_files() at each number of workers. Files are written to a temporary directory.
+
+    python benchmarks/bench_constellation.py [--vehicles 200] [--rows 10000] [--workers 1 2 4] [--time-format EpSec]
+'''
+import os
+import argparse
+import tempfile
+import time as timer
+import numpy as np
+
+from systemstoolkit.files.builders import attitude_file, attitude_files
+from systemstoolkit.files.timecache import TimeCache
+
+
+def make_constellation(nvehicles: int, nrows: int):
+    rng = np.random.default_rng(0)
+    time = np.datetime64('2022-07-11T00:00:00.000') + np.arange(nrows) * np.timedelta64(1, 's')
+    data = rng.standard_normal((nvehicles, nrows, 4))
+    data /= np.linalg.norm(data, axis=2)[:, :, None]
+    return time, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--vehicles', type=int, default=200)
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--time-format', default='EpSec')
+    args = parser.parse_args()
+
+    time, data = make_constellation(args.vehicles, args.rows)
+    print(f'{args.vehicles} vehicles x {args.rows} rows, {args.time_format}, {os.cpu_count()} cpus')
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = timer.perf_counter()
+        for i, vehicle in enumerate(data):
+            attitude_file(time, vehicle, format='Quaternions', time_format=args.time_format, file=os.path.join(directory, f'Loop{i}.a'))
+        baseline = timer.perf_counter() - start
+        print(f'{"loop":>10} {baseline:>8.2f} s {args.vehicles / baseline:>8.1f} files/s')
+
+        cache = TimeCache()
+        start = timer.perf_counter()
+        for i, vehicle in enumerate(data):
+            attitude_file(
+                time, vehicle, format='Quaternions', time_format=args.time_format, time_cache=cache,
+                file=os.path.join(directory, f'Cached{i}.a'),
+            )
+        elapsed = timer.perf_counter() - start
+        print(f'{"cached":>10} {elapsed:>8.2f} s {args.vehicles / elapsed:>8.1f} files/s {baseline / elapsed:>6.2f}x')
+
+        for workers in args.workers:
+            start = timer.perf_counter()
+            results = attitude_files(time, data, directory, format='Quaternions', time_format=args.time_format, workers=workers)
+            elapsed = timer.perf_counter() - start
+            errors = sum(result.Error is not None for result in results)
+            print(
+                f'{f"{workers} workers":>10} {elapsed:>8.2f} s {args.vehicles / elapsed:>8.1f} files/s'
+                f' {baseline / elapsed:>6.2f}x, {errors} errors'
+            )
+
+
+if __name__ == '__main__':
+    main()
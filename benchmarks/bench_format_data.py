@@ -0,0 +1,60 @@
+'''Benchmark attitude data formatting against the original row-by-row loop.
+
+    python benchmarks/bench_format_data.py [--rows 10000 1000000 10000000] [--loop-max 1000000]
+'''
+import io
+import argparse
+import time as timer
+import numpy as np
+
+from systemstoolkit.files.formatters import format_rows
+from systemstoolkit.units.time import EpSecTimeUnit
+
+
+def format_rows_loop(time, data):
+    buf = io.StringIO()
+    for t, row in zip(time, data):
+        print(
+            str(t).rjust(15),
+            ' '.join([f'{x:.6f}'.rjust(15) for x in row]),
+            file=buf
+        )
+    return buf.getvalue()
+
+
+def quaternions(nrows: int):
+    '''A 10 Hz EpSec time column and a unit-quaternion history.'''
+    rng = np.random.default_rng(0)
+    epoch = np.datetime64('2022-07-11T00:00:00.000')
+    time = EpSecTimeUnit(epoch).convert(epoch + np.arange(nrows) * np.timedelta64(100, 'ms'))
+    data = rng.standard_normal((nrows, 4))
+    data /= np.linalg.norm(data, axis=1)[:, None]
+    return time, data
+
+
+def rate(func, time, data) -> float:
+    start = timer.perf_counter()
+    func(time, data)
+    return time.size / (timer.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument('--loop-max', type=int, default=1_000_000,
+                        help='Skip the original loop above this many rows')
+    args = parser.parse_args()
+
+    print(f'{"rows":>12} {"loop rows/s":>14} {"array rows/s":>14} {"speedup":>8}')
+    for nrows in args.rows:
+        time, data = quaternions(nrows)
+        fast = rate(format_rows, time, data)
+        if nrows <= args.loop_max:
+            slow = rate(format_rows_loop, time, data)
+            print(f'{nrows:>12} {slow:>14,.0f} {fast:>14,.0f} {fast / slow:>7.1f}x')
+        else:
+            print(f'{nrows:>12} {"-":>14} {fast:>14,.0f} {"-":>8}')
+
+
+if __name__ == '__main__':
+    main()
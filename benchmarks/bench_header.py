@@ -0,0 +1,68 @@
+'''Check that rendering the header keywords does not scale with the data size.
+
+Times AttitudeFile.keywords() against the old asdict() based rendering,
+and exits with an error if keywords() on the largest file takes more than
+--max-ratio times as long as on the smallest.
+
+    python benchmarks/bench_header.py [--rows 1000 1000000 10000000] [--max-ratio 5]
+'''
+import sys
+import argparse
+import time as timer
+from dataclasses import asdict
+import numpy as np
+
+from systemstoolkit.files.files import AttitudeFile
+from systemstoolkit.files.formats import AttitudeFileFormat
+from systemstoolkit.files.keywords import Keyword, ScenarioEpoch
+
+
+def make_file(nrows: int) -> AttitudeFile:
+    time = np.datetime64('2022-07-11T00:00:00.000') + np.arange(nrows) * np.timedelta64(100, 'ms')
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (nrows, 1))
+    afile = AttitudeFile(time, data, format=AttitudeFileFormat('Quaternions'))
+    afile.epoch = ScenarioEpoch(time[0])
+    return afile
+
+
+def keywords_asdict(afile: AttitudeFile) -> str:
+    lines = []
+    for key in asdict(afile).keys():
+        keyword_obj = getattr(afile, key)
+        if isinstance(keyword_obj, Keyword):
+            lines.append(str(keyword_obj))
+    return '\n'.join(lines) + '\n'
+
+
+def best_time(func, afile, repeat: int = 5) -> float:
+    times = []
+    for _ in range(repeat):
+        start = timer.perf_counter()
+        func(afile)
+        times.append(timer.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 1_000_000, 10_000_000])
+    parser.add_argument('--max-ratio', type=float, default=5)
+    args = parser.parse_args()
+
+    print(f'{"rows":>12} {"asdict ms":>10} {"keywords() ms":>14}')
+    results = []
+    for nrows in args.rows:
+        afile = make_file(nrows)
+        old = best_time(keywords_asdict, afile, repeat=1)
+        new = best_time(AttitudeFile.keywords, afile)
+        results.append(new)
+        print(f'{nrows:>12} {old * 1e3:>10.2f} {new * 1e3:>14.3f}')
+
+    ratio = results[-1] / results[0]
+    print(f'keywords() time ratio, largest to smallest file: {ratio:.2f}')
+    if ratio > args.max_ratio:
+        sys.exit(f'Header rendering scales with the data size (ratio {ratio:.1f} > {args.max_ratio})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+'''Benchmark creating satellites one at a time against Connect.new_satellites(),
+on the mock Connect server.
+
+    python benchmarks/bench_new_objects.py [--counts 1000 10000] [--latency 0.0002]
+'''
+import argparse
+import datetime
+import time as timer
+import numpy as np
+
+from systemstoolkit.connect import Connect
+from systemstoolkit.connect.mock_server import MockConnectServer
+
+
+EPOCH = datetime.datetime(2022, 7, 1)
+
+
+def one_at_a_time(c: Connect, names: list, states: np.ndarray) -> None:
+    for name, state in zip(names, states):
+        sat = c.new_satellite(name)
+        sat.set_state_cartesian(EPOCH, state, coord='J2000')
+
+
+def bulk(c: Connect, names: list, states: np.ndarray) -> None:
+    c.new_satellites(names, states, EPOCH, coord='J2000')
+
+
+def elapsed(address, func, names, states) -> float:
+    with Connect(*address) as c:
+        c.new_scenario('Bench')
+        start = timer.perf_counter()
+        func(c, names, states)
+        return timer.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1_000, 10_000])
+    parser.add_argument('--latency', type=float, default=0,
+                        help='Server delay per read of commands [s], e.g. a network round trip')
+    args = parser.parse_args()
+
+    print(f'{"satellites":>10} {"one at a time s":>16} {"new_satellites s":>17} {"speedup":>8}')
+    with MockConnectServer(latency=args.latency) as server:
+        for count in args.counts:
+            names = [f'Sat{i}' for i in range(count)]
+            states = np.random.default_rng(0).uniform(-7000e3, 7000e3, (count, 6))
+            slow = elapsed(server.address, one_at_a_time, names, states)
+            fast = elapsed(server.address, bulk, names, states)
+            print(f'{count:>10} {slow:>16.3f} {fast:>17.3f} {slow / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
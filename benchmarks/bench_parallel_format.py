@@ -0,0 +1,47 @@
+'''Time writing a large Attitude File with the data formatted in 1 to N processes.
+
+    python benchmarks/bench_parallel_format.py [--rows 5000000] [--workers 1 2 4 8] [--time-format EpSec]
+
+Each run writes to /dev/null, and the speedup is relative to 1 worker.
+Scaling depends on the number of cores available (os.cpu_count() is printed).
+'''
+import os
+import argparse
+import time as timer
+import numpy as np
+
+from systemstoolkit.files.files import AttitudeFile
+from systemstoolkit.files.formats import AttitudeFileFormat
+from systemstoolkit.files.keywords import TimeFormat
+
+
+def make_file(nrows: int, time_format: str) -> AttitudeFile:
+    rng = np.random.default_rng(0)
+    time = np.datetime64('2022-07-11T00:00:00.000') + np.arange(nrows) * np.timedelta64(10, 'ms')
+    data = rng.standard_normal((nrows, 4))
+    data /= np.linalg.norm(data, axis=1)[:, None]
+    return AttitudeFile(time, data, format=AttitudeFileFormat('Quaternions'), time_fmt=TimeFormat(time_format))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--time-format', default='EpSec')
+    args = parser.parse_args()
+
+    afile = make_file(args.rows, args.time_format)
+    print(f'{args.rows} rows, {args.time_format}, {os.cpu_count()} cpus')
+    print(f'{"workers":>8} {"seconds":>9} {"rows/s":>12} {"speedup":>8}')
+    baseline = None
+    for workers in args.workers:
+        start = timer.perf_counter()
+        with open(os.devnull, 'w') as fd:
+            afile.write(fd, workers=workers)
+        elapsed = timer.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f'{workers:>8} {elapsed:>9.2f} {args.rows / elapsed:>12.0f} {baseline / elapsed:>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+'''Benchmark the bulk attitude file reader against utils.read_file_data.
+
+    python benchmarks/bench_read_file.py [--rows 10000 1000000] [--loop-max 1000000]
+'''
+import os
+import argparse
+import tempfile
+import time as timer
+import numpy as np
+
+from systemstoolkit.files.builders import attitude_file
+from systemstoolkit.files.readers import read_attitude_file
+from systemstoolkit.utils import read_file_data
+
+
+def write_quaternion_file(path: str, nrows: int) -> None:
+    rng = np.random.default_rng(0)
+    time = np.datetime64('2022-07-11T00:00:00.000') + np.arange(nrows) * np.timedelta64(100, 'ms')
+    data = rng.standard_normal((nrows, 4))
+    data /= np.linalg.norm(data, axis=1)[:, None]
+    text = attitude_file(time, data, format='Quaternions')
+
+    # read_file_data cannot handle blank lines
+    with open(path, 'w') as fd:
+        fd.writelines(line for line in text.splitlines(keepends=True) if line.strip())
+
+
+def rate(func, path, nrows) -> float:
+    start = timer.perf_counter()
+    func(path)
+    return nrows / (timer.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 1_000_000])
+    parser.add_argument('--loop-max', type=int, default=1_000_000,
+                        help='Skip read_file_data above this many rows')
+    args = parser.parse_args()
+
+    print(f'{"rows":>12} {"read_file_data rows/s":>22} {"read_attitude_file rows/s":>26} {"speedup":>8}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for nrows in args.rows:
+            path = os.path.join(tmp, f'bench_{nrows}.a')
+            write_quaternion_file(path, nrows)
+
+            fast = rate(read_attitude_file, path, nrows)
+            if nrows <= args.loop_max:
+                slow = rate(read_file_data, path, nrows)
+                print(f'{nrows:>12} {slow:>22,.0f} {fast:>26,.0f} {fast / slow:>7.1f}x')
+            else:
+                print(f'{nrows:>12} {"-":>22} {fast:>26,.0f} {"-":>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+'''Benchmark parsing Report_RM rows into an array, against a row by row loop.
+
+    python benchmarks/bench_report.py [--days 1 7] [--step 1]
+'''
+import argparse
+import time as timer
+import numpy as np
+
+from systemstoolkit.connect.reports import parse_report
+from systemstoolkit.utils import parse_stk_datetime, stk_datetime
+
+
+def make_rows(nrows: int, step: float) -> list:
+    start = np.datetime64('2022-07-01T00:00:00', 'ms')
+    times = start + (np.arange(nrows) * step * 1000).astype('timedelta64[ms]')
+    values = np.random.default_rng(0).uniform(-7000, 7000, (nrows, 3))
+    rows = ['Time (UTCG),x (km),y (km),z (km)']
+    rows += [
+        f'{stk_datetime(t).lstrip("0")},{x:.6f},{y:.6f},{z:.6f}'
+        for t, (x, y, z) in zip(times, values)
+    ]
+    return rows
+
+
+def parse_loop(rows: list) -> tuple:
+    times, values = [], []
+    for row in rows[1:]:
+        parts = row.split(',')
+        times.append(parse_stk_datetime(parts[0]))
+        values.append([float(x) for x in parts[1:]])
+    return np.array(times), np.array(values)
+
+
+def elapsed(func, rows) -> float:
+    start = timer.perf_counter()
+    func(rows)
+    return timer.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--days', type=float, nargs='+', default=[1, 7])
+    parser.add_argument('--step', type=float, default=1, help='Report time step [s]')
+    parser.add_argument('--loop-max', type=int, default=100_000,
+                        help='Time the loop on this many rows, and scale up')
+    args = parser.parse_args()
+
+    print(f'{"days":>6} {"rows":>10} {"loop s":>10} {"parse_report s":>15} {"rows/s":>12} {"speedup":>8}')
+    for days in args.days:
+        nrows = int(days * 86400 / args.step)
+        rows = make_rows(nrows, args.step)
+
+        fast = elapsed(parse_report, rows)
+        sample = min(nrows, args.loop_max)
+        slow = elapsed(parse_loop, rows[:sample + 1]) * nrows / sample
+        print(f'{days:>6g} {nrows:>10} {slow:>10.2f} {fast:>15.2f} {nrows / fast:>12,.0f} {slow / fast:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
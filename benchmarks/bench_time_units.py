@@ -0,0 +1,69 @@
+'''Benchmark the civil-date time units against the original datetime64-cast versions.
+
+Converts --rows timestamps to YYYYDDD and YYYYMMDD values and ISO-YMD
+text both ways, checks the results match, and prints the time of each,
+and of the exact to_text() forms of YYYYDDD and YYYYMMDD.
+
+    python benchmarks/bench_time_units.py [--rows 10000000] [--resolution ms]
+'''
+import argparse
+import time as timer
+import numpy as np
+
+from systemstoolkit.units.time import YYYYDDDTimeUnit, YYYYMMDDTimeUnit, ISOYMDTimeUnit
+
+
+def yyyyddd_casts(time):
+    day = time.astype('datetime64[D]')
+    year = day.astype('datetime64[Y]')
+    doy = day - year
+    frac_day = (time - day) / np.timedelta64(1, 'D')
+    return 1000 * (1970 + year.astype('uint32')) + (doy.astype('uint32') + 1 + frac_day.astype('float64'))
+
+
+def yyyymmdd_casts(time):
+    day = time.astype('datetime64[D]')
+    mon = time.astype('datetime64[M]')
+    year = time.astype('datetime64[Y]')
+    frac_day = ((time - day) / np.timedelta64(1, 'D')).astype('float64')
+    y = 10000 * (year.astype('uint32') + 1970)
+    m = 100 * ((mon - year).astype('uint32') + 1)
+    d = (day - mon).astype('uint32') + 1
+    return y + m + d + frac_day
+
+
+def timed(func, *args):
+    start = timer.perf_counter()
+    result = func(*args)
+    return result, timer.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--resolution', default='ms')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    step = np.timedelta64(3650, 'D') // args.rows
+    time = np.datetime64('2020-01-01', args.resolution) + np.arange(args.rows) * step
+    time += rng.integers(0, 1000, args.rows).astype(f'timedelta64[{args.resolution}]')
+
+    ydd, ymd, iso = YYYYDDDTimeUnit(), YYYYMMDDTimeUnit(), ISOYMDTimeUnit()
+    cases = [
+        ('YYYYDDD', yyyyddd_casts, ydd.convert, ydd.to_text),
+        ('YYYYMMDD', yyyymmdd_casts, ymd.convert, ymd.to_text),
+        ('ISOYMD', lambda t: t.astype(str), iso.convert, None),
+    ]
+    print(f'{args.rows} timestamps at {args.resolution} resolution')
+    print(f'{"format":<10} {"casts s":>9} {"kernel s":>9} {"speedup":>8} {"to_text s":>10}')
+    for name, old, new, text in cases:
+        expected, old_time = timed(old, time)
+        result, new_time = timed(new, time)
+        assert np.array_equal(result, expected), name
+        text_time = f'{timed(text, time)[1]:.2f}' if text else '-'
+        print(f'{name:<10} {old_time:>9.2f} {new_time:>9.2f} {old_time / new_time:>7.1f}x {text_time:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+'''Compare time and peak memory of quaternion validation and repair against the original
+implementation, then compare each format's validation time to its formatting time.
+
+    python benchmarks/bench_validate.py [--rows 10000000] [--format-rows 1000000]
+'''
+import argparse
+import tracemalloc
+import time as timer
+import numpy as np
+
+from systemstoolkit.files.formats import AttitudeFileFormat
+from systemstoolkit.files.formatters import format_rows
+from systemstoolkit.files.validators import QuaternionValidator
+
+
+def validate_original(time, data, tolerance=1e-5):
+    rss = np.abs(np.sqrt(np.sum(data ** 2, axis=1)) - 1)
+    idx = rss < tolerance
+    return time[idx], data[idx, :]
+
+
+def quaternions(nrows: int):
+    rng = np.random.default_rng(0)
+    time = np.datetime64('2022-07-11T00:00:00.000') + np.arange(nrows) * np.timedelta64(10, 'ms')
+    data = rng.standard_normal((nrows, 4))
+    data /= np.linalg.norm(data, axis=1)[:, None]
+    return time, data
+
+
+def measure(func):
+    tracemalloc.start()
+    start = timer.perf_counter()
+    func()
+    elapsed = timer.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def rotations(nrows: int, format: AttitudeFileFormat) -> np.ndarray:
+    '''Valid data for each format, built from random rotations.'''
+    rng = np.random.default_rng(0)
+    q = rng.standard_normal((nrows, 4))
+    q /= np.linalg.norm(q, axis=1)[:, None]
+    rates = rng.standard_normal((nrows, 3))
+    angles = rng.uniform(-180, 180, (nrows, 3))
+
+    x, y, z, w = q.T
+    dcm = np.stack([
+        1 - 2*(y*y + z*z), 2*(x*y + z*w), 2*(x*z - y*w),
+        2*(x*y - z*w), 1 - 2*(x*x + z*z), 2*(y*z + x*w),
+        2*(x*z + y*w), 2*(y*z - x*w), 1 - 2*(x*x + y*y),
+    ], axis=1)
+
+    return {
+        'Quaternions': q, 'QuatScalarFirst': q,
+        'QuatAngVels': np.hstack([q, rates]),
+        'AngVels': rates, 'EulerAngleRates': rates, 'YPRAngleRates': rates,
+        'EulerAngles': angles, 'YPRAngles': angles,
+        'EulerAnglesAndRates': np.hstack([angles, rates]),
+        'YPRAnglesAndRates': np.hstack([angles, rates]),
+        'DCM': dcm, 'DCMAngVels': np.hstack([dcm, rates]),
+        'ECFVector': rates, 'ECIVector': rates,
+    }[format.name]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--format-rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    time, data = quaternions(args.rows)
+    # Norms off by up to 0.1%, with random hemisphere flips
+    rng = np.random.default_rng(1)
+    noisy = data * rng.choice([-1, 1], args.rows)[:, None] * rng.uniform(0.999, 1.001, args.rows)[:, None]
+    size = (time.nbytes + data.nbytes) / 2 ** 20
+    print(f'rows: {args.rows:,}  input size: {size:,.1f} MB')
+    for name, func in [
+        ('original', lambda: validate_original(time, data)),
+        ('check()', lambda: QuaternionValidator().check(time, data)),
+        ('repair', lambda: QuaternionValidator(repair=True).check(time, noisy)),
+    ]:
+        elapsed, peak = measure(func)
+        print(f'{name:<10} {elapsed:8.3f} s  peak {peak:8.1f} MB')
+
+    print()
+    print(f'{"format":<20} {"validate":>10} {"format":>10} {"ratio":>7}')
+    time = np.arange(args.format_rows, dtype=np.float64)
+    for fmt in AttitudeFileFormat:
+        data = rotations(args.format_rows, fmt)
+        validate, _ = measure(lambda: fmt.check_data(time, data))
+        start = timer.perf_counter()
+        format_rows(time, data)
+        text = timer.perf_counter() - start
+        print(f'{fmt.name:<20} {validate:9.3f}s {text:9.3f}s {validate / text:7.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+'''Compare peak memory of AttitudeFile.to_string() against AttitudeFile.write().
+
+    python benchmarks/bench_write_memory.py [--rows 1000000]
+'''
+import os
+import argparse
+import tempfile
+import tracemalloc
+import numpy as np
+
+from systemstoolkit.files.files import AttitudeFile
+from systemstoolkit.files.formats import AttitudeFileFormat
+
+
+def quaternion_file(nrows: int) -> AttitudeFile:
+    rng = np.random.default_rng(0)
+    time = np.datetime64('2022-07-11T00:00:00.000') + np.arange(nrows) * np.timedelta64(10, 'ms')
+    data = rng.standard_normal((nrows, 4))
+    data /= np.linalg.norm(data, axis=1)[:, None]
+    return AttitudeFile(time, data, format=AttitudeFileFormat('Quaternions'))
+
+
+def peak_mb(func) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    afile = quaternion_file(args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.a')
+
+        def write_string():
+            with open(path, 'w') as fd:
+                fd.write(afile.to_string())
+
+        string_peak = peak_mb(write_string)
+        stream_peak = peak_mb(lambda: afile.write(path))
+        size = os.path.getsize(path) / 2 ** 20
+
+    print(f'rows: {args.rows:,}  file size: {size:,.1f} MB')
+    print(f'to_string() peak: {string_peak:,.1f} MB')
+    print(f'write() peak:     {stream_peak:,.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
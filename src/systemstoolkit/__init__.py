@@ -2,4 +2,12 @@
 
 __version__ = '0.0.2'
 
-from systemstoolkit.files.builders import attitude_file, sensor_pointing_file
+from systemstoolkit.files.builders import (
+    attitude_file,
+    sensor_pointing_file,
+    attitude_file_chunks,
+    sensor_pointing_file_chunks,
+    attitude_files,
+    sensor_pointing_files,
+)
+from systemstoolkit.files.readers import read_attitude_file
@@ -1 +1,5 @@
 from .session import Connect
+from .async_session import AsyncConnect
+from .pool import ConnectPool
+from .history import CommandHistory
+from .metrics import ConnectHook, ConnectMetrics
@@ -0,0 +1,107 @@
+import time
+import asyncio
+from typing import List, Optional, Union
+import numpy as np
+from numpy.typing import DTypeLike
+from systemstoolkit.exceptions import STKCommandError
+from systemstoolkit.connect import protocol
+from systemstoolkit.connect.history import CommandHistory, new_history
+from systemstoolkit.connect.reports import parse_report
+from systemstoolkit.connect.protocol import SingleMessage, MultiMessage
+
+
+class AsyncConnect:
+    '''An asyncio STK Connect client.
+
+    The methods mirror Connect, but are coroutines, so several connections
+    (e.g. to several STK instances) can be driven from one event loop. A
+    connection carries one command and its response at a time, so it must
+    not be used by concurrent tasks without a lock.
+
+        async with AsyncConnect(port=5001) as c:
+            await c.send('New / Scenario Example')
+    '''
+    def __init__(
+        self,
+        host: str = 'localhost',
+        port: int = 5001,
+        log: Union[bool, CommandHistory] = False,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.log = log
+        self._reader = None
+        self._writer = None
+        self._history = None
+
+    def __str__(self) -> str:
+        return 'AsyncConnect()'
+
+    def __repr__(self) -> str:
+        return f'AsyncConnect(host="{self.host}", port={self.port})'
+
+    async def __aenter__(self) -> 'AsyncConnect':
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb) -> None:
+        await self.close()
+
+    @property
+    def history(self) -> Optional[CommandHistory]:
+        '''The command history, if logging, while connected.'''
+        return self._history
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._history = new_history(self.log)
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._history = None
+
+    async def send(self, command: str) -> None:
+        command = command.rstrip()
+        start = time.perf_counter_ns()
+        self._writer.write(protocol.encode_command(command))
+        await self._writer.drain()
+
+        response = await self._get_ack()
+
+        if self._history is not None:
+            self._history.record(command, response, time.perf_counter_ns() - start)
+
+        if response == protocol.NACK:
+            raise STKCommandError(command, response)
+
+    async def _get_ack(self) -> str:
+        response = protocol.parse_ack(await self._reader.readexactly(protocol.ACK_SIZE))
+        if response == protocol.NACK:
+            await self._reader.readexactly(1)
+        return response
+
+    async def get_single_message(self) -> SingleMessage:
+        header = await self._reader.readexactly(protocol.HEADER_SIZE)
+        command_name, data_length = protocol.parse_header(header)
+        data = await self._reader.readexactly(data_length)
+        return SingleMessage(command_name, data_length, data.decode())
+
+    async def get_multi_message(self) -> MultiMessage:
+        header = await self.get_single_message()
+        num_messages = int(header.Data)
+        messages = [await self.get_single_message() for _ in range(num_messages)]
+
+        # Get closing SingleMessage
+        await self.get_single_message()
+        return MultiMessage(header.CommandName, num_messages, messages)
+
+    async def get_report(self) -> List[str]:
+        return protocol.report_data(await self.get_multi_message())
+
+    async def get_report_array(
+        self,
+        names: Optional[List[str]] = None,
+        dtype: DTypeLike = np.float64,
+    ) -> np.ndarray:
+        return parse_report(await self.get_report(), names, dtype)
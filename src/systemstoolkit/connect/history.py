@@ -0,0 +1,104 @@
+import time
+import heapq
+import operator
+import collections
+from typing import Iterator, List, Optional, Union
+
+import numpy as np
+
+
+HistoryEntry = collections.namedtuple(
+    'HistoryEntry',
+    ['Time', 'Command', 'Response', 'Latency'],
+)
+
+
+class CommandHistory:
+    '''A bounded record of the commands sent, with their send-to-ACK latency.
+
+    Entries are kept in a ring buffer, so once `size` entries are held, each
+    new entry replaces the oldest and memory use stays constant however many
+    commands are sent. With `sample` greater than 1, only every sample-th
+    command is recorded.
+
+        history = CommandHistory(size=100_000, sample=10)
+        with Connect(log=history) as c:
+            ...
+        history.slowest(10)
+        history.save('history.npy')
+
+    Params
+    ------
+    size: int
+        The maximum number of entries kept.
+
+    sample: int
+        Record one in every `sample` commands.
+    '''
+    def __init__(self, size: int = 10_000, sample: int = 1) -> None:
+        if size < 1:
+            raise ValueError(f'History size must be at least 1, got {size}')
+        if sample < 1:
+            raise ValueError(f'History sample must be at least 1, got {sample}')
+        self.size = size
+        self.sample = sample
+        self.count = 0
+        self._entries = collections.deque(maxlen=size)
+
+    def __repr__(self) -> str:
+        return f'CommandHistory(size={self.size}, sample={self.sample})'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[HistoryEntry]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> HistoryEntry:
+        return self._entries[index]
+
+    def record(self, command: str, response: str, latency: int) -> None:
+        '''Record a command, its response, and its send-to-ACK latency in nanoseconds.'''
+        self.count += 1
+        if self.count % self.sample:
+            return
+        self._entries.append(HistoryEntry(time.time_ns() - latency, command, response, latency))
+
+    def clear(self) -> None:
+        self.count = 0
+        self._entries.clear()
+
+    def slowest(self, n: int = 10) -> List[HistoryEntry]:
+        '''The `n` recorded commands with the highest latency, slowest first.'''
+        return heapq.nlargest(n, self._entries, key=operator.attrgetter('Latency'))
+
+    def to_array(self) -> np.ndarray:
+        '''The entries as a structured array, with fields Time (datetime64[ns]),
+        Command (bytes), Response (bytes) and Latency (int64 nanoseconds).'''
+        if not self._entries:
+            return np.empty(0, dtype=[
+                ('Time', 'datetime64[ns]'), ('Command', 'S1'), ('Response', 'S4'), ('Latency', 'int64'),
+            ])
+        times, commands, responses, latencies = zip(*self._entries)
+        commands = np.array([command.encode() for command in commands])
+        array = np.empty(len(self._entries), dtype=[
+            ('Time', 'datetime64[ns]'), ('Command', commands.dtype),
+            ('Response', 'S4'), ('Latency', 'int64'),
+        ])
+        array['Time'] = np.array(times, dtype='int64').view('datetime64[ns]')
+        array['Command'] = commands
+        array['Response'] = responses
+        array['Latency'] = latencies
+        return array
+
+    def save(self, file) -> None:
+        '''Save the entries, as from to_array(), in NumPy .npy format.'''
+        np.save(file, self.to_array())
+
+
+def new_history(log: Union[bool, CommandHistory]) -> Optional[CommandHistory]:
+    '''The history for a connection's `log` argument: the CommandHistory
+    given, a new default one if True, or None if False.'''
+    if isinstance(log, CommandHistory):
+        return log
+    return CommandHistory() if log else None
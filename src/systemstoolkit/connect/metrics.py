@@ -0,0 +1,139 @@
+'''Instrumentation hooks for Connect, and a hook that collects metrics.
+
+    metrics = ConnectMetrics(output=sys.stderr)
+    with Connect(hooks=[metrics]) as c:
+        ...
+    # The summary is written to stderr on close
+
+With no hooks, Connect does no timing or bookkeeping at all.
+'''
+import collections
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional, TextIO, Union
+
+from systemstoolkit.connect import protocol
+from systemstoolkit.connect.protocol import SingleMessage, MultiMessage
+
+if TYPE_CHECKING:
+    from systemstoolkit.connect import Connect # pragma: no cover
+
+
+class ConnectHook:
+    '''The events a Connect reports to its hooks. Override the ones needed.'''
+    def on_command(self, command: str, response: str, latency: int) -> None:
+        '''A command was sent and its ACK/NACK read, `latency` nanoseconds after sending.'''
+
+    def on_message(self, message: Union[SingleMessage, MultiMessage], size: int, latency: int) -> None:
+        '''A message of `size` bytes was read, taking `latency` nanoseconds.'''
+
+    def on_close(self, connect: 'Connect') -> None:
+        '''The connection is closing.'''
+
+
+# Latencies are counted in power of 2 nanosecond buckets: bucket i holds
+# latencies in [2**(i-1), 2**i)
+LATENCY_BUCKETS = 64
+
+
+@dataclass
+class LatencyMetrics:
+    '''The count, total size and latency histogram of one kind of command or message.'''
+    count: int = 0
+    nacks: int = 0
+    size: int = 0
+    total_latency: int = 0
+    max_latency: int = 0
+    histogram: List[int] = field(default_factory=lambda: [0] * LATENCY_BUCKETS)
+
+    def add(self, size: int, latency: int) -> None:
+        self.count += 1
+        self.size += size
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.histogram[min(latency.bit_length(), LATENCY_BUCKETS - 1)] += 1
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> int:
+        '''An upper bound for the q-th (0 to 100) percentile latency, in nanoseconds.'''
+        target = q / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= target:
+                return min(2 ** bucket, self.max_latency)
+        return self.max_latency
+
+
+class ConnectMetrics(ConnectHook):
+    '''Counts, sizes and latency histograms of commands (by verb) and messages (by name).
+
+    Params
+    ------
+    output: Optional[TextIO]
+        If given, the summary() is written to it when the connection closes.
+    '''
+    def __init__(self, output: Optional[TextIO] = None) -> None:
+        self.output = output
+        self.commands: Dict[str, LatencyMetrics] = collections.defaultdict(LatencyMetrics)
+        self.messages: Dict[str, LatencyMetrics] = collections.defaultdict(LatencyMetrics)
+
+    def __repr__(self) -> str:
+        return f'ConnectMetrics(commands={self.command_count}, nack_rate={self.nack_rate:.3f})'
+
+    @property
+    def command_count(self) -> int:
+        return sum(metrics.count for metrics in self.commands.values())
+
+    @property
+    def bytes_out(self) -> int:
+        return sum(metrics.size for metrics in self.commands.values())
+
+    @property
+    def bytes_in(self) -> int:
+        acks = sum(
+            metrics.count * len(protocol.ACK) + metrics.nacks
+            for metrics in self.commands.values()
+        )
+        return acks + sum(metrics.size for metrics in self.messages.values())
+
+    @property
+    def nack_rate(self) -> float:
+        '''The fraction of commands that were NACKed.'''
+        count = self.command_count
+        return sum(metrics.nacks for metrics in self.commands.values()) / count if count else 0.0
+
+    def on_command(self, command: str, response: str, latency: int) -> None:
+        metrics = self.commands[command.split(maxsplit=1)[0] if command else '']
+        # The command is sent with one newline
+        metrics.add(len(command.encode()) + 1, latency)
+        if response == protocol.NACK:
+            metrics.nacks += 1
+
+    def on_message(self, message: Union[SingleMessage, MultiMessage], size: int, latency: int) -> None:
+        self.messages[message.CommandName].add(size, latency)
+
+    def on_close(self, connect: 'Connect') -> None:
+        if self.output is not None:
+            self.output.write(self.summary())
+
+    def summary(self) -> str:
+        '''A table of the metrics, one row per command verb and message name.'''
+        lines = [
+            f'{"":<10}{"name":<24}{"count":>9}{"nacks":>7}{"bytes":>12}'
+            f'{"mean us":>10}{"p50 us":>10}{"p99 us":>10}{"max us":>10}'
+        ]
+        for kind, table in [('command', self.commands), ('message', self.messages)]:
+            for name, metrics in sorted(table.items()):
+                lines.append(
+                    f'{kind:<10}{name:<24}{metrics.count:>9}{metrics.nacks:>7}{metrics.size:>12}'
+                    f'{metrics.mean_latency / 1e3:>10.1f}{metrics.percentile(50) / 1e3:>10.1f}'
+                    f'{metrics.percentile(99) / 1e3:>10.1f}{metrics.max_latency / 1e3:>10.1f}'
+                )
+        lines.append(
+            f'{self.command_count} commands, NACK rate {self.nack_rate:.2%}, '
+            f'{self.bytes_out} bytes out, {self.bytes_in} bytes in'
+        )
+        return '\n'.join(lines) + '\n'
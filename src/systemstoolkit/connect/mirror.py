@@ -0,0 +1,96 @@
+import re
+from typing import Dict, List, Optional
+
+
+# STK names objects by their full path, e.g.
+# /Application/STK/Scenario/Example/Satellite/Sat1, which is */Satellite/Sat1
+_SCENARIO_PREFIX = re.compile(r'^/Application/[^/]+/Scenario/[^/]+/')
+
+
+def normalize_path(path: str) -> str:
+    '''An object path relative to the current scenario, e.g. "*/Satellite/Sat1".'''
+    return _SCENARIO_PREFIX.sub('*/', path)
+
+
+def path_class(path: str) -> str:
+    '''The class of the object at a path, e.g. "Sensor" for "*/Satellite/Sat1/Sensor/Sen1".'''
+    return path.split('/')[-2]
+
+
+class ScenarioMirror:
+    '''A client-side cache of the object paths in the scenario, by class.
+
+    The paths of a class are cached once they have been looked up, and
+    then kept up to date as objects are created, renamed and unloaded
+    through this client. After the scenario is unloaded, every class is
+    known to be empty, so lookups need no round trip until the scenario
+    changes in a way the mirror does not see.
+
+    Changes made some other way (commands sent directly, or other clients)
+    are not seen, so clear() the mirror after making them.
+    '''
+    def __init__(self) -> None:
+        # The paths of each class, as the keys of an (insertion ordered) dict
+        self._paths: Dict[str, Dict[str, None]] = {}
+        # Whether classes not in self._paths are known to have no objects
+        self._complete = False
+
+    def __repr__(self) -> str:
+        return f'ScenarioMirror({self._paths})'
+
+    def get(self, cls: str) -> Optional[List[str]]:
+        '''The object paths of a class, or None if they are not known.'''
+        if cls in self._paths:
+            return list(self._paths[cls])
+        if self._complete and cls != 'Scenario':
+            return []
+        return None
+
+    def set(self, cls: str, paths: List[str]) -> None:
+        '''Cache the object paths of a class, as looked up.'''
+        self._paths[cls] = dict.fromkeys([normalize_path(path) for path in paths])
+
+    def add(self, path: str) -> None:
+        '''Record that an object was created.'''
+        path = normalize_path(path)
+        cls = path_class(path)
+        if cls in self._paths:
+            self._paths[cls][path] = None
+        elif self._complete:
+            self._paths[cls] = {path: None}
+
+    def remove(self, path: str) -> None:
+        '''Record that an object, and so all of its children, were unloaded.'''
+        path = normalize_path(path)
+        if path_class(path) == 'Scenario':
+            self.clear(empty=True)
+            return
+        for cls, paths in self._paths.items():
+            self._paths[cls] = dict.fromkeys([
+                p for p in paths if p != path and not p.startswith(path + '/')
+            ])
+
+    def rename(self, path: str, new_path: str) -> None:
+        '''Record that an object was renamed, which also moves its children.'''
+        path, new_path = normalize_path(path), normalize_path(new_path)
+        for cls, paths in self._paths.items():
+            self._paths[cls] = dict.fromkeys([
+                new_path + p[len(path):] if p == path or p.startswith(path + '/') else p
+                for p in paths
+            ])
+
+    def invalidate(self, cls: str) -> None:
+        '''Forget the object paths of a class, so they are looked up again.'''
+        self._paths.pop(cls, None)
+
+    def clear(self, empty: bool = False) -> None:
+        '''Forget all object paths.
+
+        Params
+        ------
+        empty: bool
+            If True, the scenario is known to have been unloaded, so every
+            class is known to have no objects.
+        '''
+        self._paths = {'Scenario': {}} if empty else {}
+        self._complete = empty
@@ -0,0 +1,207 @@
+'''A fake STK Connect server, for testing clients without STK.
+
+It can also be run on its own, e.g. to point a script at instead of STK:
+
+    python -m systemstoolkit.connect.mock_server --port 5001 --latency 0.001 --report-rows 86400
+'''
+import time
+import argparse
+import threading
+import socketserver
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from systemstoolkit.connect import protocol
+from systemstoolkit.utils import stk_datetime
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        mock = self.server.mock
+        buffer = b''
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            *lines, buffer = (buffer + data).split(b'\n')
+            if not lines:
+                continue
+
+            # Answer all of the commands received together at once, as one
+            # write, after one delay
+            response = b''.join([mock.respond(line.decode().rstrip('\r')) for line in lines])
+            if mock.latency:
+                time.sleep(mock.latency)
+            self.request.sendall(response)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    # Do not wait for clients that are still connected when stopping
+    block_on_close = False
+
+
+class MockConnectServer:
+    '''A fake STK Connect server, listening on a local port in a background thread.
+
+    Every command line is acknowledged with ACK, or NACK if its verb (the
+    first word, in any case) was registered with `nack()`. Verbs registered
+    with `single()` or `multi()` are followed by that message, framed as
+    STK frames it.
+
+        with MockConnectServer() as server:
+            server.single('ShowNames', '*/Satellite/Sat1')
+            with Connect(*server.address) as c:
+                ...
+
+    Params
+    ------
+    host: str
+
+    port: int
+        The port to listen on. By default, a free port is chosen.
+
+    latency: float
+        The delay, in seconds, before responding to the commands received
+        in one read, e.g. to model the network round trip time.
+    '''
+    def __init__(self, host: str = 'localhost', port: int = 0, latency: float = 0) -> None:
+        self.latency = latency
+        self.commands = []
+        self._responses = {}
+        self._nack = set()
+        self._nack_commands = set()
+        self._server = _Server((host, port), _Handler)
+        self._server.mock = self
+        self._thread = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        '''The (host, port) the server is listening on.'''
+        return self._server.server_address[:2]
+
+    def __enter__(self) -> 'MockConnectServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+
+    def serve(self) -> None:
+        '''Serve on the calling thread, until interrupted.'''
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        '''Stop serving, if started, and close the listening socket.'''
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def nack(self, verb: str) -> None:
+        '''NACK every command with this verb.'''
+        self._nack.add(verb.lower())
+
+    def nack_command(self, command: str) -> None:
+        '''NACK this exact command.'''
+        self._nack_commands.add(command)
+
+    def single(self, verb: str, data: str, command_name: Optional[str] = None) -> None:
+        '''Follow the ACK of commands with this verb with a single message.'''
+        command_name = command_name or verb.upper()
+        self._responses[verb.lower()] = protocol.encode_single_message(command_name, data)
+
+    def multi(self, verb: str, messages: List[str], command_name: Optional[str] = None) -> None:
+        '''Follow the ACK of commands with this verb with a multi message.'''
+        command_name = command_name or verb.upper()
+        self._responses[verb.lower()] = protocol.encode_multi_message(command_name, messages)
+
+    def report(self, rows: List[str], verb: str = 'Report_RM') -> None:
+        '''Follow the ACK of commands with this verb with report rows, e.g. from make_report().'''
+        self.multi(verb, rows)
+
+    def respond(self, command: str) -> bytes:
+        '''The bytes sent in reply to a command.'''
+        self.commands.append(command)
+        verb = command.split(maxsplit=1)[0].lower() if command.strip() else ''
+
+        if verb in self._nack or command in self._nack_commands:
+            return protocol.NACK.encode()
+        return protocol.ACK.encode() + self._responses.get(verb, b'')
+
+
+def make_report(
+    nrows: int,
+    ncols: int = 3,
+    start: np.datetime64 = np.datetime64('2022-07-01T00:00:00', 'ms'),
+    step: float = 1.0,
+) -> List[str]:
+    '''A canned report: a header line, then `nrows` rows of times and `ncols` values.
+
+    Params
+    ------
+    nrows: int
+
+    ncols: int
+        The number of value columns after the time.
+
+    start: np.datetime64
+        The time of the first row.
+
+    step: float
+        The time step between rows, in seconds.
+
+    Returns
+    -------
+    rows: List[str]
+    '''
+    times = start + (np.arange(nrows) * step * 1e3).astype('timedelta64[ms]')
+    values = np.random.default_rng(0).uniform(-7000, 7000, (nrows, ncols))
+    header = ','.join(['Time (UTCG)'] + [f'Column{i} (km)' for i in range(1, ncols + 1)])
+    return [header] + [
+        stk_datetime(t) + ''.join([f',{v:.6f}' for v in row])
+        for t, row in zip(times, values.tolist())
+    ]
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Run a fake STK Connect server.')
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--latency', type=float, default=0,
+                        help='Delay before responding to each read [s]')
+    parser.add_argument('--nack', action='append', default=[], metavar='VERB',
+                        help='NACK every command with this verb')
+    parser.add_argument('--single', action='append', default=[], nargs=2, metavar=('VERB', 'DATA'),
+                        help='Follow the ACK of this verb with a single message')
+    parser.add_argument('--report-rows', type=int, default=0,
+                        help='Answer Report_RM with a canned report of this many rows')
+    args = parser.parse_args(args)
+
+    server = MockConnectServer(args.host, args.port, args.latency)
+    for verb in args.nack:
+        server.nack(verb)
+    for verb, data in args.single:
+        server.single(verb, data)
+    if args.report_rows:
+        server.report(make_report(args.report_rows))
+
+    host, port = server.address
+    print(f'Mock STK Connect server listening on {host}:{port} (Ctrl+C to stop)')
+    server.serve()
+
+
+if __name__ == '__main__':
+    main()
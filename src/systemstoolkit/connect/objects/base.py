@@ -1,8 +1,10 @@
 import datetime
 from abc import ABC
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import numpy as np
 import systemstoolkit.connect.validators as validators
-from systemstoolkit.exceptions import STKCommandError
+from systemstoolkit.typing import TimeInterval
+from systemstoolkit.utils import make_command
 
 if TYPE_CHECKING:
     from systemstoolkit.connect import Connect # pragma: no cover
@@ -58,12 +60,54 @@ class Object(ABC):
     def unload(self) -> None:
         '''Unload (delete) the object from the scenario.'''
         command = f'Unload / {self.path}'
-        self.connect.send(command)
+        path, mirror = self.path, self.connect.mirror
+        self.connect.send(command, on_ack=lambda: mirror.remove(path))
     
     def create(self) -> None:
         '''Add the Vehicle object in the current Scenario.'''
         command = f'New / */{self.type} {self.name}'
-        self.connect.send(command)
+        path, mirror = self.path, self.connect.mirror
+        self.connect.send(command, on_ack=lambda: mirror.add(path))
+
+    def report(
+        self,
+        style: str,
+        interval: Optional[TimeInterval] = None,
+        step: Optional[float] = None,
+        names: Optional[List[str]] = None,
+    ) -> np.ndarray:
+        '''Generate a report and get its data.
+
+        Params
+        ------
+        style: str
+            The report style, e.g. "Cartesian Position".
+
+        interval: Optional[TimeInterval]
+            The report time period, as (start, stop). By default, the
+            style's own time period is used.
+
+        step: Optional[float]
+            The report time step in seconds. By default, the style's own
+            time step is used.
+
+        names: Optional[List[str]]
+            The names of the report columns after the time. By default,
+            these are taken from the report header.
+
+        Returns
+        -------
+        report: np.ndarray
+            A structured array, with a datetime64 "Time" field followed by
+            one float field per report column.
+        '''
+        parts = ['Report_RM', self.path, 'Style', f'"{style}"']
+        if interval is not None:
+            parts += ['TimePeriod', interval]
+        if step is not None:
+            parts += ['TimeStep', step]
+        self.connect.send(make_command(parts))
+        return self.connect.get_report_array(names)
 
     def rename(self, name: str) -> None:
         '''Rename the object.
@@ -78,14 +122,17 @@ class Object(ABC):
         None
         '''
         validators.name(name)
-        new_path = f'{self.parent}/{self.type}/{name}'
-        try:
-            self.connect.send(f'Rename {self.path} {name}')
-        except STKCommandError as msg:
-            raise
-        else:
+        path, new_path = self.path, f'{self.parent}/{self.type}/{name}'
+
+        def renamed() -> None:
+            self.connect.mirror.rename(path, new_path)
             self.path = new_path
 
+        self.connect.send(f'Rename {path} {name}', on_ack=renamed)
+        # Within a batch, the path only changes once STK ACKs, so flush now
+        # for later commands on this object to use the new path
+        self.connect.flush()
+
 
 class _Application:
     @property
@@ -97,11 +144,12 @@ class Scenario(Object):
     def create(self) -> None:
         '''Create a new Scenario.'''
         # Unload current scenario
-        self.connect.send('Unload / *')
+        mirror = self.connect.mirror
+        self.connect.send('Unload / *', on_ack=lambda: mirror.clear(empty=True))
 
         # Create new scenario
         command = f'New / Scenario {self.name}'
-        self.connect.send(command)
+        self.connect.send(command, on_ack=lambda: mirror.invalidate('Scenario'))
     
     def get_time_period(self) -> Tuple[datetime.datetime, datetime.datetime]:
         '''Get the Scenario Time Period.'''
@@ -132,7 +180,8 @@ class Attachment(Object):
     def create(self) -> None:
         '''Add the VehicleAttachment object to its parent object.'''
         command = f'New / {self.parent}/{self.type} {self.name}'
-        self.connect.send(command)
+        path, mirror = self.path, self.connect.mirror
+        self.connect.send(command, on_ack=lambda: mirror.add(path))
 
 
 class Location(Object):
@@ -0,0 +1,155 @@
+import queue
+import threading
+import concurrent.futures
+from typing import Callable, Iterable, List, Tuple, TypeVar, Union
+from systemstoolkit.exceptions import STKConnectError
+from systemstoolkit.connect.session import Connect
+
+
+Item = TypeVar('Item')
+Result = TypeVar('Result')
+
+# Errors after which a connection is re-established and the work item retried
+RECONNECT_ERRORS = (STKConnectError, OSError)
+
+
+class ConnectPool:
+    '''Connections to several STK instances, with work spread across them.
+
+    Each work item is run as func(connect, item) on a worker thread, with
+    whichever connection is idle, so independent work (e.g. one satellite's
+    access computations) scales with the number of STK instances. If a
+    connection fails, it is re-established and the item is run again, up to
+    `retries` times, so work items should be safe to repeat. A connection
+    that cannot be re-established is dropped from the pool.
+
+        with ConnectPool([5001, 5002, 5003]) as pool:
+            results = pool.map(compute_access, satellite_names)
+
+    Params
+    ------
+    addresses: Iterable[Union[int, Tuple[str, int]]]
+        The (host, port) of each STK instance, or just the port on localhost.
+
+    log: bool
+        Passed to each Connect.
+
+    retries: int
+        The number of times a work item is retried after a connection error.
+    '''
+    def __init__(
+        self,
+        addresses: Iterable[Union[int, Tuple[str, int]]],
+        log: bool = False,
+        retries: int = 1,
+    ) -> None:
+        self.connections = [
+            Connect('localhost', address, log) if isinstance(address, int) else Connect(*address, log)
+            for address in addresses
+        ]
+        if not self.connections:
+            raise ValueError('ConnectPool needs at least one address')
+        self.retries = retries
+        self._idle = None
+        self._live = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __repr__(self) -> str:
+        return f'ConnectPool({[(c.host, c.port) for c in self.connections]})'
+
+    def __enter__(self) -> 'ConnectPool':
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def connect(self) -> None:
+        self._idle = queue.Queue()
+        for connect in self.connections:
+            try:
+                connect.connect()
+            except Exception:
+                # Close the connections already opened, rather than leak them
+                while not self._idle.empty():
+                    self._idle.get().close()
+                raise
+            self._idle.put(connect)
+        self._live = len(self.connections)
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self.connections),
+            thread_name_prefix='ConnectPool',
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        for connect in self.connections:
+            connect.close()
+
+    def _reconnect(self, connect: Connect) -> None:
+        try:
+            connect.close()
+        except OSError:
+            pass
+        connect.connect()
+
+    def _try_reconnect(self, connect: Connect) -> bool:
+        '''Re-establish a connection, returning whether that succeeded.'''
+        try:
+            self._reconnect(connect)
+        except RECONNECT_ERRORS:
+            return False
+        return True
+
+    def _drop(self, connect: Connect) -> None:
+        '''Stop handing out a connection that could not be re-established.'''
+        with self._lock:
+            self._live -= 1
+            if not self._live:
+                # Wake the work items waiting for a connection
+                self._idle.put(None)
+
+    def run(self, func: Callable[[Connect, Item], Result], item: Item) -> Result:
+        '''Run one work item with an idle connection, on the calling thread.'''
+        connect = self._idle.get()
+        if connect is None:
+            # Pass the wake-up on to the next waiting work item
+            self._idle.put(None)
+            raise STKConnectError('Every connection in the pool has failed')
+
+        usable = True
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    return func(connect, item)
+                except RECONNECT_ERRORS:
+                    usable = False
+                    if attempt == self.retries:
+                        # Leave a fresh connection for the next work item, or else drop it
+                        usable = self._try_reconnect(connect)
+                        raise
+                    self._reconnect(connect)
+                    usable = True
+        finally:
+            if usable:
+                self._idle.put(connect)
+            else:
+                self._drop(connect)
+
+    def submit(self, func: Callable[[Connect, Item], Result], item: Item) -> concurrent.futures.Future:
+        '''Schedule one work item, returning its Future.'''
+        return self._executor.submit(self.run, func, item)
+
+    def map(self, func: Callable[[Connect, Item], Result], items: Iterable[Item]) -> List[Result]:
+        '''Run func(connect, item) for every item, returning the results in order.
+
+        The first exception raised by a work item is re-raised once every
+        item has been run.
+        '''
+        futures = [self.submit(func, item) for item in items]
+        concurrent.futures.wait(futures)
+        return [future.result() for future in futures]
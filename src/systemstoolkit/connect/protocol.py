@@ -0,0 +1,139 @@
+'''The STK Connect wire format, shared by the sync and async clients.
+
+Each command is one line of text. With acknowledgements on, STK answers
+every command with "ACK" or "NACK", and then any data the command returns.
+Data is framed as a single message, a 40-byte header holding the command
+name and data length followed by the data, or as a multi message, whose
+data is the number of single messages that follow (plus a closing one).
+'''
+import socket
+import collections
+from typing import List, Tuple
+
+from systemstoolkit.exceptions import STKConnectError
+
+
+HEADER_SIZE = 40
+ACK = 'ACK'
+NACK = 'NACK'
+# The number of bytes read to tell ACK from NACK
+ACK_SIZE = 3
+
+SingleMessage = collections.namedtuple(
+    'SingleMessage',
+    ['CommandName', 'DataLength', 'Data'],
+)
+
+MultiMessage = collections.namedtuple(
+    'MultiMessage',
+    ['CommandName', 'DataLength', 'Messages'],
+)
+
+
+def encode_command(command: str) -> bytes:
+    '''The command, stripped of trailing newlines, with the one required newline.'''
+    return str.encode(command.rstrip() + '\n')
+
+
+def parse_ack(data: bytes) -> str:
+    '''Parse the first ACK_SIZE bytes of a response.
+
+    Returns ACK or NACK. After a NACK, the caller must read the one
+    remaining byte of "NACK".
+    '''
+    if data == b'ACK':
+        return ACK
+    elif data == b'NAC':
+        return NACK
+    raise STKConnectError(
+        f'Did not receive ACK or NACK, got message: {bytes(data).decode(errors="replace")}'
+    )
+
+
+def parse_header(header: bytes) -> Tuple[str, int]:
+    '''Parse a message header into the command name and data length.'''
+    try:
+        command_name, data_length = bytes(header).decode().split('\x00')[0].split()
+        return command_name, int(data_length)
+    except ValueError:
+        raise STKConnectError(f'Invalid message header: {bytes(header)!r}') from None
+
+
+def report_data(message: MultiMessage) -> List[str]:
+    '''The data of each single message in a multi message.'''
+    return [msg.Data for msg in message.Messages]
+
+
+def encode_header(command_name: str, data_length: int) -> bytes:
+    '''A message header, as sent by STK.'''
+    header = f'{command_name} {data_length}\x00'.encode()
+    if len(header) > HEADER_SIZE:
+        raise ValueError(f'Command name "{command_name}" is too long for a message header')
+    return header.ljust(HEADER_SIZE)
+
+
+def encode_single_message(command_name: str, data: str) -> bytes:
+    '''A single message, as sent by STK.'''
+    data = data.encode()
+    return encode_header(command_name, len(data)) + data
+
+
+def encode_multi_message(command_name: str, messages: List[str]) -> bytes:
+    '''A multi message, including its closing single message, as sent by STK.'''
+    count = str(len(messages))
+    parts = [encode_single_message(command_name, count)]
+    parts += [encode_single_message(command_name, data) for data in messages]
+    parts.append(encode_single_message(command_name, ''))
+    return b''.join(parts)
+
+
+class SocketReader:
+    '''Exact-length reads from a socket, through a reusable buffer.
+
+    Data is received with recv_into() directly into a bytearray, looping
+    until the requested number of bytes has arrived, so a message is never
+    truncated by a short recv(). Reads return memoryviews of the buffer,
+    which are only valid until the next read. The buffer grows to fit the
+    largest message read.
+
+    Params
+    ------
+    sock: socket.socket
+
+    size: int
+        The initial buffer size.
+    '''
+    def __init__(self, sock: socket.socket, size: int = 65536) -> None:
+        self._socket = sock
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        # The unread data is self._buffer[self._start:self._end]
+        self._start = 0
+        self._end = 0
+
+    def read(self, size: int) -> memoryview:
+        '''Read exactly `size` bytes.'''
+        if self._end - self._start < size:
+            self._fill(size)
+        view = self._view[self._start:self._start + size]
+        self._start += size
+        return view
+
+    def _fill(self, size: int) -> None:
+        unread = self._end - self._start
+        if self._start + size > len(self._buffer):
+            if size > len(self._buffer):
+                # Earlier views keep the old buffer alive, so replace it
+                buffer = bytearray(max(size, 2 * len(self._buffer)))
+                buffer[:unread] = self._view[self._start:self._end]
+                self._buffer = buffer
+                self._view = memoryview(buffer)
+            else:
+                self._buffer[:unread] = self._buffer[self._start:self._end]
+            self._start, self._end = 0, unread
+
+        while self._end - self._start < size:
+            received = self._socket.recv_into(self._view[self._end:])
+            if received == 0:
+                raise STKConnectError('Connection closed while reading a response')
+            self._end += received
@@ -0,0 +1,93 @@
+'''Parsing of report data returned by Report_RM.
+
+Each row of a report is one comma-separated line, usually preceded by a
+header line of column names. The first column is the time, as a date in
+the Connect date unit (UTCG by default).
+'''
+import io
+from typing import List, Optional
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from systemstoolkit.utils import parse_stk_datetimes
+
+TIME_FIELD = 'Time'
+
+
+def _is_header(row: str) -> bool:
+    try:
+        parse_stk_datetimes([row.partition(',')[0]])
+    except ValueError:
+        return True
+    return False
+
+
+def report_names(header: str) -> List[str]:
+    '''The column names in a report header, without the time column.'''
+    return [name.strip() for name in header.split(',')[1:]]
+
+
+def parse_report(
+    rows: List[str],
+    names: Optional[List[str]] = None,
+    dtype: DTypeLike = np.float64,
+    resolution: str = 'ns',
+) -> np.ndarray:
+    '''Parse report rows into a structured array.
+
+    The array has a datetime64 "Time" field, followed by one field per
+    report column. Rows are parsed in bulk, rather than row by row.
+
+    Params
+    ------
+    rows: List[str]
+        The report lines, e.g. from Connect.get_report().
+
+    names: Optional[List[str]]
+        The names of the columns after the time. By default, these are
+        taken from the report header (e.g. "x (km)"), or are "Column1",
+        "Column2", ... if there is none.
+
+    dtype: DTypeLike
+        The dtype of the columns after the time.
+
+    resolution: str
+        The datetime64 unit of the time field.
+
+    Returns
+    -------
+    report: np.ndarray
+        A (rows,) structured array.
+    '''
+    rows = [row for row in rows if row.strip()]
+    header = rows.pop(0) if rows and _is_header(rows[0]) else None
+
+    parts = [row.partition(',') for row in rows]
+    times = parse_stk_datetimes([part[0] for part in parts], resolution)
+
+    values = np.empty((0, 0), dtype=dtype)
+    if parts:
+        try:
+            values = np.loadtxt(
+                io.StringIO('\n'.join([part[2] for part in parts])),
+                delimiter=',', dtype=dtype, ndmin=2,
+            )
+        except ValueError as error:
+            raise ValueError(f'Invalid report data: {error}') from None
+
+    ncols = values.shape[1]
+    if names is None:
+        names = report_names(header) if header else [f'Column{i}' for i in range(1, ncols + 1)]
+    if parts and len(names) != ncols:
+        raise ValueError(f'Expected {ncols} column names, got {len(names)}')
+
+    report = np.empty(
+        len(parts),
+        dtype=[(TIME_FIELD, times.dtype)] + [(name, dtype) for name in names],
+    )
+    report[TIME_FIELD] = times
+    if parts:
+        for i, name in enumerate(names):
+            report[name] = values[:, i]
+    return report
@@ -1,37 +1,69 @@
+import time
 import socket
-import collections
-from typing import List
-from systemstoolkit.exceptions import STKCommandError, STKConnectError
+import contextlib
+import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Type, TypeVar, Union
+import numpy as np
+from numpy.typing import DTypeLike
+from systemstoolkit.exceptions import STKCommandError
 from systemstoolkit.connect.objects import (
     _Application, Scenario, Satellite, Location, Facility, Target, Place
 )
 from systemstoolkit.connect import validators
+from systemstoolkit.connect import protocol
+from systemstoolkit.connect.history import CommandHistory, new_history
+from systemstoolkit.connect.metrics import ConnectHook
+from systemstoolkit.connect.mirror import ScenarioMirror
+from systemstoolkit.connect.reports import parse_report
+from systemstoolkit.connect.protocol import SingleMessage, MultiMessage
+from systemstoolkit.connect.objects.base import Object
+from systemstoolkit.utils import stk_datetime
 
 
-SingleMessage = collections.namedtuple(
-    'SingleMessage',
-    ['CommandName', 'DataLength', 'Data'],
-)
+ObjectType = TypeVar('ObjectType', bound=Object)
 
-MultiMessage = collections.namedtuple(
-    'MultiMessage',
-    ['CommandName', 'DataLength', 'Messages'],
-)
+# The SetState element sets that new_satellites() can use
+STATE_TYPES = ('Cartesian', 'Classical', 'Equi')
 
 
 class Connect:
+    '''An STK Connect client.
+
+    Params
+    ------
+    host: str
+
+    port: int
+
+    log: Union[bool, CommandHistory]
+        Record each command sent, with its response and latency, in the
+        `history`. If True, a default CommandHistory is used.
+
+    hooks: Iterable[ConnectHook]
+        Told of every command, message and the close, e.g. ConnectMetrics.
+
+    Object paths looked up by class are cached in the `mirror`, which the
+    object methods (create, rename, unload, new_*) keep up to date. Clear
+    it after changing the scenario by sending commands directly.
+    '''
     def __init__(
         self,
         host: str = 'localhost',
         port: int = 5001,
-        log: bool = False,
+        log: Union[bool, CommandHistory] = False,
+        hooks: Iterable[ConnectHook] = (),
     ) -> None:
         self.host = host
         self.port = port
         self.log = log
+        self.hooks = list(hooks)
         self._socket = None
+        self._reader = None
         self._history = None
+        self._pending = None
+        self._batch_size = None
         self.units = {}
+        self.mirror = ScenarioMirror()
     
     def __str__(self) -> str:
         return 'Connect()'
@@ -46,9 +78,17 @@ class Connect:
     def __exit__(self, exc_type, exc_value, exc_tb, sep="\n") -> None:
         self.close()
 
+    @property
+    def history(self) -> Optional[CommandHistory]:
+        '''The command history, if logging, while connected.'''
+        return self._history
+
     def close(self) -> None:
+        for hook in self.hooks:
+            hook.on_close(self)
         self._socket.close()
         self._history = None
+        self._pending = None
     
     def connect(self) -> None:
         try:
@@ -57,97 +97,233 @@ class Connect:
                 socket.SOCK_STREAM,
             )
             self._socket.connect((self.host, self.port))
-            self._history = []
+            self._reader = protocol.SocketReader(self._socket)
+            self._history = new_history(self.log)
+            self.mirror.clear()
         except ConnectionRefusedError as msg:
             raise
     
-    def send(self, command: str) -> None:
+    def send(self, command: str, on_ack: Optional[Callable[[], None]] = None) -> None:
+        """Send a command and check its ACK/NACK.
+
+        Params
+        ------
+        command: str
+
+        on_ack: Optional[Callable[[], None]]
+            Called once the command is ACKed, e.g. to update the mirror.
+            Within batch(), this is when the command is flushed, and it is
+            not called if the command is NACKed or never written.
+        """
         # Strip any trailing newlines
         command = command.rstrip()
 
+        if self._pending is not None:
+            self._pending.append((command, on_ack))
+            if len(self._pending) >= self._batch_size:
+                self.flush()
+            return
+
+        timed = self._history is not None or self.hooks
+        if timed:
+            start = time.perf_counter_ns()
+
         # Send the string with one (required) newline
-        self._socket.sendall(str.encode(command + '\n'))
+        self._socket.sendall(protocol.encode_command(command))
 
         # Check for ACK/NACK
         response = self._get_ack()
         
-        if self.log:
-            self._history.append((command, response))
+        if timed:
+            self._record(command, response, time.perf_counter_ns() - start)
         
-        if response == 'NACK':
+        if response == protocol.NACK:
             raise STKCommandError(command, response)
+        if on_ack is not None:
+            on_ack()
         
+    @contextlib.contextmanager
+    def batch(self, size: int = 1000) -> Iterator['Connect']:
+        """Pipeline the commands sent within the block.
+
+        Commands are buffered and written back-to-back, `size` at a time,
+        and then their ACK/NACKs are read and matched to them in order. This
+        replaces one network round trip per command with one per `size`.
+
+        Because errors are only seen when a group of commands is flushed,
+        STKCommandError is raised for the first NACKed command of the group
+        at that point. This is on a later send(), on a get_*_message() call
+        (which flushes first, so commands that return data still work), or
+        on leaving the block. If the block raises, commands not yet written
+        are discarded.
+
+        Object.rename() also flushes, so that later commands on the object
+        are sent with its new path.
+
+        Params
+        ------
+        size: int
+            The maximum number of commands written before reading their ACKs.
+        """
+        if self._pending is not None:
+            # Already batching, so let the outer block flush
+            yield self
+            return
+
+        self._pending = []
+        self._batch_size = size
+        try:
+            yield self
+        except BaseException:
+            self._pending = None
+            raise
+        try:
+            self.flush()
+        finally:
+            self._pending = None
+
+    def flush(self) -> None:
+        """Write any batched commands and check their ACK/NACKs."""
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        start = time.perf_counter_ns()
+        self._socket.sendall(b''.join([protocol.encode_command(command) for command, _ in pending]))
+
+        # Read every response, even after a NACK, to keep the stream in sync
+        timed = self._history is not None or self.hooks
+        responses = []
+        for command, _ in pending:
+            response = self._get_ack()
+            responses.append(response)
+            if timed:
+                self._record(command, response, time.perf_counter_ns() - start)
+
+        # STK carries on past a NACK, so the ACKed commands all took effect
+        for (_, on_ack), response in zip(pending, responses):
+            if on_ack is not None and response == protocol.ACK:
+                on_ack()
+
+        for (command, _), response in zip(pending, responses):
+            if response == protocol.NACK:
+                raise STKCommandError(command, response)
+
+    def _record(self, command: str, response: str, latency: int) -> None:
+        if self._history is not None:
+            self._history.record(command, response, latency)
+        for hook in self.hooks:
+            hook.on_command(command, response, latency)
+
     def _get_ack(self) -> str:
-        data = self._socket.recv(3)
-        if data.decode() == 'ACK':
-            return 'ACK'
-        elif data.decode() == 'NAC':
-            data = data + self._socket.recv(1)
-            return 'NACK'
-        raise STKConnectError(
-            f'Did not receive ACK or NACK, got message: {data.decode()}'
-        )
+        response = protocol.parse_ack(self._reader.read(protocol.ACK_SIZE))
+        if response == protocol.NACK:
+            self._reader.read(1)
+        return response
     
-    def get_single_message(self) -> SingleMessage:
-        data = self._socket.recv(40)
-        command_name, data_length = data.decode().split('\x00')[0].split()
+    def _read_message(self) -> SingleMessage:
+        data = self._reader.read(protocol.HEADER_SIZE)
+        command_name, data_length = protocol.parse_header(data)
         
         # Determine length of message, get that many bytes
-        data_length = int(data_length)
-        data = self._socket.recv(data_length)
-        message = data.decode()
+        message = str(self._reader.read(data_length), 'utf-8')
 
         return SingleMessage(command_name, data_length, message)
 
+    def get_single_message(self) -> SingleMessage:
+        self.flush()
+        if self.hooks:
+            start = time.perf_counter_ns()
+        message = self._read_message()
+        if self.hooks:
+            latency = time.perf_counter_ns() - start
+            for hook in self.hooks:
+                hook.on_message(message, protocol.HEADER_SIZE + message.DataLength, latency)
+        return message
+
     def get_multi_message(self) -> MultiMessage:
-        data = self._socket.recv(40)
-        command_name, data_length = data.decode().split('\x00')[0].split()
-        
-        # Determine length of message, get that many bytes
-        data_length = int(data_length)
-        data = self._socket.recv(data_length)
+        self.flush()
+        if self.hooks:
+            start = time.perf_counter_ns()
+        header = self._read_message()
 
         # Determine the qty of SingleMessages, get them
-        num_messages = int(data)
-        messages = [self.get_single_message() for _ in range(num_messages)]
+        num_messages = int(header.Data)
+        messages = [self._read_message() for _ in range(num_messages)]
         
         # Get closing SingleMessage
-        self.get_single_message()
-        return MultiMessage(command_name, num_messages, messages)
+        closing = self._read_message()
+        message = MultiMessage(header.CommandName, num_messages, messages)
+
+        if self.hooks:
+            latency = time.perf_counter_ns() - start
+            # Including the header and closing messages
+            size = (num_messages + 2) * protocol.HEADER_SIZE + header.DataLength + closing.DataLength
+            size += sum([msg.DataLength for msg in messages])
+            for hook in self.hooks:
+                hook.on_message(message, size, latency)
+        return message
 
     def get_report(self) -> list:
-        multi_msg = self.get_multi_message()
-        return [msg.Data for msg in multi_msg]
+        return protocol.report_data(self.get_multi_message())
+
+    def get_report_array(
+        self,
+        names: Optional[List[str]] = None,
+        dtype: DTypeLike = np.float64,
+    ) -> np.ndarray:
+        """Get a report as a structured array, with a datetime64 "Time" field.
+
+        See reports.parse_report() for the params.
+        """
+        return parse_report(self.get_report(), names, dtype)
 
     def unload_all(self) -> None:
         """Unload (delete) all objects including the current Scenario."""
-        self.send('Unload / *')
+        self.send('Unload / *', on_ack=lambda: self.mirror.clear(empty=True))
 
-    def get_class_paths(self, cls: str) -> str:
-        self.send(f'ShowNames * Class {cls}')
-        msg = self.get_single_message()
-        paths = msg.Data.strip().split()
+    def get_class_paths(self, cls: str, refresh: bool = False) -> List[str]:
+        """The paths of the objects of a class, from the mirror if known.
+
+        Params
+        ------
+        cls: str
+            The object class, e.g. "Satellite".
+
+        refresh: bool
+            Look the paths up in STK, even if they are known.
+
+        Returns
+        -------
+        paths: List[str]
+        """
+        paths = None if refresh else self.mirror.get(cls)
+        if paths is None:
+            self.send(f'ShowNames * Class {cls}')
+            msg = self.get_single_message()
+            self.mirror.set(cls, msg.Data.strip().split())
+            paths = self.mirror.get(cls)
         return paths
 
     def get_scenario(self) -> Scenario:
-        scenario_path = self.show_class_paths('Scenario')[0]
+        scenario_path = self.get_class_paths('Scenario')[0]
         obj = Scenario(self, scenario_path)
         return obj
 
     def get_satellites(self) -> List[Satellite]:
-        paths = self.show_class_paths('Satellite')
+        paths = self.get_class_paths('Satellite')
         return [Satellite(self, path) for path in paths]
 
     def get_facilities(self) -> List[Facility]:
-        paths = self.show_class_paths('Facility')
+        paths = self.get_class_paths('Facility')
         return [Facility(self, path) for path in paths]
     
     def get_places(self) -> List[Place]:
-        paths = self.show_class_paths('Place')
+        paths = self.get_class_paths('Place')
         return [Place(self, path) for path in paths]
     
     def get_targets(self) -> List[Target]:
-        paths = self.show_class_paths('Target')
+        paths = self.get_class_paths('Target')
         return [Target(self, path) for path in paths]
 
     def get_locations(self) -> List[Location]:
@@ -176,6 +352,83 @@ class Connect:
         obj.create()
         return obj
     
+    def new_objects(self, cls: Type[ObjectType], names: Iterable[str]) -> List[ObjectType]:
+        """Create many objects of one class in the current Scenario.
+
+        The names are all checked first, and then the New commands are
+        pipelined (see batch()), rather than waiting for each ACK in turn.
+
+        Params
+        ------
+        cls: Type[Object]
+            The object class, e.g. Satellite or Facility.
+
+        names: Iterable[str]
+
+        Returns
+        -------
+        objects: List[Object]
+        """
+        objs = [cls(self, f'*/{cls.__name__}/{name}') for name in validators.names(names)]
+        with self.batch():
+            for obj in objs:
+                obj.create()
+        return objs
+
+    def new_satellites(
+        self,
+        names: Iterable[str],
+        states: Optional[Iterable[Iterable[float]]] = None,
+        epoch: Optional[datetime.datetime] = None,
+        state_type: str = 'Cartesian',
+        **kwargs,
+    ) -> List[Satellite]:
+        """Create many Satellites, and set their states, in one pipelined stream.
+
+        Params
+        ------
+        names: Iterable[str]
+
+        states: Optional[Iterable[Iterable[float]]]
+            The state of each satellite, e.g. an (N, 6) array, as expected
+            by Satellite.set_state_<state_type>(). If None, the states are
+            not set.
+
+        epoch: Optional[datetime.datetime]
+            The epoch of the states.
+
+        state_type: str
+            The SetState element set. Choices: Cartesian, Classical, Equi
+
+        kwargs:
+            Passed to each set_state_<state_type>() call, e.g. prop or coord.
+
+        Returns
+        -------
+        satellites: List[Satellite]
+        """
+        names = validators.names(names)
+        if states is not None:
+            validators.choice(state_type, STATE_TYPES, name='State type')
+            # Python floats format much faster than NumPy's
+            states = [state.tolist() if isinstance(state, np.ndarray) else state for state in states]
+            if len(states) != len(names):
+                raise ValueError(f'Got {len(names)} names, but {len(states)} states')
+            if epoch is None:
+                raise ValueError('epoch is required to set the states')
+
+        if states is not None:
+            # Format the epoch once, rather than for every command
+            epoch = f'"{stk_datetime(epoch)}"'
+
+        with self.batch():
+            satellites = self.new_objects(Satellite, names)
+            if states is not None:
+                for satellite, state in zip(satellites, states):
+                    set_state = getattr(satellite, f'set_state_{state_type.lower()}')
+                    set_state(epoch, state, **kwargs)
+        return satellites
+
     def new_facility(self, name: str) -> Facility:
         """Create a new Facility with given name."""
         validators.name(name)
@@ -1,5 +1,5 @@
 import re
-from typing import Optional, Iterable
+from typing import Optional, Iterable, List
 
 OBJECT_NAME = re.compile(r'^[\w-]+$')
 
@@ -19,6 +19,20 @@ def name(name: str) -> None:
             f'Object name "{name}" cannot be "_Default" or "end" (regardless of case), as these are reserved words in STK.'
         )
 
+def names(names: Iterable[str]) -> List[str]:
+    '''Check a group of object names, which must also be unique (regardless
+    of case), before any of them is used. Returns the names as a list.'''
+    names = list(names)
+    for n in names:
+        name(n)
+
+    seen = set()
+    for n in names:
+        if n.lower() in seen:
+            raise ValueError(f'Object name "{n}" is used more than once.')
+        seen.add(n.lower())
+    return names
+
 def value(
     value: float,
     min: Optional[float] = 0,
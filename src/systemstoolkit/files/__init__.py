@@ -1,3 +1,12 @@
 '''Create data files for Systems ToolKit (STK)'''
 
-from .builders import attitude_file, sensor_pointing_file
+from .builders import (
+    attitude_file,
+    sensor_pointing_file,
+    attitude_file_chunks,
+    sensor_pointing_file_chunks,
+    attitude_files,
+    sensor_pointing_files,
+)
+from .readers import read_attitude_file, MappedAttitudeFile
+from .timecache import TimeCache
@@ -0,0 +1,148 @@
+'''Writing one file per vehicle, for many vehicles sharing a time base.
+
+The time and (vehicle, time, component) data arrays are copied once into
+shared memory, which each worker process attaches to, so a task is only a
+vehicle index, name and path. Each worker builds, validates and writes
+whole files, and an error writing one file is reported in its FileResult
+rather than stopping the others. The files of each process share a
+TimeCache, so the common time column is only converted once per process.
+'''
+import os
+import pathlib
+import collections
+import concurrent.futures
+from typing import List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+from .parallel import attach_shared, shared_arrays, worker_state
+from .timecache import TimeCache
+
+
+FileResult = collections.namedtuple(
+    'FileResult',
+    ['Name', 'Path', 'Points', 'Rejected', 'Error'],
+)
+
+
+def vehicle_arrays(
+        vehicles: Union[np.ndarray, Mapping[str, np.ndarray]],
+        names: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[str], np.ndarray]:
+    '''The vehicle names and the (vehicle, time, component) data array.
+
+    Params
+    ------
+    vehicles: np.ndarray[][][] or Mapping[str, np.ndarray[][]]
+        A 3-D array, or a mapping of vehicle name to 2-D (time, component) array.
+
+    names: Optional[Sequence[str]]
+        The names of the vehicles of a 3-D array, Vehicle1, Vehicle2, ... by default.
+        Names are used as file names, so cannot contain a path separator or be '..'.
+    '''
+    if isinstance(vehicles, Mapping):
+        if names is not None:
+            raise ValueError('names cannot be given with a mapping of vehicles')
+        names = list(vehicles)
+        data = np.stack([np.asarray(vehicles[name]) for name in names]) if names else np.empty((0, 0, 0))
+    else:
+        data = np.asarray(vehicles)
+        if names is None:
+            names = [f'Vehicle{i + 1}' for i in range(data.shape[0])]
+        names = list(names)
+
+    if data.ndim != 3:
+        raise ValueError(f'Vehicle data must be 3-D (vehicle, time, component), got shape {data.shape}')
+    if len(names) != data.shape[0]:
+        raise ValueError(f'Got {len(names)} names for {data.shape[0]} vehicles')
+    if len(set(names)) != len(names):
+        raise ValueError('Vehicle names must be unique')
+    for name in names:
+        _check_file_name(name)
+    return names, data
+
+
+def _check_file_name(name: str) -> None:
+    '''Check that a vehicle name can be used as a file name within a directory.'''
+    name = str(name)
+    separators = {os.sep, os.altsep, '/'} - {None}
+    if name in ('', '.', '..') or '\0' in name or any(sep in name for sep in separators):
+        raise ValueError(f'Vehicle name "{name}" cannot be used as a file name')
+
+
+def _write_file(file_type: Type, time: np.ndarray, data: np.ndarray, keywords: dict, name: str, path: str) -> FileResult:
+    try:
+        stk_file = file_type(time, data, **keywords)
+        stk_file.write(path)
+    except Exception as error:
+        return FileResult(name, path, 0, 0, f'{type(error).__name__}: {error}')
+    return FileResult(name, path, stk_file.points.value, len(stk_file.rejected), None)
+
+
+def _write_shared(index: int, name: str, path: str) -> FileResult:
+    return _write_file(
+        worker_state['file_type'], worker_state['time'], worker_state['data'][index],
+        worker_state['keywords'], name, path,
+    )
+
+
+def write_files(
+        file_type: Type,
+        time: np.ndarray,
+        vehicles: Union[np.ndarray, Mapping[str, np.ndarray]],
+        keywords: dict,
+        directory: Union[str, os.PathLike],
+        suffix: str,
+        names: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+    ) -> List[FileResult]:
+    '''Write one `file_type` file per vehicle to `directory`/{name}{suffix}.
+
+    Params
+    ------
+    file_type: Type[AttitudeFile]
+
+    time: np.ndarray[np.datetime64]
+        The time base shared by all vehicles.
+
+    vehicles: np.ndarray[][][] or Mapping[str, np.ndarray[][]]
+        See vehicle_arrays().
+
+    keywords: dict
+        The keyword arguments of `file_type`, the same for every file.
+
+    workers: Optional[int]
+        The number of worker processes, os.cpu_count() by default. With 1,
+        the files are written in this process.
+
+    Returns
+    -------
+    results: List[FileResult]
+        The name, path, number of points and rejected rows, and error
+        message (or None) of each file, in the order of the vehicles.
+    '''
+    time = np.asarray(time)
+    names, data = vehicle_arrays(vehicles, names)
+    if data.shape[0] and time.shape[0] != data.shape[1]:
+        raise ValueError(f'Got {time.shape[0]} times for {data.shape[1]} rows of vehicle data')
+
+    directory = pathlib.Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = [str(directory / f'{name}{suffix}') for name in names]
+
+    workers = min(workers or os.cpu_count() or 1, max(len(names), 1))
+    if workers == 1 or time.dtype.kind == 'O' or data.dtype.kind == 'O':
+        keywords = dict(keywords, time_cache=TimeCache())
+        return [
+            _write_file(file_type, time, data[index], keywords, name, path)
+            for index, (name, path) in enumerate(zip(names, paths))
+        ]
+
+    # Each worker process gets its own copy of the (empty) TimeCache
+    state = {'file_type': file_type, 'keywords': dict(keywords, time_cache=TimeCache())}
+    with shared_arrays(time=time, data=data) as arrays, concurrent.futures.ProcessPoolExecutor(
+        workers,
+        initializer=attach_shared,
+        initargs=(arrays, state),
+    ) as pool:
+        return list(pool.map(_write_shared, range(len(names)), names, paths))
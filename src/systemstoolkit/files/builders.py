@@ -1,8 +1,17 @@
+import os
 import datetime
 import numpy as np
+from typing import Iterable, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
 
-from .files import AttitudeFile, SensorPointingFile
+from .files import (
+    AttitudeFile,
+    SensorPointingFile,
+    ChunkedAttitudeFile,
+    ChunkedSensorPointingFile,
+)
 from .formats import AttitudeFileFormat, SensorPointingFileFormat
+from .batch import write_files, FileResult
+from .timecache import TimeCache
 from .keywords import (
     MessageLevel,
     Coordinate,
@@ -33,7 +42,10 @@ def attitude_file(
         int_order: int = None,
         deviations: str = None,
         blocking: int = None,
-    ) -> str:
+        file: Union[str, os.PathLike, TextIO] = None,
+        workers: int = 1,
+        time_cache: Optional[TimeCache] = None,
+    ) -> Optional[str]:
     '''Create an STK Attitude (.a) file.
     
     Params
@@ -112,59 +124,33 @@ def attitude_file(
 
         The default is 1.
 
+    file: str, os.PathLike or file object
+        If given, the Attitude File is written incrementally to this path or open text file, rather than returned as a string.
+
+    workers: int
+        The number of processes the data rows are formatted in. The default, 1, formats them in this process.
+
+    time_cache: Optional[TimeCache]
+        If given, the converted and formatted time column is kept in, or reused from, this cache. Pass the same cache when creating many files with the same time and epoch.
+
     Returns
     -------
     a_file: str
-        The Attitude File text as a string.
+        The Attitude File text as a string, or None if `file` was given.
     '''
-    format = AttitudeFileFormat(format)
-    if message:
-        message = MessageLevel(message)
-
-    if axes:
-        coord = CoordinateAxes(axes)
-        if axes_epoch:
-            axes_epoch = CoordinateAxesEpoch(axes_epoch)
-        axes = Coordinate(axes=coord, epoch=axes_epoch)
-
-    if time_format:
-        time_format = TimeFormat(time_format)
-
-    if epoch:
-        epoch = ScenarioEpoch(epoch)
-
-    if body:
-        body = CentralBody(body)
-
-    if int_method:
-        int_method = InterpolationMethod(int_method)
-
-    if int_order:
-        int_order = InterpolationOrder(int_order)
-
-    interpolation = Interpolation(method=int_method, order=int_order)
-
-    if deviations:
-        deviations = AttitudeDeviations(deviations)
-    
-    if blocking:
-        blocking = BlockingFactor(blocking)
-
     a_file = AttitudeFile(
         time,
         data,
-        format=format,
-        axes=axes,
-        time_fmt=time_format,
-        epoch=epoch,
-        message=message,
-        body=body,
-        interp=interpolation,
-        deviations=deviations,
-        blocking=blocking,
+        **_attitude_keywords(
+            format, time_format, epoch, axes, axes_epoch, message,
+            body, int_method, int_order, deviations, blocking,
+        ),
+        time_cache=time_cache,
     )
 
-    return a_file.to_string()
+    if file is not None:
+        return a_file.write(file, workers=workers)
+    return a_file.to_string(workers)
 
 
 def sensor_pointing_file(
@@ -177,7 +163,10 @@ def sensor_pointing_file(
         message: str = 'Warnings',
         body: str = None,
         deviations: str = None,
-    ) -> str:
+        file: Union[str, os.PathLike, TextIO] = None,
+        workers: int = 1,
+        time_cache: Optional[TimeCache] = None,
+    ) -> Optional[str]:
     '''Create an STK Sensor Pointing (.sp) file.
     
     Params
@@ -221,11 +210,280 @@ def sensor_pointing_file(
 
         The default is the central body for the vehicle, and that default is Earth.
 
+    file: str, os.PathLike or file object
+        If given, the Sensor Pointing File is written incrementally to this path or open text file, rather than returned as a string.
+
+    workers: int
+        The number of processes the data rows are formatted in. The default, 1, formats them in this process.
+
+    time_cache: Optional[TimeCache]
+        If given, the converted and formatted time column is kept in, or reused from, this cache. Pass the same cache when creating many files with the same time and epoch.
+
     Returns
     -------
     sp_file: str
-        The Sensor Pointing File text as a string.
+        The Sensor Pointing File text as a string, or None if `file` was given.
+    '''
+    sp_file = SensorPointingFile(
+        time,
+        data,
+        **_sensor_pointing_keywords(
+            format, time_format, epoch, axes, message, body, deviations,
+        ),
+        time_cache=time_cache,
+    )
+
+    if file is not None:
+        return sp_file.write(file, workers=workers)
+    return sp_file.to_string(workers)
+
+
+def attitude_file_chunks(
+        chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+        file: Union[str, os.PathLike, TextIO],
+        format: str = None,
+        time_format: str = 'EpSec',
+        epoch: datetime.datetime = None,
+        axes: str = None,
+        axes_epoch: datetime.datetime = None,
+        message: str = 'Warnings',
+        body: str = None,
+        int_method: str = None,
+        int_order: int = None,
+        deviations: str = None,
+        blocking: int = None,
+    ) -> int:
+    '''Write an STK Attitude (.a) file from an iterable of (time, data) chunks.
+
+    Each chunk is validated, converted and formatted as it arrives, so the
+    complete time and data arrays are never held in memory. The keyword
+    parameters are the same as for `attitude_file`.
+
+    Params
+    ------
+    chunks: Iterable[Tuple[np.ndarray[np.datetime64], np.ndarray[][]]]
+        The (time, data) blocks in time order, e.g. from a generator or
+        slices of memory-mapped arrays.
+
+    file: str, os.PathLike or file object
+        The path or open text file to write to. If it is seekable, the
+        NumberOfAttitudePoints keyword is filled in once all chunks are written.
+
+    epoch: datetime.datetime
+        ScenarioEpoch. The default is the first time in the first chunk.
+
+    Returns
+    -------
+    points: int
+        The number of attitude points written.
+    '''
+    a_file = ChunkedAttitudeFile(
+        chunks,
+        **_attitude_keywords(
+            format, time_format, epoch, axes, axes_epoch, message,
+            body, int_method, int_order, deviations, blocking,
+        ),
+    )
+    return a_file.write(file).value
+
+
+def sensor_pointing_file_chunks(
+        chunks: Iterable[Tuple[np.ndarray, np.ndarray]],
+        file: Union[str, os.PathLike, TextIO],
+        format: str = None,
+        time_format: str = 'EpSec',
+        epoch: datetime.datetime = None,
+        axes: str = None,
+        message: str = 'Warnings',
+        body: str = None,
+        deviations: str = None,
+    ) -> int:
+    '''Write an STK Sensor Pointing (.sp) file from an iterable of (time, data) chunks.
+
+    The keyword parameters are the same as for `sensor_pointing_file`.
+
+    Params
+    ------
+    chunks: Iterable[Tuple[np.ndarray[np.datetime64], np.ndarray[][]]]
+        The (time, data) blocks in time order.
+
+    file: str, os.PathLike or file object
+        The path or open text file to write to.
+
+    Returns
+    -------
+    points: int
+        The number of attitude points written.
     '''
+    sp_file = ChunkedSensorPointingFile(
+        chunks,
+        **_sensor_pointing_keywords(
+            format, time_format, epoch, axes, message, body, deviations,
+        ),
+    )
+    return sp_file.write(file).value
+
+
+def attitude_files(
+        time: np.ndarray,
+        vehicles: Union[np.ndarray, Mapping[str, np.ndarray]],
+        directory: Union[str, os.PathLike],
+        names: Optional[Sequence[str]] = None,
+        format: str = None,
+        time_format: str = 'EpSec',
+        epoch: datetime.datetime = None,
+        axes: str = None,
+        axes_epoch: datetime.datetime = None,
+        message: str = 'Warnings',
+        body: str = None,
+        int_method: str = None,
+        int_order: int = None,
+        deviations: str = None,
+        blocking: int = None,
+        workers: Optional[int] = None,
+    ) -> List[FileResult]:
+    '''Write one STK Attitude (.a) file per vehicle, for vehicles sharing a time base.
+
+    The files are written concurrently by a pool of worker processes. The
+    keyword parameters are the same as for `attitude_file`, and apply to
+    every file.
+
+    Params
+    ------
+    time: np.ndarray[np.datetime64]
+        The time base shared by all vehicles.
+
+    vehicles: np.ndarray[][][] or Mapping[str, np.ndarray[][]]
+        A (vehicle, time, component) array, or a mapping of vehicle name
+        to (time, component) array.
+
+    directory: str or os.PathLike
+        The directory the files are written to, as {name}.a. It is created
+        if it does not exist. Names containing a path separator, or '..',
+        are rejected, so files are only written within it.
+
+    names: Optional[Sequence[str]]
+        The names of the vehicles of a 3-D array, Vehicle1, Vehicle2, ... by default.
+
+    epoch: datetime.datetime
+        ScenarioEpoch. The default is the first time in each file.
+
+    workers: Optional[int]
+        The number of worker processes, os.cpu_count() by default.
+
+    Returns
+    -------
+    results: List[FileResult]
+        The name, path, number of points and rejected rows, and error
+        message (or None) of each file, in the order of the vehicles.
+        A file that fails is reported here rather than raising.
+    '''
+    keywords = _attitude_keywords(
+        format, time_format, epoch, axes, axes_epoch, message,
+        body, int_method, int_order, deviations, blocking,
+    )
+    return write_files(AttitudeFile, time, vehicles, keywords, directory, '.a', names, workers)
+
+
+def sensor_pointing_files(
+        time: np.ndarray,
+        vehicles: Union[np.ndarray, Mapping[str, np.ndarray]],
+        directory: Union[str, os.PathLike],
+        names: Optional[Sequence[str]] = None,
+        format: str = None,
+        time_format: str = 'EpSec',
+        epoch: datetime.datetime = None,
+        axes: str = None,
+        message: str = 'Warnings',
+        body: str = None,
+        deviations: str = None,
+        workers: Optional[int] = None,
+    ) -> List[FileResult]:
+    '''Write one STK Sensor Pointing (.sp) file per vehicle, for vehicles sharing a time base.
+
+    The parameters are the same as for `attitude_files`, and the keyword
+    parameters the same as for `sensor_pointing_file`. The files are
+    written to `directory` as {name}.sp.
+
+    Returns
+    -------
+    results: List[FileResult]
+        The result of each file, in the order of the vehicles.
+    '''
+    keywords = _sensor_pointing_keywords(
+        format, time_format, epoch, axes, message, body, deviations,
+    )
+    return write_files(SensorPointingFile, time, vehicles, keywords, directory, '.sp', names, workers)
+
+
+def _attitude_keywords(
+        format: str,
+        time_format: str,
+        epoch: datetime.datetime,
+        axes: str,
+        axes_epoch: datetime.datetime,
+        message: str,
+        body: str,
+        int_method: str,
+        int_order: int,
+        deviations: str,
+        blocking: int,
+    ) -> dict:
+    format = AttitudeFileFormat(format)
+    if message:
+        message = MessageLevel(message)
+
+    if axes:
+        coord = CoordinateAxes(axes)
+        if axes_epoch:
+            axes_epoch = CoordinateAxesEpoch(axes_epoch)
+        axes = Coordinate(axes=coord, epoch=axes_epoch)
+
+    if time_format:
+        time_format = TimeFormat(time_format)
+
+    if epoch:
+        epoch = ScenarioEpoch(epoch)
+
+    if body:
+        body = CentralBody(body)
+
+    if int_method:
+        int_method = InterpolationMethod(int_method)
+
+    if int_order:
+        int_order = InterpolationOrder(int_order)
+
+    interpolation = Interpolation(method=int_method, order=int_order)
+
+    if deviations:
+        deviations = AttitudeDeviations(deviations)
+    
+    if blocking:
+        blocking = BlockingFactor(blocking)
+
+    return dict(
+        format=format,
+        axes=axes,
+        time_fmt=time_format,
+        epoch=epoch,
+        message=message,
+        body=body,
+        interp=interpolation,
+        deviations=deviations,
+        blocking=blocking,
+    )
+
+
+def _sensor_pointing_keywords(
+        format: str,
+        time_format: str,
+        epoch: datetime.datetime,
+        axes: str,
+        message: str,
+        body: str,
+        deviations: str,
+    ) -> dict:
     format = SensorPointingFileFormat(format)
     if message:
         message = MessageLevel(message)
@@ -246,15 +504,12 @@ def sensor_pointing_file(
     if deviations:
         deviations = AttitudeDeviations(deviations)
 
-    sp_file = SensorPointingFile(
-        time,
-        data,
+    return dict(
         format=format,
+        time_fmt=time_format,
         axes=axes,
         epoch=epoch,
         message=message,
         body=body,
         deviations=deviations,
     )
-
-    return sp_file.to_string()
@@ -1,11 +1,17 @@
-import io
+import os
+import pathlib
 import numpy as np
-from typing import Union, Optional
-from numpy.typing import ArrayLike
-from dataclasses import dataclass, asdict
+from typing import Iterable, Iterator, Union, Optional, TextIO, Tuple
+from numpy.typing import ArrayLike, DTypeLike
+from dataclasses import dataclass, fields
 
 from .formats import AttitudeFileFormat, SensorPointingFileFormat
+from .formatters import iter_format_rows, CHUNK_SIZE
+from .parallel import iter_format_parallel, can_share
+from .timecache import TimeCache
+from .validators import DataValidator
 from .keywords import (
+    KEYWORD_WIDTH,
     Keyword,
     AttitudeDeviations,
     ScenarioEpoch,
@@ -20,7 +26,9 @@ from .keywords import (
     TimeFormat,
     TrendingControl,
     NumberOfAttitudePoints,
+    Sequence,
 )
+from .readers import split_file, parse_keywords, parse_rows, time_unit
 
 
 class StkFile:
@@ -51,48 +59,135 @@ class AttitudeFile(StkFile):
     initial: Optional[InitialAttitude] = None
     time_fmt: Optional[TimeFormat] = TimeFormat('EpSec')
     trending: Optional[TrendingControl] = None
+    sequence: Optional[Sequence] = None
+    validator: Optional[DataValidator] = None
+    time_cache: Optional[TimeCache] = None
 
     def __post_init__(self):
         self.time = np.asarray(self.time)
         self.data = np.asarray(self.data)
         
-        self.time, self.data = self.format.validate_data(self.time, self.data)
+        result = self.data_validator().check(self.time, self.data)
+        self.time, self.data = result.Time, result.Data
+        # Indices of the input rows removed by validation
+        self.rejected = result.Rejected
         self.points = NumberOfAttitudePoints(self.data.shape[0])
 
+    def data_validator(self) -> DataValidator:
+        '''The validator given for this file, or else the format's default.'''
+        if self.validator is not None:
+            return self.validator
+        return self.format.validator
+
+    @classmethod
+    def from_file(
+            cls,
+            file: Union[str, os.PathLike],
+            resolution: Optional[str] = None,
+            dtype: DTypeLike = np.float64,
+        ) -> 'AttitudeFile':
+        '''Read an STK file, keeping its version, header keywords and data format.
+
+        Params
+        ------
+        file: str or os.PathLike
+
+        resolution: str
+            The datetime64 unit of the time array, nanoseconds by default.
+
+        dtype: DTypeLike
+            The dtype of the data array.
+
+        Returns
+        -------
+        attitude_file: AttitudeFile
+            Keywords absent from the header are None, except time_fmt,
+            which defaults to EpSec.
+        '''
+        sections = split_file(pathlib.Path(file).read_text())
+        time, data = parse_rows(sections.Body, time_unit(sections.Keywords, resolution), dtype)
+
+        # SensorPointingFile narrows the type of format
+        format_type = {field.name: field.type for field in fields(cls)}['format']
+        obj = cls(time, data, format_type(sections.Format), **parse_keywords(sections.Keywords))
+        if sections.Version is not None:
+            obj.version = sections.Version
+        return obj
+
     def keywords(self) -> str:
         lines = []
-        for key in asdict(self).keys():
-            keyword_obj = getattr(self, key)
+        # Walk the fields rather than asdict(), which deep-copies the data
+        for field in fields(self):
+            keyword_obj = getattr(self, field.name)
             if isinstance(keyword_obj, Keyword):
                 lines.append(str(keyword_obj))
         return '\n'.join(lines) + '\n'
 
-    def format_data(self) -> str:
-        buf = io.StringIO()
-
+    def _set_default_epoch(self) -> None:
         if self.epoch is None:
             self.epoch = ScenarioEpoch(self.time[0])
-        
-        formatted_time = self.time_fmt.convert(self.time, epoch=self.epoch.value)
-        for t, row in zip(formatted_time, self.data):
-            print(
-                str(t).rjust(15),
-                ' '.join([f'{x:.6f}'.rjust(15) for x in row]),
-                file=buf
+
+    def iter_data(self, chunk_size: int = CHUNK_SIZE, workers: int = 1) -> Iterator[str]:
+        '''Yield the formatted data block, `chunk_size` rows at a time.
+
+        With `workers` greater than 1, the rows are instead split into
+        slices formatted in that many worker processes, and each slice
+        is yielded in order. Otherwise, with a time_cache, the time column
+        is converted and rendered through the cache.
+        '''
+        self._set_default_epoch()
+
+        if workers > 1 and self.data.shape[0] > 1 and can_share(self.time, self.data):
+            yield from iter_format_parallel(
+                self.time, self.data, self.time_fmt, self.epoch.value, workers, chunk_size=chunk_size,
             )
-        
-        return buf.getvalue()
+            return
+
+        if self.time_cache is not None:
+            time, field = self.time_cache.get(self.time_fmt, self.time, self.epoch.value, chunk_size)
+            yield from iter_format_rows(time, self.data, chunk_size, field)
+            return
+
+        for start in range(0, self.data.shape[0], chunk_size):
+            time = self.time[start:start + chunk_size]
+            formatted_time = self.time_fmt.convert(time, epoch=self.epoch.value)
+            yield from iter_format_rows(formatted_time, self.data[start:start + chunk_size], chunk_size)
 
-    def to_string(self) -> str:
-        # Format data first to set epoch if necessary
-        formatted_data = self.format_data()
+    def format_data(self) -> str:
+        return ''.join(self.iter_data())
+
+    def stream(self, chunk_size: int = CHUNK_SIZE, workers: int = 1) -> Iterator[str]:
+        '''Yield the file text in pieces, with at most `chunk_size` data rows per piece,
+        or one piece per slice with `workers` processes (see iter_data()).'''
+        # Set the epoch before the keywords are rendered
+        self._set_default_epoch()
 
-        return ATTITUDE_FILE_TEMPLATE.format(
+        head, tail = ATTITUDE_FILE_TEMPLATE.split('{data}')
+        yield head.format(
             version = self.version,
             keywords = self.keywords(),
             format = self.format,
-            data = formatted_data,
         )
+        yield from self.iter_data(chunk_size, workers)
+        yield tail
+
+    def write(
+            self,
+            file: Union[str, os.PathLike, TextIO],
+            chunk_size: int = CHUNK_SIZE,
+            workers: int = 1,
+        ) -> None:
+        '''Write the file incrementally to a path or an open text file object.'''
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w') as fd:
+                self.write(fd, chunk_size, workers)
+            return
+
+        for text in self.stream(chunk_size, workers):
+            file.write(text)
+
+    def to_string(self, workers: int = 1) -> str:
+        return ''.join(self.stream(workers=workers))
 
 
 @dataclass
@@ -107,3 +202,113 @@ class SensorPointingFile(AttitudeFile):
     body: Optional[CentralBody] = CentralBody('Earth')
     interp: Optional[Interpolation] = None
     deviations: Optional[AttitudeDeviations] = None
+
+
+# Room reserved for the NumberOfAttitudePoints value until it is known
+POINTS_WIDTH = 20
+
+
+@dataclass
+class ChunkedAttitudeFile(StkFile):
+    chunks: Iterable[Tuple[ArrayLike, ArrayLike]]
+    format: AttitudeFileFormat
+    epoch: Optional[ScenarioEpoch] = None
+    message: Optional[MessageLevel] = MessageLevel('Warnings')
+    axes: Optional[Coordinate] = Coordinate(CoordinateAxes('ICRF'))
+    body: Optional[CentralBody] = CentralBody('Earth')
+    interp: Optional[Interpolation] = None
+    deviations: Optional[AttitudeDeviations] = None
+    blocking: Optional[BlockingFactor] = None
+    initial: Optional[InitialAttitude] = None
+    time_fmt: Optional[TimeFormat] = TimeFormat('EpSec')
+    trending: Optional[TrendingControl] = None
+    sequence: Optional[Sequence] = None
+    validator: Optional[DataValidator] = None
+
+    def __post_init__(self):
+        self.points = NumberOfAttitudePoints(0)
+
+    keywords = AttitudeFile.keywords
+    data_validator = AttitudeFile.data_validator
+
+    def points_line(self) -> str:
+        '''The NumberOfAttitudePoints keyword, padded to a fixed width so it can be rewritten.'''
+        return str(self.points).ljust(KEYWORD_WIDTH + 1 + POINTS_WIDTH)
+
+    def iter_data(self, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+        '''Validate, convert and format each (time, data) chunk as it arrives.'''
+        validator = self.data_validator()
+        # The last row written, which the next chunk continues from
+        previous = None
+        for time, data in self.chunks:
+            time, data = np.asarray(time), np.asarray(data)
+            if time.size == 0:
+                continue
+
+            time, data = validator.validate(time, data)
+            data = validator.align(data, previous)
+            previous = data[-1]
+            if self.epoch is None:
+                self.epoch = ScenarioEpoch(time[0])
+
+            self.points.value += data.shape[0]
+            for start in range(0, data.shape[0], chunk_size):
+                formatted_time = self.time_fmt.convert(time[start:start + chunk_size], epoch=self.epoch.value)
+                yield from iter_format_rows(formatted_time, data[start:start + chunk_size], chunk_size)
+
+    def write(self, file: Union[str, os.PathLike, TextIO], chunk_size: int = CHUNK_SIZE) -> NumberOfAttitudePoints:
+        '''Write the file incrementally to a path or an open text file object.
+
+        If the file is seekable, NumberOfAttitudePoints is written as a
+        placeholder and rewritten once every chunk has been consumed.
+        Otherwise it is omitted, and STK counts the points itself.
+
+        Returns
+        -------
+        points: NumberOfAttitudePoints
+            The number of attitude points written.
+        '''
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w') as fd:
+                return self.write(fd, chunk_size)
+
+        # The first chunk sets the default epoch, which the keywords need
+        data = self.iter_data(chunk_size)
+        first = next(data, '')
+
+        head, tail = ATTITUDE_FILE_TEMPLATE.split('{data}')
+        before, after = head.split('{keywords}')
+        file.write(before.format(version=self.version))
+
+        points_pos = None
+        if file.seekable():
+            points_pos = file.tell()
+            file.write(self.points_line() + '\n')
+
+        file.write(self.keywords())
+        file.write(after.format(format=self.format))
+        file.write(first)
+        for text in data:
+            file.write(text)
+        file.write(tail)
+
+        if points_pos is not None:
+            end = file.tell()
+            file.seek(points_pos)
+            file.write(self.points_line())
+            file.seek(end)
+
+        return self.points
+
+
+@dataclass
+class ChunkedSensorPointingFile(ChunkedAttitudeFile):
+    chunks: Iterable[Tuple[ArrayLike, ArrayLike]]
+    format: SensorPointingFileFormat
+    epoch: Optional[ScenarioEpoch] = None
+    time_fmt: Optional[TimeFormat] = TimeFormat('EpSec')
+    message: Optional[MessageLevel] = MessageLevel('Warnings')
+    axes: Optional[Coordinate] = Coordinate(CoordinateAxes('ICRF'))
+    body: Optional[CentralBody] = CentralBody('Earth')
+    interp: Optional[Interpolation] = None
+    deviations: Optional[AttitudeDeviations] = None
@@ -5,9 +5,15 @@ from typing import Tuple
 from systemstoolkit.files.keywords import KeywordEnum
 from systemstoolkit.files.validators import (
     DataValidator,
+    DataShapeValidator,
     QuaternionValidator,
     AngleValidator,
+    FiniteValidator,
+    VectorValidator,
+    DCMValidator,
+    CompositeValidator,
     NoValidator,
+    ValidationResult,
 )
 
 
@@ -15,6 +21,9 @@ class DataFileFormat(KeywordEnum):
     def validate_data(self, time: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         return self.validator.validate(time, data)
 
+    def check_data(self, time: np.ndarray, data: np.ndarray) -> ValidationResult:
+        return self.validator.check(time, data)
+
 
 class AttitudeFileFormat(DataFileFormat):
     # Quaternion-based formats
@@ -48,8 +57,29 @@ class AttitudeFileFormat(DataFileFormat):
     def validator(self) -> DataValidator:
         if self.name in ['Quaternions', 'QuatScalarFirst']:
             return QuaternionValidator()
+        elif self.name == 'QuatAngVels':
+            return CompositeValidator(7, [
+                (slice(0, 4), QuaternionValidator()),
+                (slice(4, 7), FiniteValidator()),
+            ])
+        elif self.name in ['AngVels', 'EulerAngleRates', 'YPRAngleRates']:
+            return FiniteValidator()
         elif self.name in ['EulerAngles', 'YPRAngles']:
             return AngleValidator()
+        elif self.name in ['EulerAnglesAndRates', 'YPRAnglesAndRates']:
+            return CompositeValidator(6, [
+                (slice(0, 3), AngleValidator()),
+                (slice(3, 6), FiniteValidator()),
+            ])
+        elif self.name == 'DCM':
+            return DCMValidator()
+        elif self.name == 'DCMAngVels':
+            return CompositeValidator(12, [
+                (slice(0, 9), DCMValidator()),
+                (slice(9, 12), FiniteValidator()),
+            ])
+        elif self.name in ['ECFVector', 'ECIVector']:
+            return VectorValidator()
         else:
             return NoValidator()
 
@@ -69,5 +99,7 @@ class SensorPointingFileFormat(DataFileFormat):
             return QuaternionValidator()
         elif self.name in ['EulerAngles', 'YPRAngles']:
             return AngleValidator()
+        elif self.name == 'AzElAngles':
+            return AngleValidator(shape_validator=DataShapeValidator(ncols=2))
         else:
             return NoValidator()
@@ -0,0 +1,308 @@
+'''Fast fixed-width formatting of attitude data rows.
+
+Rows are rendered as ``str(t).rjust(15)`` followed by each data value as
+``f'{x:.6f}'.rjust(15)``, all separated by single spaces. Rather than
+formatting one value at a time, each chunk of rows is rendered into a
+matrix of ASCII codes with whole-array integer arithmetic. Values whose
+text cannot be proven identical this way (e.g. NaN, very large values,
+or a value sitting on a rounding boundary) are formatted individually.
+'''
+import numpy as np
+from typing import Iterator, Optional, Tuple
+
+from systemstoolkit.typing import ArrayLike
+
+
+TIME_WIDTH = 15
+DATA_WIDTH = 15
+DATA_PRECISION = 6
+CHUNK_SIZE = 100_000
+
+# Shortest round-trip reprs are only rebuilt from integers when they
+# have at most this many significant digits and decimal places.
+_MAX_REPR_DIGITS = 15
+_MAX_REPR_DECIMALS = 9
+
+_ZERO, _SPACE, _DOT, _MINUS, _NEWLINE = b'0 .-\n'
+
+
+def row_template(ncols: int) -> str:
+    '''The printf-style template for one data row with `ncols` data columns.'''
+    data = ' '.join([f'%{DATA_WIDTH}.{DATA_PRECISION}f'] * ncols)
+    return f'%{TIME_WIDTH}s {data}\n'
+
+
+def _digits(values: np.ndarray, ndigits: int) -> np.ndarray:
+    '''The zero-padded decimal digits of non-negative integers as ASCII codes.'''
+    out = np.empty((values.size, ndigits), dtype=np.uint8)
+    values = values.astype(np.int32 if ndigits <= 9 else np.int64)
+    for i in range(ndigits - 1, -1, -1):
+        values, out[:, i] = np.divmod(values, 10)
+    return out + _ZERO
+
+
+def _num_digits(values: np.ndarray) -> np.ndarray:
+    '''The number of decimal digits in non-negative integers (at least 1).'''
+    count = np.ones(values.shape, dtype=np.int64)
+    for i in range(1, 19):
+        count += values >= 10 ** i
+    return count
+
+
+def _render_positional(
+        ip: np.ndarray,
+        fp: np.ndarray,
+        ndec: int,
+        neg: np.ndarray,
+        width: int,
+    ) -> np.ndarray:
+    '''Render "[-]ip.fp" right-justified in `width` columns as ASCII codes.
+
+    The caller guarantees that every value fits in the field.
+    '''
+    nint = width - ndec - 1
+    out = np.full((ip.size, width), _SPACE, dtype=np.uint8)
+    out[:, nint] = _DOT
+    out[:, nint + 1:] = _digits(fp, ndec)
+
+    nd = _num_digits(ip)
+    place = np.arange(nint - 1, -1, -1)
+    out[:, :nint] = np.where(place >= nd[:, None], _SPACE, _digits(ip, nint))
+
+    rows = np.flatnonzero(neg)
+    out[rows, nint - 1 - nd[rows]] = _MINUS
+    return out
+
+
+def _fixed_field(x: np.ndarray, width: int, precision: int) -> Optional[np.ndarray]:
+    '''Render floats as `f'{x:.{precision}f}'.rjust(width)`, or None if not possible.'''
+    x = x.astype(np.float64)
+    scale = 10 ** precision
+    limit = 10 ** (width - 2)
+
+    with np.errstate(invalid='ignore', over='ignore'):
+        p = np.abs(x) * scale
+        k = np.rint(p)
+        # The product is inexact, so only trust it away from a rounding tie
+        ok = np.isfinite(p) & (k < limit)
+        ok &= np.abs(np.abs(p - np.floor(p)) - 0.5) > 2 * np.spacing(p)
+
+    k = np.where(ok, k, 0).astype(np.int64)
+    ip, fp = np.divmod(k, scale)
+    out = _render_positional(ip, fp, precision, np.signbit(x) & ok, width)
+
+    for i in np.flatnonzero(~ok):
+        text = f'{x[i]:.{precision}f}'.rjust(width)
+        if len(text) != width:
+            return None
+        out[i] = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+    return out
+
+
+def _repr_field(t: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    '''Render float64 values as `str(t).rjust(width)` where it can be done exactly.
+
+    Returns the ASCII codes and a mask of the values that were rendered.
+    '''
+    a = np.abs(t)
+    ndec = np.full(a.shape, -1, dtype=np.int64)
+    k = np.zeros(a.shape, dtype=np.int64)
+
+    # A decimal with <= 15 significant digits that round-trips to the
+    # value is its shortest repr, so find the fewest decimals that do.
+    with np.errstate(invalid='ignore', over='ignore'):
+        for d in range(_MAX_REPR_DECIMALS + 1):
+            scale = 10.0 ** d
+            kd = np.rint(a * scale)
+            hit = (ndec < 0) & (kd < 10.0 ** _MAX_REPR_DIGITS) & (kd / scale == a)
+            ndec[hit] = d
+            k[hit] = kd[hit]
+
+        # Python switches to exponent notation below 1e-4
+        ok = (ndec >= 0) & ((a >= 1e-4) | (a == 0))
+
+    neg = np.signbit(t)
+    out = np.full((a.size, width), _SPACE, dtype=np.uint8)
+    for d in range(_MAX_REPR_DECIMALS + 1):
+        rows = np.flatnonzero(ok & (ndec == d))
+        if rows.size == 0:
+            continue
+        ip, fp = np.divmod(k[rows], 10 ** d)
+        nfrac = max(d, 1)
+        fits = _num_digits(ip) + neg[rows] <= width - nfrac - 1
+        ok[rows[~fits]] = False
+        rows = rows[fits]
+        out[rows] = _render_positional(ip[fits], fp[fits], nfrac, neg[rows], width)
+    return out, ok
+
+
+def _str_field(t: np.ndarray, width: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    '''Render values as `str(t).rjust(width)`.
+
+    Returns left-aligned ASCII codes and the length of each value,
+    or None if the text is not ASCII.
+    '''
+    if t.dtype.kind == 'U' and t.dtype.itemsize // 4 >= width:
+        # The characters of fixed-width text (e.g. ISO-YMD times) are the
+        # UCS4 codes of the str array, so use them as they are
+        codes = np.ascontiguousarray(t).view(np.uint32).reshape(t.size, -1)
+        if t.size and np.all(codes[:, -1] != 0) and np.all(codes < 128):
+            return codes.astype(np.uint8), np.full(t.size, codes.shape[1], dtype=np.int64)
+
+    text = t.astype(str)
+    lengths = np.char.str_len(text)
+    # np.char.rjust truncates to the field width, so leave long values alone
+    short = lengths < width
+    if short.any():
+        text = np.where(short, np.char.rjust(text, width), text)
+    lengths = np.maximum(lengths, width)
+    try:
+        text = text.astype(f'S{max(lengths.max(initial=0), 1)}')
+    except UnicodeEncodeError:
+        return None
+    return text.view(np.uint8).reshape(t.size, -1), lengths
+
+
+def _time_field(time: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    '''Render the time column as `str(t).rjust(TIME_WIDTH)`.'''
+    if time.dtype.kind == 'f' and time.dtype.itemsize == 8:
+        out, ok = _repr_field(time, TIME_WIDTH)
+        lengths = np.full(time.size, TIME_WIDTH, dtype=np.int64)
+        if ok.all():
+            return out, lengths
+
+        rows = np.flatnonzero(~ok)
+        rest, lengths[rows] = _str_field(time[rows], TIME_WIDTH)
+        if rest.shape[1] > TIME_WIDTH:
+            out = np.pad(out, ((0, 0), (0, rest.shape[1] - TIME_WIDTH)))
+        out[rows, :rest.shape[1]] = rest
+        return out, lengths
+
+    if time.dtype.kind in 'fiuU':
+        return _str_field(time, TIME_WIDTH)
+    return None
+
+
+def _join_rows(time: np.ndarray, lengths: np.ndarray, data: np.ndarray) -> bytes:
+    '''Concatenate variable-length time text with fixed-width data text, row by row.'''
+    rows = np.concatenate([time, data], axis=1)
+    if np.all(lengths == time.shape[1]):
+        return rows.tobytes()
+
+    keep = np.ones(rows.shape, dtype=bool)
+    keep[:, :time.shape[1]] = np.arange(time.shape[1]) < lengths[:, None]
+    return rows[keep].tobytes()
+
+
+def format_time_column(time: ArrayLike, chunk_size: int = CHUNK_SIZE) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    '''Render a whole converted time column, for reuse with iter_format_rows().
+
+    Returns the left-aligned ASCII codes of each row, padded to the widest,
+    and the length of each, or None if the column can only be formatted
+    row by row.
+    '''
+    time = np.asarray(time).reshape(-1)
+    fields = []
+    for start in range(0, time.size, chunk_size):
+        field = _time_field(time[start:start + chunk_size])
+        if field is None:
+            return None
+        fields.append(field)
+    if not fields:
+        return np.empty((0, TIME_WIDTH), dtype=np.uint8), np.empty(0, dtype=np.int64)
+
+    width = max(codes.shape[1] for codes, _ in fields)
+    codes = np.concatenate([np.pad(codes, ((0, 0), (0, width - codes.shape[1]))) for codes, _ in fields])
+    return codes, np.concatenate([lengths for _, lengths in fields])
+
+
+def _format_chunk_array(
+        time: np.ndarray,
+        data: np.ndarray,
+        time_field: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> Optional[str]:
+    '''Render a chunk of rows as matrices of ASCII codes.'''
+    if data.dtype.kind not in 'fiu':
+        return None
+
+    if time_field is None:
+        time_field = _time_field(time)
+    if time_field is None:
+        return None
+
+    fields = []
+    for column in data.T:
+        field = _fixed_field(column, DATA_WIDTH, DATA_PRECISION)
+        if field is None:
+            return None
+        fields.append(field)
+
+    # Every data column is preceded by a space, as is an empty data row
+    nrows, ncols = data.shape
+    width = DATA_WIDTH * ncols + max(ncols, 1) + 1
+    rows = np.full((nrows, width), _SPACE, dtype=np.uint8)
+    for i, field in enumerate(fields):
+        col = 1 + i * (DATA_WIDTH + 1)
+        rows[:, col:col + DATA_WIDTH] = field
+    rows[:, -1] = _NEWLINE
+    return _join_rows(*time_field, rows).decode('ascii')
+
+
+def _format_chunk_template(time: np.ndarray, data: np.ndarray) -> str:
+    '''Render a chunk of rows with a single printf-style format operation.'''
+    nrows, ncols = data.shape
+    if time.dtype.kind == 'f' and time.dtype.itemsize != 8:
+        # Python floats print like np.float64, not like narrower floats
+        time = time.astype(str)
+    rows = np.empty((nrows, ncols + 1), dtype=object)
+    rows[:, 0] = time.tolist()
+    rows[:, 1:] = data
+    return (row_template(ncols) * nrows) % tuple(rows.ravel().tolist())
+
+
+def iter_format_rows(
+        time: ArrayLike,
+        data: ArrayLike,
+        chunk_size: int = CHUNK_SIZE,
+        time_field: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    ) -> Iterator[str]:
+    '''Format the time column and data matrix as fixed-width text.
+
+    Params
+    ------
+    time: np.ndarray
+        The already-converted time column (e.g. EpSec floats or ISO-YMD strings).
+
+    data: np.ndarray[][]
+
+    chunk_size: int
+        The number of rows rendered per yielded string.
+
+    time_field: Optional[Tuple[np.ndarray, np.ndarray]]
+        The time column already rendered by format_time_column(), e.g.
+        when it is shared by many files.
+
+    Yields
+    ------
+    text: str
+        The formatted rows, each terminated by a newline.
+    '''
+    time = np.asarray(time).reshape(-1)
+    data = np.asarray(data)
+
+    for start in range(0, data.shape[0], chunk_size):
+        stop = min(start + chunk_size, data.shape[0])
+        t, d = time[start:stop], data[start:stop]
+        field = None
+        if time_field is not None:
+            codes, lengths = time_field
+            field = codes[start:stop], lengths[start:stop]
+        text = _format_chunk_array(t, d, field)
+        if text is None:
+            text = _format_chunk_template(t, d)
+        yield text
+
+
+def format_rows(time: ArrayLike, data: ArrayLike) -> str:
+    '''Format the time column and data matrix as one fixed-width text block.'''
+    return ''.join(iter_format_rows(time, data))
@@ -1,6 +1,6 @@
 import numpy as np
 from enum import Enum, auto
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import Optional, Union
 
 from systemstoolkit.utils import stk_datetime
@@ -34,7 +34,7 @@ class CompoundKeyword(Keyword):
     def __str__(self) -> str:
         # Iterate through the dataclass fields
         # returning formatted keywords that are not None
-        keywords = [getattr(self, key) for key in asdict(self)]
+        keywords = [getattr(self, field.name) for field in fields(self)]
         return '\n'.join([str(key) for key in keywords if key is not None])
 
 
@@ -101,7 +101,9 @@ class Epoch(Keyword):
         self.value = np.datetime64(self.value)
 
     def __str__(self) -> str:
-        return f'{str(self.keyword).ljust(KEYWORD_WIDTH)} {stk_datetime(self.value)}'
+        # Keep sub-millisecond epochs exact, since data times are relative to them
+        digits = 3 if self.value.astype('datetime64[ms]') == self.value else 9
+        return f'{str(self.keyword).ljust(KEYWORD_WIDTH)} {stk_datetime(self.value, digits)}'
 
 
 class ScenarioEpoch(Epoch):
@@ -142,6 +144,11 @@ class BlockingFactor(Keyword):
     value: int = None
 
 
+@dataclass
+class Sequence(Keyword):
+    value: int = None
+
+
 class InitialAttitude(Keyword):
     pass
 
@@ -164,8 +171,8 @@ class TimeFormat(Keyword, KeywordEnum):
             if member.name.lower() == name.replace('-', '').lower():
                 return member
 
-    def convert(self, time: ArrayLike, epoch=None) -> ArrayLike:
-        time_fmt = self.value(epoch)
+    def convert(self, time: ArrayLike, epoch=None, resolution: Optional[str] = None) -> ArrayLike:
+        time_fmt = self.value(epoch, resolution)
         return time_fmt.convert(time)
 
     def __str__(self) -> str: # pragma: no cover
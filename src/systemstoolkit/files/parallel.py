@@ -0,0 +1,138 @@
+'''Formatting of one large data block across worker processes.
+
+The time and data arrays are copied once into shared memory, which each
+worker attaches to, so only row ranges are sent to the workers, not the
+arrays. Each worker converts and formats its slices independently, and
+the formatted slices are yielded in order.
+'''
+import contextlib
+import collections
+import concurrent.futures
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from .formatters import iter_format_rows, CHUNK_SIZE
+from .keywords import TimeFormat
+
+
+# The most rows in each slice sent to a worker
+SLICE_SIZE = 1_000_000
+# The number of slices per worker, so that workers finishing early pick up more
+SLICES_PER_WORKER = 4
+
+# The shared arrays and other state of a worker process, set by attach_shared()
+worker_state = {}
+
+
+def share_array(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, tuple]:
+    '''Copy an array into a new shared memory block.
+
+    Returns the block and the (name, shape, dtype) a worker attaches with.
+    '''
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+@contextlib.contextmanager
+def shared_arrays(**arrays: np.ndarray) -> Iterator[Dict[str, tuple]]:
+    '''Copy arrays into shared memory, which is released on leaving the block.
+
+    Yields the descriptors of the arrays, by key, to attach_shared() with.
+    '''
+    blocks = {}
+    try:
+        for key, array in arrays.items():
+            blocks[key] = share_array(np.ascontiguousarray(array))
+        yield {key: descriptor for key, (_, descriptor) in blocks.items()}
+    finally:
+        for shm, _ in blocks.values():
+            shm.close()
+            shm.unlink()
+
+
+def attach_shared(arrays: Dict[str, tuple], state: dict) -> None:
+    '''Initialize a worker process with the shared arrays and other state.
+
+    Each array is set in worker_state by its key in `arrays`, along with
+    the items of `state`.
+    '''
+    for key, (name, shape, dtype) in arrays.items():
+        shm = shared_memory.SharedMemory(name=name)
+        # Keep the block open for as long as the worker runs
+        worker_state[key + '_shm'] = shm
+        worker_state[key] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+    worker_state.update(state)
+
+
+def _format_slice(start: int, stop: int, chunk_size: int) -> str:
+    time = worker_state['time'][start:stop]
+    formatted_time = worker_state['time_fmt'].convert(time, epoch=worker_state['epoch'])
+    return ''.join(iter_format_rows(formatted_time, worker_state['data'][start:stop], chunk_size))
+
+
+def can_share(*arrays: np.ndarray) -> bool:
+    '''Whether the arrays can be placed in shared memory (i.e. are not object arrays).'''
+    return all(array.dtype.kind != 'O' for array in arrays)
+
+
+def iter_format_parallel(
+        time: np.ndarray,
+        data: np.ndarray,
+        time_fmt: TimeFormat,
+        epoch: np.datetime64,
+        workers: int,
+        slice_size: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[str]:
+    '''Convert and format the time and data rows in `workers` processes.
+
+    Params
+    ------
+    time: np.ndarray[np.datetime64]
+
+    data: np.ndarray[][]
+
+    time_fmt: TimeFormat
+        The format the time column is converted to.
+
+    epoch: np.datetime64
+        The epoch of epoch-relative time formats.
+
+    workers: int
+        The number of worker processes.
+
+    slice_size: Optional[int]
+        The number of rows formatted by a worker at a time. Up to two
+        slices per worker are held in memory while waiting to be yielded.
+        By default, the rows are split into SLICES_PER_WORKER slices per
+        worker, of at most SLICE_SIZE rows.
+
+    chunk_size: int
+        The number of rows a worker formats per array operation.
+
+    Yields
+    ------
+    text: str
+        The formatted rows of each slice, in order.
+    '''
+    nrows = data.shape[0]
+    if slice_size is None:
+        slice_size = min(SLICE_SIZE, -(-nrows // (SLICES_PER_WORKER * workers)))
+    slice_size = max(slice_size, 1)
+
+    with shared_arrays(time=time, data=data) as arrays, concurrent.futures.ProcessPoolExecutor(
+        workers,
+        initializer=attach_shared,
+        initargs=(arrays, {'time_fmt': time_fmt, 'epoch': epoch}),
+    ) as pool:
+        pending = collections.deque()
+        for start in range(0, nrows, slice_size):
+            stop = min(start + slice_size, nrows)
+            pending.append(pool.submit(_format_slice, start, stop, chunk_size))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,425 @@
+'''Read STK attitude (.a) and sensor pointing (.sp) files.'''
+import re
+import mmap
+import pathlib
+import warnings
+import collections
+import numpy as np
+from typing import Optional, Tuple
+from numpy.typing import DTypeLike
+from numpy.lib.stride_tricks import sliding_window_view
+
+from systemstoolkit.utils import parse_stk_datetime
+from systemstoolkit.units.time import TimeUnit, EpochTimeUnit
+from .keywords import (
+    AttitudeDeviations,
+    ScenarioEpoch,
+    Coordinate,
+    CoordinateAxes,
+    CoordinateAxesEpoch,
+    MessageLevel,
+    CentralBody,
+    BlockingFactor,
+    Interpolation,
+    InterpolationMethod,
+    InterpolationOrder,
+    Sequence,
+    TimeFormat,
+)
+
+
+FileSections = collections.namedtuple(
+    'FileSections',
+    ['Keywords', 'Format', 'Body', 'Version'],
+)
+
+_DATA_FORMAT = re.compile(r'^[ \t]*AttitudeTime(\w+)[ \t]*\r?$', re.MULTILINE | re.IGNORECASE)
+_END = re.compile(r'^[ \t]*END[ \t]+Attitude', re.MULTILINE | re.IGNORECASE)
+_COMMENT = re.compile(r'#.*$', re.MULTILINE)
+_DATA_FORMAT_BYTES = re.compile(rb'^[ \t]*AttitudeTime(\w+)[ \t]*\r?$', re.MULTILINE | re.IGNORECASE)
+_END_BYTES = re.compile(rb'^[ \t]*END[ \t]+Attitude', re.MULTILINE | re.IGNORECASE)
+_NEWLINE, _HASH, _SPACE = b'\n# '
+_FIRST_ROW = re.compile(r'\S[^\n]*')
+_VERSION = re.compile(r'^\s*stk\.v\.(\S+)', re.IGNORECASE)
+_END_SEARCH_SIZE = 65536
+# The bytes searched at once for the first non-whitespace character of a line
+_LOOKAHEAD = 32
+
+
+def split_file(text: str) -> FileSections:
+    '''Split the file text into its header keywords, data format and data block.
+
+    Keyword names are lower-cased. The version is None if the file does
+    not start with an "stk.v.<version>" line. The data block runs from the line after
+    the "AttitudeTime*" format line to "END Attitude", which must be within
+    the last 64 KiB of the text, or to the end of the text.
+    '''
+    match = _DATA_FORMAT.search(text)
+    if match is None:
+        raise ValueError('No "AttitudeTime<Format>" line found in file')
+
+    # Only the tail can hold "END Attitude", so avoid scanning the data rows
+    end = _END.search(text, max(match.end(), len(text) - _END_SEARCH_SIZE))
+    body = text[match.end():end.start() if end else len(text)]
+
+    keywords = {}
+    for line in text[:match.start()].splitlines():
+        parts = line.split('#', 1)[0].split(maxsplit=1)
+        if len(parts) == 2:
+            keywords[parts[0].lower()] = parts[1].strip()
+
+    version = _VERSION.match(text)
+    version = version.group(1) if version else None
+    return FileSections(keywords, match.group(1), body, version)
+
+
+def _check_row_lengths(body: str, ncols: int) -> int:
+    '''Check that every non-blank line of a comment-free block has `ncols` tokens.
+
+    Returns the number of rows.
+    '''
+    chars = np.frombuffer(body.encode(), dtype=np.uint8)
+    # Whitespace (and any other control character) separates tokens
+    space = chars <= _SPACE
+    # A token starts at each non-space character following a space
+    start = ~space
+    start[1:] &= space[:-1]
+    starts = np.flatnonzero(start)
+    # The number of tokens before the end of each line
+    ends = np.searchsorted(starts, np.flatnonzero(chars == _NEWLINE))
+    lengths = np.diff(ends, prepend=0, append=starts.size)
+    lengths = lengths[lengths > 0]
+    if np.any(lengths != ncols):
+        raise ValueError(f'Data block does not have {ncols} values on every row')
+    return lengths.size
+
+
+def parse_data_block(body: str) -> np.ndarray:
+    '''Parse a block of whitespace-separated numeric rows in one pass.
+
+    Returns
+    -------
+    values: np.ndarray[float64]
+        A (rows, columns) array, where the column count is taken from the first row.
+    '''
+    if '#' in body:
+        body = _COMMENT.sub('', body)
+
+    first = _FIRST_ROW.search(body)
+    if first is None:
+        return np.empty((0, 0), dtype=np.float64)
+    ncols = len(first.group().split())
+
+    with warnings.catch_warnings():
+        # NumPy warns, rather than raises, when it stops at a bad token
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(body, dtype=np.float64, sep=' ')
+        except DeprecationWarning:
+            raise ValueError('Data block contains non-numeric values') from None
+
+    nrows = _check_row_lengths(body, ncols)
+    if values.size != nrows * ncols:
+        raise ValueError('Data block contains non-numeric values')
+    return values.reshape(nrows, ncols)
+
+
+def parse_text_block(body: str) -> Tuple[np.ndarray, np.ndarray]:
+    '''Parse a block of rows whose first column is text (e.g. ISO-YMD times).
+
+    Returns
+    -------
+    first: np.ndarray[str]
+        The first column.
+
+    values: np.ndarray[float64]
+        A (rows, columns - 1) array of the remaining columns.
+    '''
+    if '#' in body:
+        body = _COMMENT.sub('', body)
+
+    first = _FIRST_ROW.search(body)
+    if first is None:
+        return np.empty(0, dtype=str), np.empty((0, 0), dtype=np.float64)
+    ncols = len(first.group().split())
+
+    nrows = _check_row_lengths(body, ncols)
+    tokens = np.array(body.split()).reshape(nrows, ncols)
+    return tokens[:, 0], tokens[:, 1:].astype(np.float64)
+
+
+def time_unit(keywords: dict, resolution: Optional[str] = None) -> TimeUnit:
+    '''The TimeUnit of the data block's time column, given the header keywords.'''
+    time_fmt = TimeFormat(keywords.get('timeformat', 'EpSec'))
+    if not issubclass(time_fmt.value, EpochTimeUnit):
+        return time_fmt.value(resolution=resolution)
+
+    if 'scenarioepoch' not in keywords:
+        raise ValueError('File has no ScenarioEpoch')
+    return time_fmt.value(parse_stk_datetime(keywords['scenarioepoch']), resolution)
+
+
+def parse_keywords(keywords: dict) -> dict:
+    '''Convert the header keywords to the Keyword objects of an AttitudeFile.
+
+    Keywords missing from the header are None, except TimeFormat, which
+    defaults to EpSec. NumberOfAttitudePoints is not returned, since it is
+    implied by the data, and unrecognized keywords are ignored.
+    '''
+    def get(name: str, keyword_type: type):
+        if name not in keywords:
+            return None
+        return keyword_type(keywords[name])
+
+    def get_int(name: str, keyword_type: type):
+        if name not in keywords:
+            return None
+        return keyword_type(int(keywords[name]))
+
+    def get_epoch(name: str, keyword_type: type):
+        if name not in keywords:
+            return None
+        return keyword_type(parse_stk_datetime(keywords[name]))
+
+    axes = None
+    if 'coordinateaxes' in keywords:
+        axes = Coordinate(
+            get('coordinateaxes', CoordinateAxes),
+            get_epoch('coordinateaxesepoch', CoordinateAxesEpoch),
+        )
+
+    interp = None
+    if 'interpolationmethod' in keywords or 'interpolationorder' in keywords:
+        interp = Interpolation(
+            get('interpolationmethod', InterpolationMethod),
+            get_int('interpolationorder', InterpolationOrder),
+        )
+
+    return dict(
+        epoch = get_epoch('scenarioepoch', ScenarioEpoch),
+        message = get('messagelevel', MessageLevel),
+        axes = axes,
+        body = get('centralbody', CentralBody),
+        interp = interp,
+        deviations = get('attitudedeviations', AttitudeDeviations),
+        blocking = get_int('blockingfactor', BlockingFactor),
+        time_fmt = get('timeformat', TimeFormat) or TimeFormat('EpSec'),
+        sequence = get_int('sequence', Sequence),
+    )
+
+
+def parse_rows(
+        body: str,
+        unit: TimeUnit,
+        dtype: DTypeLike = np.float64,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    '''Parse the data block, converting its time column with `unit`.
+
+    The time column is always parsed as float64, whatever the data `dtype`.
+
+    Returns
+    -------
+    time: np.ndarray[datetime64]
+        At the resolution of `unit` (nanoseconds by default).
+
+    data: np.ndarray[dtype][]
+    '''
+    if not unit.numeric:
+        time, data = parse_text_block(body)
+        return unit.to_datetime(time), data.astype(dtype, copy=False)
+
+    values = parse_data_block(body)
+    if values.shape[1] == 0:
+        values = values.reshape(0, 1)
+    return unit.to_datetime(values[:, 0]), values[:, 1:].astype(dtype, copy=False)
+
+
+def parse_attitude_file(
+        text: str,
+        resolution: Optional[str] = None,
+        dtype: DTypeLike = np.float64,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    '''Parse the text of an STK attitude or sensor pointing file.
+
+    Params
+    ------
+    text: str
+
+    resolution: str
+        The datetime64 unit of the returned times, nanoseconds by default.
+
+    dtype: DTypeLike
+        The dtype of the returned data.
+
+    Returns
+    -------
+    time: np.ndarray[datetime64]
+
+    data: np.ndarray[dtype][]
+    '''
+    sections = split_file(text)
+    return parse_rows(sections.Body, time_unit(sections.Keywords, resolution), dtype)
+
+
+def read_attitude_file(
+        file,
+        resolution: Optional[str] = None,
+        dtype: DTypeLike = np.float64,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+    '''Read an STK attitude (.a) or sensor pointing (.sp) file.
+
+    See parse_attitude_file() for the parameters.
+
+    Returns
+    -------
+    time: np.ndarray[datetime64]
+
+    data: np.ndarray[dtype][]
+    '''
+    return parse_attitude_file(pathlib.Path(file).read_text(), resolution, dtype)
+
+
+class MappedAttitudeFile:
+    '''Read time windows from a large attitude file without parsing all of it.
+
+    The file is memory-mapped and a sparse index of the byte offset and
+    time of every `stride`-th data row is built with one vectorized scan
+    for newlines. A window is then located by binary search on the index,
+    and only the rows between the two bracketing index entries are parsed.
+    The time column must be non-decreasing.
+
+    Params
+    ------
+    file: str or os.PathLike
+
+    stride: int
+        The number of data rows between index entries.
+
+    resolution: str
+        The datetime64 unit of the returned times, nanoseconds by default.
+
+    dtype: DTypeLike
+        The dtype of the returned data.
+    '''
+    block_size = 2 ** 26
+
+    def __init__(
+            self,
+            file,
+            stride: int = 1024,
+            resolution: Optional[str] = None,
+            dtype: DTypeLike = np.float64,
+        ) -> None:
+        self.stride = stride
+        self.dtype = dtype
+        self._fd = open(file, 'rb')
+        try:
+            self._mm = mmap.mmap(self._fd.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._fd.close()
+            raise ValueError(f'Cannot map empty file "{file}"') from None
+
+        match = _DATA_FORMAT_BYTES.search(self._mm)
+        if match is None:
+            self.close()
+            raise ValueError('No "AttitudeTime<Format>" line found in file')
+
+        sections = split_file(self._mm[:match.end()].decode())
+        self.keywords = sections.Keywords
+        self.format = sections.Format
+        self.time_unit = time_unit(self.keywords, resolution)
+
+        size = len(self._mm)
+        end = _END_BYTES.search(self._mm, max(match.end(), size - _END_SEARCH_SIZE))
+        self._data_start = match.end()
+        self._data_end = end.start() if end else size
+
+        self._build_index()
+
+    def __enter__(self) -> 'MappedAttitudeFile':
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def close(self) -> None:
+        self._mm.close()
+        self._fd.close()
+
+    def _build_index(self) -> None:
+        data = np.frombuffer(self._mm, dtype=np.uint8, count=self._data_end - self._data_start, offset=self._data_start)
+
+        offsets = []
+        rows = 0
+        for pos in range(0, data.size, self.block_size):
+            block = data[pos:pos + self.block_size]
+            starts = np.flatnonzero(block == _NEWLINE) + pos + 1
+            starts = starts[starts < data.size]
+            # Skip blank and comment lines
+            starts = starts[self._data_lines(data, starts)]
+
+            first = -rows % self.stride
+            offsets.append(starts[first::self.stride] + self._data_start)
+            rows += starts.size
+
+        self._rows = rows
+        self.index_offset = np.concatenate(offsets) if offsets else np.empty(0, dtype=np.int64)
+        values = [
+            self._mm[offset:self._mm.find(b'\n', offset)].split(maxsplit=1)[0].decode()
+            for offset in self.index_offset
+        ]
+        dtype = np.float64 if self.time_unit.numeric else str
+        self.index_time = self.time_unit.to_datetime(np.array(values, dtype=dtype))
+
+    def _data_lines(self, data: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        '''A mask of the lines at `starts` that are neither blank nor a comment.
+
+        A line holds data if its first non-whitespace character comes before
+        its newline and is not '#'. That character is looked for in the next
+        _LOOKAHEAD bytes at once, and only lines indented further are
+        checked on their own.
+        '''
+        mask = np.zeros(starts.size, dtype=bool)
+        near = np.flatnonzero(starts <= data.size - _LOOKAHEAD)
+        unresolved = np.flatnonzero(starts > data.size - _LOOKAHEAD)
+        if near.size:
+            windows = sliding_window_view(data, _LOOKAHEAD)[starts[near]]
+            # The first newline or non-whitespace character of each line
+            first = ((windows > _SPACE) | (windows == _NEWLINE)).argmax(axis=1)
+            char = windows[np.arange(near.size), first]
+            mask[near] = (char > _SPACE) & (char != _HASH)
+            # Lines with only whitespace in the window
+            unresolved = np.concatenate([near[(char <= _SPACE) & (char != _NEWLINE)], unresolved])
+
+        for i in unresolved:
+            offset = self._data_start + starts[i]
+            stop = self._mm.find(b'\n', offset, self._data_end)
+            line = self._mm[offset:stop if stop >= 0 else self._data_end].lstrip()
+            mask[i] = bool(line) and not line.startswith(b'#')
+        return mask
+
+    def read_window(self, t0, t1) -> Tuple[np.ndarray, np.ndarray]:
+        '''Read the rows with t0 <= time <= t1.
+
+        Returns
+        -------
+        time: np.ndarray[datetime64]
+
+        data: np.ndarray[dtype][]
+        '''
+        t0, t1 = np.datetime64(t0, 'ns'), np.datetime64(t1, 'ns')
+
+        # Start at the last index entry strictly before t0, and stop at
+        # the first one after t1, so that repeated times are kept.
+        i = max(np.searchsorted(self.index_time, t0, side='left') - 1, 0)
+        j = np.searchsorted(self.index_time, t1, side='right')
+        start = self.index_offset[i] if i < self.index_offset.size else self._data_end
+        stop = self.index_offset[j] if j < self.index_offset.size else self._data_end
+
+        time, data = parse_rows(self._mm[start:stop].decode(), self.time_unit, self.dtype)
+        idx = (time >= t0) & (time <= t1)
+        return time[idx], data[idx]
@@ -0,0 +1,108 @@
+import hashlib
+import collections
+from typing import Optional
+
+import numpy as np
+
+from .formatters import format_time_column, CHUNK_SIZE
+from .keywords import TimeFormat
+
+
+CachedTime = collections.namedtuple(
+    'CachedTime',
+    ['Time', 'Field'],
+)
+
+
+def time_key(time: np.ndarray) -> Optional[bytes]:
+    '''A digest of the contents of a time array, or None for object arrays.'''
+    if time.dtype.kind == 'O':
+        return None
+    values = np.ascontiguousarray(time)
+    if values.dtype.kind in 'mM':
+        values = values.view(np.int64)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{time.dtype.str}{time.shape}'.encode())
+    digest.update(values.data)
+    return digest.digest()
+
+
+class TimeCache:
+    '''A bounded cache of converted and formatted time columns.
+
+    Files that share a time base and epoch, like the files of the vehicles
+    of a constellation, convert and render the same time column. Given the
+    same TimeCache, each distinct column is converted and rendered once.
+
+        cache = TimeCache()
+        for data in vehicles:
+            attitude_file(time, data, format='Quaternions', time_cache=cache)
+
+    Columns are keyed by a digest of the time values, not the identity of
+    the array, so equal arrays share an entry and changing an array in
+    place is safe. The least recently used columns are evicted once they
+    take more than `max_bytes`.
+
+    Params
+    ------
+    max_bytes: int
+        The most memory the cached columns may use.
+    '''
+    def __init__(self, max_bytes: int = 256 * 2**20) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def __repr__(self) -> str:
+        return f'TimeCache(entries={len(self)}, nbytes={self.nbytes}, hits={self.hits}, misses={self.misses})'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def get(
+            self,
+            time_fmt: TimeFormat,
+            time: np.ndarray,
+            epoch: np.datetime64,
+            chunk_size: int = CHUNK_SIZE,
+        ) -> CachedTime:
+        '''The time column converted to `time_fmt`, and as rendered by format_time_column().'''
+        digest = time_key(time)
+        if digest is None:
+            return _convert(time_fmt, time, epoch, chunk_size)
+
+        key = (time_fmt, np.datetime64(epoch, 'ns'), digest)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = _convert(time_fmt, time, epoch, chunk_size)
+        size = _nbytes(entry)
+        if size <= self.max_bytes:
+            self._entries[key] = entry
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= _nbytes(evicted)
+        return entry
+
+
+def _convert(time_fmt: TimeFormat, time: np.ndarray, epoch: np.datetime64, chunk_size: int) -> CachedTime:
+    converted = np.asarray(time_fmt.convert(time, epoch=epoch))
+    return CachedTime(converted, format_time_column(converted, chunk_size))
+
+
+def _nbytes(entry: CachedTime) -> int:
+    size = entry.Time.nbytes
+    if entry.Field is not None:
+        size += sum(array.nbytes for array in entry.Field)
+    return size
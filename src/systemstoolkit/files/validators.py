@@ -1,21 +1,64 @@
+import collections
 import numpy as np
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Optional, Tuple
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 
 class InvalidDataError(Exception):
     pass
 
 
+ValidationResult = collections.namedtuple(
+    'ValidationResult',
+    ['Time', 'Data', 'Rejected'],
+)
+
+# Rows checked per block, which bounds the size of temporary arrays
+BLOCK_SIZE = 1 << 20
+
+
 class DataValidator(ABC):
-    def validate(self, time: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        '''A boolean mask of the valid rows, or None if every row is valid.'''
         raise NotImplementedError
 
+    def check(self, time: np.ndarray, data: np.ndarray) -> ValidationResult:
+        '''Remove the invalid rows, reporting which were rejected.
+
+        When no rows are rejected, `time` and `data` are returned as-is,
+        without copying.
+
+        Returns
+        -------
+        result: ValidationResult
+            The valid Time and Data, and the indices of the Rejected rows.
+        '''
+        valid = self.valid_rows(data)
+        if valid is None:
+            return ValidationResult(time, data, np.empty(0, dtype=np.intp))
+
+        if not valid.any():
+            raise InvalidDataError(f'None of the {valid.size} rows are valid')
+
+        if valid.all():
+            return ValidationResult(time, data, np.empty(0, dtype=np.intp))
+
+        return ValidationResult(time[valid], data[valid], np.flatnonzero(~valid))
 
-class NoValidator(DataValidator):
     def validate(self, time: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        return time, data
+        result = self.check(time, data)
+        return result.Time, result.Data
+
+    def align(self, data: np.ndarray, previous: Optional[np.ndarray]) -> np.ndarray:
+        '''Continue validated data from the `previous` row, the last one
+        written before it (e.g. by the previous chunk of a streamed file).'''
+        return data
+
+
+class NoValidator(DataValidator):
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        return None
 
 
 @dataclass
@@ -23,47 +66,209 @@ class DataShapeValidator(DataValidator):
     ncols: Optional[int] = None
     nrows: Optional[int] = None
 
-    def validate(self, time: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
         nrows, ncols = data.shape
         if self.ncols is not None and self.ncols != ncols:
-            raise InvalidDataError
+            raise InvalidDataError(f'Expected {self.ncols} columns, got {ncols}')
 
         if self.nrows is not None and self.nrows != nrows:
-            raise InvalidDataError
+            raise InvalidDataError(f'Expected {self.nrows} rows, got {nrows}')
 
-        return time, data
+        return None
 
 
 @dataclass
 class QuaternionValidator(DataValidator):
+    '''Check that quaternions have unit norm.
+
+    By default, rows whose norm differs from 1 by `tolerance` or more are
+    rejected. In repair mode, only rows outside the wider `repair_tolerance`
+    band (and non-finite rows) are rejected. The rest are renormalized if
+    they are outside `tolerance`. If `continuity` is set, rows are also
+    negated where needed so that consecutive quaternions are in the same
+    hemisphere. q and -q are the same rotation, but a sign flip between
+    samples breaks STK's interpolation.
+    '''
     tolerance: float = 1e-5
-    shape_validator: DataShapeValidator = DataShapeValidator(ncols=4)
+    shape_validator: DataShapeValidator = field(default_factory=lambda: DataShapeValidator(ncols=4))
+    repair: bool = False
+    repair_tolerance: float = 1e-2
+    continuity: bool = True
 
-    def validate(self, time: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        self.shape_validator.validate(time, data)
+    def norms(self, data: np.ndarray) -> np.ndarray:
+        '''The norm of each row, computed in blocks.'''
+        norm = np.empty(data.shape[0], dtype=np.float64)
+        for start in range(0, data.shape[0], BLOCK_SIZE):
+            block = data[start:start + BLOCK_SIZE]
+            out = norm[start:start + BLOCK_SIZE]
+            np.einsum('ij,ij->i', block, block, out=out, dtype=np.float64)
+            np.sqrt(out, out=out)
+        return norm
+
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        self.shape_validator.valid_rows(data)
+        tolerance = self.repair_tolerance if self.repair else self.tolerance
+
+        norm = self.norms(data)
+        norm -= 1
+        np.abs(norm, out=norm)
+        return norm < tolerance
 
-        rss = np.abs(np.sqrt(np.sum(data ** 2, axis=1)) - 1)
-        print(rss)
-        idx = rss < self.tolerance
+    def check(self, time: np.ndarray, data: np.ndarray) -> ValidationResult:
+        if not self.repair:
+            return super().check(time, data)
 
-        if np.sum(idx) == 0:
-            raise InvalidDataError
+        self.shape_validator.valid_rows(data)
+        norm = self.norms(data)
+        valid = np.abs(norm - 1) < self.repair_tolerance
+        if not valid.any():
+            raise InvalidDataError(f'None of the {valid.size} rows are valid')
 
-        return time[idx], data[idx, :]
+        rejected = np.flatnonzero(~valid)
+        copied = rejected.size > 0
+        if copied:
+            time, data, norm = time[valid], data[valid], norm[valid]
+
+        scale = np.where(np.abs(norm - 1) < self.tolerance, 1.0, 1 / norm)
+        if self.continuity and data.shape[0] > 1:
+            # A row is flipped if an odd number of sign changes precede it
+            dot = np.einsum('ij,ij->i', data[1:], data[:-1], dtype=np.float64)
+            flip = np.cumsum(dot < 0) % 2 == 1
+            scale[1:][flip] *= -1
+
+        if np.any(scale != 1):
+            if data.dtype.kind != 'f':
+                data = data.astype(np.float64)
+            elif not copied:
+                data = data.copy()
+            data *= scale[:, None]
+
+        return ValidationResult(time, data, rejected)
+
+    def align(self, data: np.ndarray, previous: Optional[np.ndarray]) -> np.ndarray:
+        '''In repair mode with `continuity`, negate the data if its first
+        row is not in the same hemisphere as the `previous` one, so that
+        checking in chunks gives the same signs as checking all at once.'''
+        if not (self.repair and self.continuity) or previous is None or data.shape[0] == 0:
+            return data
+        if np.dot(data[0], previous) >= 0:
+            return data
+        if data.dtype.kind != 'f':
+            data = data.astype(np.float64)
+        return -data
 
 
 @dataclass
 class AngleValidator(DataValidator):
     max_angle: float = 360
-    shape_validator: DataShapeValidator = DataShapeValidator(ncols=3)
+    shape_validator: DataShapeValidator = field(default_factory=lambda: DataShapeValidator(ncols=3))
 
-    def validate(self, time: np.ndarray, data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        self.shape_validator.validate(time, data)
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        self.shape_validator.valid_rows(data)
+
+        valid = np.empty(data.shape[0], dtype=bool)
+        # The absolute values of one block, reused for every block
+        buffer = np.empty((min(data.shape[0], BLOCK_SIZE),) + data.shape[1:], dtype=np.float64)
+        for start in range(0, data.shape[0], BLOCK_SIZE):
+            block = data[start:start + BLOCK_SIZE]
+            magnitude = np.abs(block, out=buffer[:block.shape[0]])
+            np.less(np.max(magnitude, axis=1), self.max_angle, out=valid[start:start + BLOCK_SIZE])
+        return valid
+
+
+@dataclass
+class FiniteValidator(DataValidator):
+    '''Check that every value in a row is finite (e.g. angular rates).'''
+    shape_validator: DataShapeValidator = field(default_factory=lambda: DataShapeValidator(ncols=3))
+
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        self.shape_validator.valid_rows(data)
+
+        valid = np.empty(data.shape[0], dtype=bool)
+        for start in range(0, data.shape[0], BLOCK_SIZE):
+            np.all(np.isfinite(data[start:start + BLOCK_SIZE]), axis=1, out=valid[start:start + BLOCK_SIZE])
+        return valid
+
+
+@dataclass
+class VectorValidator(DataValidator):
+    '''Check that vectors are finite and have a norm greater than `min_norm`.'''
+    min_norm: float = 0
+    shape_validator: DataShapeValidator = field(default_factory=lambda: DataShapeValidator(ncols=3))
+
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        self.shape_validator.valid_rows(data)
+
+        valid = np.empty(data.shape[0], dtype=bool)
+        for start in range(0, data.shape[0], BLOCK_SIZE):
+            block = data[start:start + BLOCK_SIZE]
+            norm = np.einsum('ij,ij->i', block, block, dtype=np.float64)
+            np.sqrt(norm, out=norm)
+            # NaN and inf norms fail one of the comparisons
+            np.logical_and(norm > self.min_norm, norm < np.inf, out=valid[start:start + BLOCK_SIZE])
+        return valid
+
+
+@dataclass
+class DCMValidator(DataValidator):
+    '''Check that each row of 9 values is a rotation matrix.
+
+    The matrix must be orthonormal to within `tolerance` (the largest element
+    of |M M^T - I|) and have a positive determinant.
+    '''
+    tolerance: float = 1e-5
+    shape_validator: DataShapeValidator = field(default_factory=lambda: DataShapeValidator(ncols=9))
+
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        self.shape_validator.valid_rows(data)
+
+        valid = np.empty(data.shape[0], dtype=bool)
+        for start in range(0, data.shape[0], BLOCK_SIZE):
+            m = data[start:start + BLOCK_SIZE].astype(np.float64, copy=False)
+            rows = [m[:, 0:3], m[:, 3:6], m[:, 6:9]]
+
+            # The elements of M M^T are the dot products of the rows
+            error = np.zeros(m.shape[0])
+            for i in range(3):
+                for j in range(i, 3):
+                    gram = np.einsum('ij,ij->i', rows[i], rows[j])
+                    if i == j:
+                        gram -= 1
+                    np.maximum(error, np.abs(gram), out=error)
+
+            # With orthonormality, the determinant is +1 or -1 (a reflection)
+            det = np.einsum('ij,ij->i', rows[0], np.cross(rows[1], rows[2]))
+            np.logical_and(error < self.tolerance, det > 0, out=valid[start:start + BLOCK_SIZE])
+        return valid
+
+
+@dataclass
+class CompositeValidator(DataValidator):
+    '''Apply validators to column ranges of the data.
+
+    A row is valid if it is valid for every validator.
+
+    Params
+    ------
+    ncols: int
+        The total number of columns.
 
-        max = np.abs(np.max(data, axis=1))
-        idx = max < self.max_angle
+    validators: List[Tuple[slice, DataValidator]]
+        The columns each validator checks.
+    '''
+    ncols: int
+    validators: List[Tuple[slice, DataValidator]]
 
-        if np.sum(idx) == 0:
-            raise InvalidDataError
+    def valid_rows(self, data: np.ndarray) -> Optional[np.ndarray]:
+        DataShapeValidator(ncols=self.ncols).valid_rows(data)
 
-        return time[idx], data[idx, :]
+        valid = None
+        for columns, validator in self.validators:
+            rows = validator.valid_rows(data[:, columns])
+            if rows is None:
+                continue
+            if valid is None:
+                valid = rows
+            else:
+                valid &= rows
+        return valid
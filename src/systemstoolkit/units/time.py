@@ -1,28 +1,76 @@
 import datetime
+import functools
 import numpy as np
 from enum import Enum, auto
-from typing import Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 from abc import ABC
 
-from systemstoolkit.typing import Union, DateTimeLike, DateTimeArrayLike
+from systemstoolkit.typing import Union, ArrayLike, DateTimeLike, DateTimeArrayLike
+
+
+# Times are converted at no coarser resolution than this by default
+DEFAULT_RESOLUTION = 'ms'
+_COARSER_UNITS = ['Y', 'M', 'W', 'D', 'h', 'm', 's']
 
 
 class TimeUnit(ABC):
+    # Whether converted times are numbers (rather than text)
+    numeric = True
+
+    def __init__(
+            self,
+            epoch: Optional[DateTimeLike] = None,
+            resolution: Optional[str] = None,
+        ) -> None:
+        '''
+        Params
+        ------
+        epoch: DateTimeLike
+            Only used by epoch-relative units.
+
+        resolution: str
+            The datetime64 unit (e.g. "ms", "us", "ns") times are cast to
+            before conversion, and which to_datetime() returns. By default,
+            the input resolution is kept if it is finer than milliseconds.
+        '''
+        super().__init__()
+        self.resolution = resolution
+
+    def as_datetime64(self, time: Union[DateTimeLike, DateTimeArrayLike]) -> np.ndarray:
+        '''Cast times to datetime64 at the resolution they are converted at.'''
+        if self.resolution is not None:
+            return np.asarray(time, dtype=f'datetime64[{self.resolution}]')
+
+        time = np.asarray(time, dtype='datetime64')
+        if np.datetime_data(time.dtype)[0] in _COARSER_UNITS + ['generic']:
+            time = time.astype(f'datetime64[{DEFAULT_RESOLUTION}]')
+        return time
+
+    def _at_resolution(self, time: np.ndarray) -> np.ndarray:
+        if self.resolution is None:
+            return time
+        return time.astype(f'datetime64[{self.resolution}]')
+
     def convert(
             self,
             time: Union[DateTimeLike, DateTimeArrayLike]
         ) -> Union[DateTimeLike, DateTimeArrayLike]: # pragma: no cover
         pass
 
+    def to_datetime(self, values: ArrayLike) -> np.ndarray: # pragma: no cover
+        '''The inverse of convert(), returning datetime64[ns] unless a resolution was given.'''
+        pass
+
 
 class EpochTimeUnit(TimeUnit):
     unit = 's'
 
     def __init__(
             self, 
-            epoch: datetime.datetime
+            epoch: datetime.datetime,
+            resolution: Optional[str] = None,
         ) -> None:
-        super().__init__()
+        super().__init__(resolution=resolution)
         self.epoch = epoch
 
     @property
@@ -37,8 +85,22 @@ class EpochTimeUnit(TimeUnit):
             self,
             time: Union[DateTimeLike, DateTimeArrayLike],
         ):
-        time = np.asarray(time, dtype='datetime64[ms]')
-        return (time - self.epoch) / np.timedelta64(1, self.unit)
+        # Split the integer offset into whole units and a remainder, so the
+        # only round-off is in the final sum rather than in dividing a
+        # large count of ticks.
+        offset = self.as_datetime64(time) - self.epoch
+        whole, rest = np.divmod(offset, np.timedelta64(1, self.unit))
+        return whole + rest / np.timedelta64(1, self.unit)
+
+    def to_datetime(self, values: ArrayLike) -> np.ndarray:
+        # The whole and fractional parts are converted separately so
+        # that nanoseconds are not lost to round-off for long spans.
+        values = np.asarray(values, dtype=np.float64)
+        ns_per_unit = np.timedelta64(1, self.unit) // np.timedelta64(1, 'ns')
+        whole = np.floor(values)
+        frac_ns = np.rint((values - whole) * ns_per_unit).astype(np.int64)
+        offset_ns = whole.astype(np.int64) * ns_per_unit + frac_ns
+        return self._at_resolution(np.datetime64(self.epoch, 'ns') + offset_ns.astype('timedelta64[ns]'))
 
 
 class EpSecTimeUnit(EpochTimeUnit):
@@ -61,8 +123,201 @@ class EpDayTimeUnit(EpochTimeUnit):
 #     unit = 'Y'
 
 
+# Civil (proleptic Gregorian) dates from day counts, and back, in whole-array
+# integer arithmetic. Years are counted from March, so the leap day is the
+# last day of the year, and 400-year eras repeat exactly.
+_DAYS_PER_ERA = 146097
+# Days from 0000-03-01 to 1970-01-01
+_EPOCH_DAYS = 719468
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def civil_from_days(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''The (year, month, day) of each count of days since 1970-01-01.'''
+    z = np.asarray(days, dtype=np.int64) + _EPOCH_DAYS
+    era = z // _DAYS_PER_ERA
+    doe = z - era * _DAYS_PER_ERA
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    '''The count of days since 1970-01-01 of each (year, month, day).
+
+    Days past the end of a month run on into the next, as in datetime64
+    month plus day arithmetic.
+    '''
+    year, month, day = (np.asarray(x, dtype=np.int64) for x in (year, month, day))
+    year = year - (month <= 2)
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * _DAYS_PER_ERA + doe - _EPOCH_DAYS
+
+
+def _split_days(time: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    '''Split datetime64 times into whole days since 1970-01-01 and ticks into the day.
+
+    Returns the days, the ticks, and the number of ticks per day.
+    '''
+    unit, count = np.datetime_data(time.dtype)
+    if unit in ['Y', 'M', 'W']:
+        time = time.astype('datetime64[D]')
+        unit, count = 'D', 1
+    ticks_per_day = int(np.timedelta64(1, 'D') // np.timedelta64(count, unit))
+    days, ticks = np.divmod(time.view(np.int64), ticks_per_day)
+    return days, ticks, ticks_per_day
+
+
+def _by_day(days: np.ndarray, func: Callable[[np.ndarray], Any]) -> Any:
+    '''func(days), evaluated once per day of the range of days when there
+    are fewer of those than times, and gathered for each time.
+
+    The fields of a civil date take many whole-array operations, but a
+    time column usually spans far fewer days than it has times.
+    '''
+    if days.size:
+        first = days.min()
+        span = days.max() - first + 1
+        if span < days.size:
+            table = func(np.arange(first, first + span))
+            index = days - first
+            if isinstance(table, tuple):
+                return tuple(column[index] for column in table)
+            return table[index]
+    return func(days)
+
+
+# Digits are rendered this many at a time, from a table of every group
+_DIGIT_GROUP = 4
+
+
+@functools.lru_cache(maxsize=None)
+def _digit_text(ndigits: int) -> np.ndarray:
+    '''Every zero-padded `ndigits` number as text, e.g. "000" to "999".'''
+    values = np.arange(10 ** ndigits)
+    codes = np.empty((values.size, ndigits), dtype=np.uint32)
+    for i in range(ndigits - 1, -1, -1):
+        values, codes[:, i] = np.divmod(values, 10)
+    return (codes + ord('0')).view(f'U{ndigits}').reshape(-1)
+
+
+def _text(parts: List[Union[str, np.ndarray, Tuple[np.ndarray, int]]], size: int) -> np.ndarray:
+    '''Fixed-width text assembled from its parts.
+
+    Each part is a separator (str), a column of fixed-width text (a str
+    array), or a column of non-negative integers and their number of
+    digits, zero-padded. Each character of numpy's str dtype is one UCS4
+    code, so the text is built as a structured array with a field for each
+    part, which is then viewed as str. Digits are looked up a group at a
+    time rather than computed one by one.
+
+    Raises ValueError if an integer does not fit its digits.
+    '''
+    fields = []
+    width = 0
+    for part in parts:
+        if isinstance(part, str):
+            fields.append((width, len(part), np.array([part]).view(f'V{4 * len(part)}')[0]))
+            width += len(part)
+        elif isinstance(part, np.ndarray):
+            nchars = part.dtype.itemsize // 4
+            fields.append((width, nchars, part.view(f'V{4 * nchars}')))
+            width += nchars
+        else:
+            values, ndigits = part
+            if values.size and (values.min() < 0 or values.max() >= 10 ** ndigits):
+                raise ValueError(f'Values do not fit in {ndigits} digits')
+            # Groups from the right, with any shorter group first
+            groups = [ndigits % _DIGIT_GROUP] * bool(ndigits % _DIGIT_GROUP)
+            groups += [_DIGIT_GROUP] * (ndigits // _DIGIT_GROUP)
+            offset = width + ndigits
+            for i, nchars in enumerate(reversed(groups)):
+                if i < len(groups) - 1:
+                    values, group = np.divmod(values, 10 ** nchars)
+                else:
+                    group = values
+                offset -= nchars
+                fields.append((offset, nchars, _digit_text(nchars)[group].view(f'V{4 * nchars}')))
+            width += ndigits
+
+    out = np.empty(size, dtype=np.dtype({
+        'names': [f'f{i}' for i in range(len(fields))],
+        'formats': [f'V{4 * nchars}' for _, nchars, _ in fields],
+        'offsets': [4 * offset for offset, _, _ in fields],
+        'itemsize': 4 * width,
+    }))
+    for i, (_, _, value) in enumerate(fields):
+        out[f'f{i}'] = value
+    return out.view(f'U{width}')
+
+
+@functools.lru_cache(maxsize=None)
+def _clock_text() -> np.ndarray:
+    '''"HH:MM:SS" for each second of the day.'''
+    hour, seconds = np.divmod(np.arange(86400), 3600)
+    minute, second = np.divmod(seconds, 60)
+    return _text([(hour, 2), ':', (minute, 2), ':', (second, 2)], 86400)
+
+
+def _parse_fraction(text: np.ndarray, ndigits: int) -> Tuple[np.ndarray, np.ndarray]:
+    '''Split decimal text into its integer part and its fraction as an integer
+    count of 10**-ndigits, rounded to ndigits decimals.'''
+    parts = np.char.partition(np.char.strip(text), '.')
+    whole = parts[:, 0].astype(np.int64)
+    # Pad or truncate to one more digit than kept, to round on
+    digits = np.char.ljust(parts[:, 2], ndigits + 1, '0').astype(f'U{ndigits + 1}')
+    digits = digits.astype(np.int64)
+    return whole, (digits + 5) // 10
+
+
 class UTCTime(TimeUnit):
-    pass
+    # The decimal places of day fractions in to_text(), which round to the
+    # nearest nanosecond
+    TEXT_DECIMALS = 14
+
+    def _from_days(self, days: np.ndarray, frac_day: np.ndarray) -> np.ndarray:
+        day_ns = np.timedelta64(1, 'D') // np.timedelta64(1, 'ns')
+        time = days * day_ns + np.rint(frac_day * day_ns).astype(np.int64)
+        return self._at_resolution(time.astype('datetime64[ns]'))
+
+    def _from_text(self, text: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        '''The integer part of each value, and the time into the day in nanoseconds.'''
+        whole, frac = _parse_fraction(text.reshape(-1), self.TEXT_DECIMALS)
+        # One day is 86400e9 ns, or 0.864 ns per 1e-14 day
+        ns = (frac * 864 + 500) // 1000
+        return whole.reshape(text.shape), ns.reshape(text.shape)
+
+    def _day_fraction(self, time: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        '''Whole days since 1970-01-01, and the day fraction in units of
+        10**-TEXT_DECIMALS day, rounded to the nearest.'''
+        days, ticks, ticks_per_day = _split_days(time)
+        ns = ticks * (_NS_PER_DAY // ticks_per_day)
+        frac = (ns * 100_000 + 43_200) // 86_400
+        # Rounding up to a whole day carries into the next
+        carry = frac == 10 ** self.TEXT_DECIMALS
+        return days + carry, np.where(carry, 0, frac)
+
+    def _date_text(self, days: np.ndarray) -> np.ndarray: # pragma: no cover
+        '''The date part of to_text().'''
+        pass
+
+    def to_text(self, time: Union[DateTimeLike, DateTimeArrayLike]) -> np.ndarray:
+        '''The converted times as fixed-width text, with the day fraction
+        rounded to the nearest nanosecond rather than to float64 precision.
+
+        Only years 0 to 9999 can be written.
+        '''
+        time = self.as_datetime64(time)
+        days, frac = self._day_fraction(time.reshape(-1))
+        date = _by_day(days, self._date_text)
+        return _text([date, '.', (frac, self.TEXT_DECIMALS)], days.size).reshape(time.shape)
 
 
 class YYYYDDDTimeUnit(UTCTime):
@@ -71,16 +326,32 @@ class YYYYDDDTimeUnit(UTCTime):
             time: Union[DateTimeLike, DateTimeArrayLike]
         ) -> Union[DateTimeLike, DateTimeArrayLike]:
 
-        time = np.asarray(time, dtype='datetime64[ms]')
+        time = self.as_datetime64(time)
+        days, ticks, ticks_per_day = _split_days(time)
+        yyyy, ddd = _by_day(days, self._date_parts)
+        return yyyy + (ddd + ticks / ticks_per_day)
+
+    @staticmethod
+    def _date_parts(days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        year, _, _ = civil_from_days(days)
+        return 1000 * year, days - days_from_civil(year, 1, 1) + 1
+
+    def _date_text(self, days: np.ndarray) -> np.ndarray:
+        yyyy, ddd = self._date_parts(days)
+        return _text([(yyyy // 1000, 4), (ddd, 3)], days.size)
 
-        day = time.astype('datetime64[D]')
-        year = day.astype('datetime64[Y]')
-        doy = day - year
-        frac_day = (time - day) / np.timedelta64(1, 'D')
+    def to_datetime(self, values: ArrayLike) -> np.ndarray:
+        values = np.asarray(values)
+        if values.dtype.kind in 'US':
+            whole, ns = self._from_text(values.astype(str))
+            year, doy = np.divmod(whole, 1000)
+            days = days_from_civil(year, 1, doy)
+            return self._at_resolution((days * _NS_PER_DAY + ns).astype('datetime64[ns]'))
 
-        yyyy = 1000*(1970+year.astype('uint32'))
-        ddd = doy.astype('uint32') + 1 + frac_day.astype('float64')
-        return yyyy + ddd
+        values = values.astype(np.float64)
+        whole = np.floor(values).astype(np.int64)
+        year, doy = np.divmod(whole, 1000)
+        return self._from_days(days_from_civil(year, 1, doy), values - whole)
 
 
 class YYYYMMDDTimeUnit(UTCTime):
@@ -89,25 +360,70 @@ class YYYYMMDDTimeUnit(UTCTime):
             time: Union[DateTimeLike, DateTimeArrayLike]
         ) -> Union[DateTimeLike, DateTimeArrayLike]:
 
-        time = np.asarray(time, dtype='datetime64[us]')
-        day = time.astype('datetime64[D]')
-        mon = time.astype('datetime64[M]')
-        year = time.astype('datetime64[Y]')
-        moy = mon - year
-        dom = day - mon
-        frac_day = ((time - day) / np.timedelta64(1, 'D')).astype('float64')
-        y = 10000 * (year.astype('uint32') + 1970)
-        m = 100 * (moy.astype('uint32') + 1)
-        d = dom.astype('uint32') + 1
-        print(y, m, d, frac_day)
-        return y + m + d + frac_day
+        time = self.as_datetime64(time)
+        days, ticks, ticks_per_day = _split_days(time)
+        return _by_day(days, self._date_value) + ticks / ticks_per_day
+
+    @staticmethod
+    def _date_value(days: np.ndarray) -> np.ndarray:
+        year, month, day = civil_from_days(days)
+        return 10000 * year + 100 * month + day
+
+    def _date_text(self, days: np.ndarray) -> np.ndarray:
+        return _text([(self._date_value(days), 8)], days.size)
+
+    def to_datetime(self, values: ArrayLike) -> np.ndarray:
+        values = np.asarray(values)
+        if values.dtype.kind in 'US':
+            whole, ns = self._from_text(values.astype(str))
+            year, month_day = np.divmod(whole, 10000)
+            month, day = np.divmod(month_day, 100)
+            days = days_from_civil(year, month, day)
+            return self._at_resolution((days * _NS_PER_DAY + ns).astype('datetime64[ns]'))
+
+        values = values.astype(np.float64)
+        whole = np.floor(values).astype(np.int64)
+        year, month_day = np.divmod(whole, 10000)
+        month, day = np.divmod(month_day, 100)
+        return self._from_days(days_from_civil(year, month, day), values - whole)
+
+
+# The digits after the decimal point of ISO-YMD text at each resolution
+_ISO_DECIMALS = {'s': 0, 'ms': 3, 'us': 6, 'ns': 9}
 
 
 class ISOYMDTimeUnit(UTCTime):
+    numeric = False
+
     def convert(
             self,
             time: Union[DateTimeLike, DateTimeArrayLike]
         ) -> Union[DateTimeLike, DateTimeArrayLike]:
 
-        time = np.asarray(time, dtype='datetime64[ms]')
-        return time.astype(str)
+        time = self.as_datetime64(time)
+        unit, count = np.datetime_data(time.dtype)
+        flat = time.reshape(-1)
+        # Other units, NaT, and years that do not take four digits are left to numpy
+        if (unit not in _ISO_DECIMALS or count != 1 or np.isnat(flat).any()
+                or not ((flat >= np.datetime64('0000-01-01')) & (flat < np.datetime64('10000-01-01'))).all()):
+            return time.astype(str)
+
+        decimals = _ISO_DECIMALS[unit]
+        days, ticks = np.divmod(flat.view(np.int64), 86400 * 10 ** decimals)
+        seconds, frac = np.divmod(ticks, 10 ** decimals)
+
+        parts = [_by_day(days, self._date_text), _clock_text()[seconds]]
+        if decimals:
+            parts += ['.', (frac, decimals)]
+        return _text(parts, flat.size).reshape(time.shape)
+
+    @staticmethod
+    def _date_text(days: np.ndarray) -> np.ndarray:
+        year, month, day = civil_from_days(days)
+        return _text([(year, 4), '-', (month, 2), '-', (day, 2), 'T'], days.size)
+
+    def to_text(self, time: Union[DateTimeLike, DateTimeArrayLike]) -> np.ndarray:
+        return self.convert(time)
+
+    def to_datetime(self, values: ArrayLike) -> np.ndarray:
+        return self._at_resolution(np.asarray(values).astype('datetime64[ns]'))
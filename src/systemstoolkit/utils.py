@@ -1,48 +1,102 @@
+import re
 import datetime
+import collections.abc
 import numpy as np
 import pathlib
 from typing import Iterable
 from dateutil.parser import parse as parse_datetime, ParserError
+from numpy.typing import DTypeLike
 from systemstoolkit.typing import DateTimeLike
+from systemstoolkit.units.time import EpSecTimeUnit
 
 
-STK_DATE_FMT = '%d %b %Y %H:%M:%S.%f'
+STK_DATE_FMT = '%d %b %Y %H:%M:%S'
+_FRACTIONAL_SECONDS = re.compile(r'(\d{1,2}:\d{2}:\d{2})\.(\d+)')
 
-def stk_datetime(timestamp: DateTimeLike) -> str:
+def stk_datetime(timestamp: DateTimeLike, digits: int = 3) -> str:
+    '''Format a timestamp as an STK date, with `digits` (up to 9) decimal places of seconds.'''
 
     if isinstance(timestamp, datetime.datetime):
-        return timestamp.strftime(STK_DATE_FMT)[0:24]
+        frac_ns = timestamp.microsecond * 1000
 
     elif isinstance(timestamp, np.datetime64):
-        return timestamp.astype(datetime.datetime).strftime(STK_DATE_FMT)[0:24]
+        seconds = timestamp.astype('datetime64[s]')
+        frac_ns = int((timestamp - seconds) // np.timedelta64(1, 'ns'))
+        timestamp = seconds.astype(datetime.datetime)
 
-    raise TypeError(
-        f'Expected {DateTimeLike}, got "{timestamp}" of type {type(timestamp)}'
+    else:
+        raise TypeError(
+            f'Expected {DateTimeLike}, got "{timestamp}" of type {type(timestamp)}'
+        )
+
+    text = timestamp.strftime(STK_DATE_FMT)
+    if digits > 0:
+        text += f'.{frac_ns:09d}'[:digits + 1]
+    return text
+
+
+def parse_stk_datetime(text: str) -> np.datetime64:
+    '''Parse an STK date (e.g. "1 Jun 2002 12:00:00.000000000") to nanosecond precision.'''
+    text = text.strip().strip('"')
+
+    # dateutil stops at microseconds, so handle the fraction separately
+    frac_ns = 0
+    match = _FRACTIONAL_SECONDS.search(text)
+    if match:
+        frac_ns = int(match.group(2)[:9].ljust(9, '0'))
+        text = text[:match.end(1)] + text[match.end():]
+
+    timestamp = np.datetime64(parse_datetime(text), 'ns')
+    return timestamp + np.timedelta64(frac_ns, 'ns')
+
+
+_MONTHS = {
+    month: f'{number:02d}' for number, month in enumerate(
+        ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'],
+        start=1,
     )
+}
+
+def parse_stk_datetimes(texts: Iterable[str], resolution: str = 'ns') -> np.ndarray:
+    '''Parse many STK dates (e.g. "1 Jun 2002 12:00:00.000") into a datetime64 array.
 
+    Each date is rewritten as an ISO 8601 string, which NumPy parses in bulk,
+    so this is much faster than parse_stk_datetime() for long columns.
+    '''
+    iso = []
+    try:
+        for text in texts:
+            day, month, year, clock = text.strip().strip('"').split()
+            iso.append(f'{year}-{_MONTHS[month]}-{day:0>2}T{clock}')
+        return np.array(iso, dtype=f'datetime64[{resolution}]')
+    except (ValueError, KeyError):
+        raise ValueError(f'Invalid STK date: "{text}"') from None
 
-def parse_file_data(file_text) -> tuple:
-    time, data = [], []
+
+def parse_file_data(file_text, resolution: str = 'ms', dtype: DTypeLike = 'float32') -> tuple:
+    offsets, data = [], []
     epoch = None
     for line in file_text.splitlines():
         try:
             parts = line.strip().split()
             
             if parts[0] == 'ScenarioEpoch':
-                epoch = parse_datetime(' '.join(parts[1:]))
+                epoch = parse_stk_datetime(' '.join(parts[1:]))
             
-            t = epoch + datetime.timedelta(seconds=float(parts[0]))
-            time.append(t)
-            data.append([float(x) for x in parts[1:]])
+            row = [float(x) for x in parts]
+            if epoch is None:
+                raise TypeError('Data row found before ScenarioEpoch')
+            offsets.append(row[0])
+            data.append(row[1:])
         except (ValueError, ParserError):
             pass
-    time = np.array(time, dtype='datetime64[ms]')
-    data = np.array(data, dtype='float32')
+    time = EpSecTimeUnit(epoch, resolution).to_datetime(np.array(offsets, dtype='float64'))
+    data = np.array(data, dtype=dtype)
     return time, data
 
 
-def read_file_data(file) -> tuple:
-    return parse_file_data(pathlib.Path(file).read_text())
+def read_file_data(file, resolution: str = 'ms', dtype: DTypeLike = 'float32') -> tuple:
+    return parse_file_data(pathlib.Path(file).read_text(), resolution, dtype)
 
 
 def make_command(parts: Iterable) -> str:
@@ -50,11 +104,13 @@ def make_command(parts: Iterable) -> str:
     for p in parts:
         if isinstance(p, str):
             fmt_parts.append(p)
+        elif isinstance(p, (int, float)):
+            fmt_parts.append(str(p))
         elif isinstance(p, (datetime.datetime, np.datetime64)):
             fmt_parts.append(
                 f'"{stk_datetime(p)}"'
             )
-        elif isinstance(p, Iterable):
+        elif isinstance(p, collections.abc.Iterable):
             fmt_parts.append(make_command(p))
         else:
             fmt_parts.append(str(p))
@@ -0,0 +1,24 @@
+import itertools
+from typing import Callable
+
+
+def recv_into(*replies: bytes, repeat: bool = False) -> Callable:
+    '''A side effect for a mocked socket.recv_into, returning these replies in turn.
+
+    Each call delivers at most one reply, or as much of it as fits in the
+    buffer, with the rest delivered by the next call. With `repeat`, the
+    replies are cycled forever.
+    '''
+    replies = itertools.cycle(replies) if repeat else iter(replies)
+    remainder = b''
+
+    def side_effect(buffer, nbytes=0):
+        nonlocal remainder
+        if not remainder:
+            remainder = next(replies, b'')
+        size = min(len(buffer), nbytes or len(buffer), len(remainder))
+        buffer[:size] = remainder[:size]
+        remainder = remainder[size:]
+        return size
+
+    return side_effect
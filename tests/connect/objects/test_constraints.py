@@ -2,12 +2,13 @@ import pytest
 import mock
 from systemstoolkit.connect import Connect
 from systemstoolkit.connect.objects import Satellite, Facility
+from tests.connect.fakes import recv_into
 
 
 def test_facility_set_constraint_lighting():
     exp = 'SetConstraint */Facility/DC Lighting DirectSun'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -20,7 +21,7 @@ def test_facility_set_constraint_lighting():
 
 def test_facility_set_constraint_lighting_invalid():
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -32,7 +33,7 @@ def test_facility_set_constraint_lighting_invalid():
 def test_facility_set_constraint_lighting_off():
     exp = 'SetConstraint */Facility/DC Lighting Off'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -46,7 +47,7 @@ def test_facility_set_constraint_lighting_off():
 def test_facility_set_constraint_azimuth():
     exp = 'SetConstraint */Facility/DC AzimuthAngle Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -60,7 +61,7 @@ def test_facility_set_constraint_azimuth():
 def test_facility_set_constraint_azimuth_off():
     exp = 'SetConstraint */Facility/DC AzimuthAngle Min Off Max Off'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -74,7 +75,7 @@ def test_facility_set_constraint_azimuth_off():
 def test_facility_set_constraint_azimuth_invalid_values():
     exp = 'SetConstraint */Facility/DC AzimuthAngle Min Off Max Off'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -86,7 +87,7 @@ def test_facility_set_constraint_azimuth_invalid_values():
 def test_facility_set_constraint_azimuth_invalid_minmax():
     exp = 'SetConstraint */Facility/DC AzimuthAngle Min Off Max Off'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -98,7 +99,7 @@ def test_facility_set_constraint_azimuth_invalid_minmax():
 def test_facility_set_constraint_azimuth_invalid_mutual():
     exp = 'SetConstraint */Facility/DC AzimuthAngle Min Off Max Off'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -110,7 +111,7 @@ def test_facility_set_constraint_azimuth_invalid_mutual():
 def test_facility_set_constraint_elevation():
     exp = 'SetConstraint */Facility/DC ElevationAngle Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -124,7 +125,7 @@ def test_facility_set_constraint_elevation():
 def test_facility_set_constraint_azimuth_rate():
     exp = 'SetConstraint */Facility/DC AzimuthRate Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -138,7 +139,7 @@ def test_facility_set_constraint_azimuth_rate():
 def test_facility_set_constraint_elevation_rate():
     exp = 'SetConstraint */Facility/DC ElevationRate Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -152,7 +153,7 @@ def test_facility_set_constraint_elevation_rate():
 def test_facility_set_constraint_range():
     exp = 'SetConstraint */Facility/DC Range Min 10 Max 20000'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -166,7 +167,7 @@ def test_facility_set_constraint_range():
 def test_facility_set_constraint_range_rate():
     exp = 'SetConstraint */Facility/DC RangeRate Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -180,7 +181,7 @@ def test_facility_set_constraint_range_rate():
 def test_facility_set_constraint_angular_rate():
     exp = 'SetConstraint */Facility/DC AngularRate Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -194,7 +195,7 @@ def test_facility_set_constraint_angular_rate():
 def test_facility_set_constraint_altitude():
     exp = 'SetConstraint */Facility/DC Altitude Min 1000 Max 20000'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -208,7 +209,7 @@ def test_facility_set_constraint_altitude():
 def test_facility_set_constraint_propagation_delay():
     exp = 'SetConstraint */Facility/DC PropagationDelay Min 0.1 Max 0.2'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -222,7 +223,7 @@ def test_facility_set_constraint_propagation_delay():
 def test_facility_set_constraint_solar_elevation_angle():
     exp = 'SetConstraint */Facility/DC SunElevationAngle Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -236,7 +237,7 @@ def test_facility_set_constraint_solar_elevation_angle():
 def test_facility_set_constraint_lunar_elevation_angle():
     exp = 'SetConstraint */Facility/DC LunarElevationAngle Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -250,7 +251,7 @@ def test_facility_set_constraint_lunar_elevation_angle():
 def test_facility_set_constraint_los_solar_illumination_angle():
     exp = 'SetConstraint */Facility/DC LOSSunIlluminationAngle Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -264,7 +265,7 @@ def test_facility_set_constraint_los_solar_illumination_angle():
 def test_facility_set_constraint_los_solar_illumination_angle_invalid_mutual():
     exp = 'SetConstraint */Facility/DC LOSSunIlluminationAngle Min 10 Max 20'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -276,7 +277,7 @@ def test_facility_set_constraint_los_solar_illumination_angle_invalid_mutual():
 def test_facility_set_constraint_los_solar_exclusion():
     exp = 'SetConstraint */Facility/DC LOSSunExclusion 10'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -290,7 +291,7 @@ def test_facility_set_constraint_los_solar_exclusion():
 def test_facility_set_constraint_los_lunar_exclusion():
     exp = 'SetConstraint */Facility/DC LOSLunarExclusion 10'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -304,7 +305,7 @@ def test_facility_set_constraint_los_lunar_exclusion():
 def test_facility_set_constraint_sun_specular_exclusion():
     exp = 'SetConstraint */Facility/DC SunSpecularExclusion 10'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -2,12 +2,13 @@ import pytest
 import mock
 from systemstoolkit.connect import Connect
 from systemstoolkit.connect.objects import Facility
+from tests.connect.fakes import recv_into
 
 
 def test_create_facility():
     exp = 'New / */Facility FacilityName'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -21,7 +22,7 @@ def test_create_facility():
 def test_facility_set_position_cartesian():
     exp = 'SetPosition */Facility/AGIHQ Cartesian 1216360.0 -4736250.0 4081270.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -35,7 +36,7 @@ def test_facility_set_position_cartesian():
 def test_facility_set_position_geodetic():
     exp = 'SetPosition */Facility/Wallops Geodetic 37.9 -75.5 0.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -49,7 +50,7 @@ def test_facility_set_position_geodetic():
 def test_facility_set_position_geodetic_msl():
     exp = 'SetPosition */Facility/Wallops Geodetic 37.9 -75.5 0.0 MSL'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -63,7 +64,7 @@ def test_facility_set_position_geodetic_msl():
 def test_facility_set_position_geocentric():
     exp = 'SetPosition */Facility/Wallops Geocentric 37.9 -75.5 0.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -77,7 +78,7 @@ def test_facility_set_position_geocentric():
 def test_facility_set_position_geocentric_msl():
     exp = 'SetPosition */Facility/Wallops Geocentric 37.9 -75.5 0.0 MSL'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -91,7 +92,7 @@ def test_facility_set_position_geocentric_msl():
 def test_facility_set_height_above_ground():
     exp = 'SetHeightAboveGround */Facility/aero1 17.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -2,12 +2,13 @@ import pytest
 import mock
 from systemstoolkit.connect import Connect
 from systemstoolkit.connect.objects import Satellite, Sensor
+from tests.connect.fakes import recv_into
 
 
 def test_sensor_unload():
     exp = 'Unload / */Satellite/ERS1/Sensor/FOV'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -21,7 +22,7 @@ def test_sensor_unload():
 def test_sensor_create():
     exp = 'New / */Satellite/ERS1/Sensor FOV'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -35,7 +36,7 @@ def test_sensor_create():
 def test_sensor_define_conical():
     exp = 'Define */Satellite/Shuttle/Sensor/Horizon Conical 0.0 85.0 0.0 360.0 AngularRes 10.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -49,7 +50,7 @@ def test_sensor_define_conical():
 def test_sensor_define_half_power():
     exp = 'Define */Satellite/Shuttle/Sensor/Horizon HalfPower 1000000000 1 AngularRes 10.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -63,7 +64,7 @@ def test_sensor_define_half_power():
 def test_sensor_define_rectangular():
     exp = 'Define */Satellite/Shuttle/Sensor/Horizon Rectangular 4.0 10.0 AngularRes 10.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -77,7 +78,7 @@ def test_sensor_define_rectangular():
 def test_sensor_define_sar():
     exp = 'Define */Satellite/Shuttle/Sensor/Horizon SAR 10 50 30 40 AngularRes 10.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -91,7 +92,7 @@ def test_sensor_define_sar():
 def test_sensor_define_simple():
     exp = 'Define */Satellite/Shuttle/Sensor/Horizon SimpleCone 10 AngularRes 10.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -105,7 +106,7 @@ def test_sensor_define_simple():
 def test_sensor_define_custom():
     exp = r'Define */Satellite/Shuttle/Sensor/Horizon Custom "C:\path\to\file.sen"'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -119,7 +120,7 @@ def test_sensor_define_custom():
 def test_sensor_define_by_type():
     exp = 'Define */Satellite/Shuttle/Sensor/Horizon Rectangular 4.0 10.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -132,7 +133,7 @@ def test_sensor_define_by_type():
 
 def test_sensor_define_by_type_invalid():
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -3,6 +3,7 @@ import datetime
 import mock
 from systemstoolkit.connect import Connect
 from systemstoolkit.connect.objects import Scenario, Satellite, Facility
+from tests.connect.fakes import recv_into
 
 
 def test_object_repr():
@@ -13,7 +14,7 @@ def test_object_repr():
 def test_satellite_unload():
     exp = 'Unload / */Satellite/ERS1'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -27,7 +28,7 @@ def test_satellite_unload():
 def test_satellite_rename():
     exp = 'Rename */Satellite/Satellite1 Shuttle'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -41,7 +42,7 @@ def test_satellite_rename():
 def test_set_state_cartesian():
     exp = 'SetState */Satellite/ERS1 Cartesian J4Perturbation "01 Nov 2000 00:00:00.000" "01 Nov 2000 08:00:00.000" 60 J2000 "01 Nov 2000 00:00:00.000" -5465000.513055 4630000.194365 0.0 712.713627 841.292034 7377.687805'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -65,7 +66,7 @@ def test_set_state_cartesian():
 def test_set_state_classical():
     exp = 'SetState */Satellite/ERS1 Classical LOP UseScenarioInterval 86400 J2000 "01 Oct 1999 00:00:00.000" 42164000.0 0.0 0.0 0.0 269.3 0.0'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -88,7 +89,7 @@ def test_set_state_classical():
 def test_set_state_equi():
     exp = 'SetState */Satellite/ERS1 Equi J4Perturbation "01 Nov 2000 00:00:00.000" "01 Nov 2000 08:00:00.000" 60 MeanOfDate "01 Nov 2000 00:00:00.000" 7163000.137079 0.0 0.0 0.55697636 -0.65743965 220.270122 Retrograde'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -113,7 +114,7 @@ def test_set_state_equi():
 def test_set_state_sgp4():
     exp = r'SetState */Satellite/SGP4Sat SGP4 UseScenarioInterval 60.0 11417 TLESource Automatic Source File "c:\MyTemp\B44150.tle" UseTLE All SwitchMethod TCA'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -131,7 +132,7 @@ def test_set_state_sgp4():
 def test_set_state_from_file_1():
     exp = r'SetState */Satellite/Shuttle FromFile "C:\stk\User\Data\EphemFile.e"'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -147,7 +148,7 @@ def test_set_state_from_file_1():
 def test_set_state_from_file_2():
     exp = r'SetState */Satellite/Shuttle FromFile "C:\stk\User\Data\EphemFile.e" StartTime "01 Jun 2003 14:00:00.000"'
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             print(c)
@@ -163,7 +164,7 @@ def test_set_state_from_file_2():
 
 def test_set_state_cartesian_invalid_prop():
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             with pytest.raises(ValueError):
@@ -184,7 +185,7 @@ def test_set_state_cartesian_invalid_prop():
 
 def test_set_state_cartesian_invalid_coordsys():
     with mock.patch('socket.socket') as mock_sock:
-        mock_sock.return_value.recv.return_value = b'ACK'
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect() as c:
             with pytest.raises(ValueError):
@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from systemstoolkit.connect import Connect, AsyncConnect
+from systemstoolkit.connect import protocol
+from systemstoolkit.connect.mock_server import MockConnectServer
+from systemstoolkit.exceptions import STKCommandError, STKConnectError
+
+
+@pytest.fixture
+def server():
+    with MockConnectServer() as server:
+        yield server
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_send(server):
+    async def main():
+        async with AsyncConnect(*server.address, log=True) as c:
+            await c.send('New / */Satellite Sat1\n')
+            return [(e.Command, e.Response) for e in c.history]
+
+    history = run(main())
+    assert history == [('New / */Satellite Sat1', 'ACK')]
+    assert server.commands == ['New / */Satellite Sat1']
+
+
+def test_send_nack(server):
+    server.nack('Rename')
+
+    async def main():
+        async with AsyncConnect(*server.address) as c:
+            with pytest.raises(STKCommandError):
+                await c.send('Rename */Satellite/Sat1 Sat2')
+            # The stream is still in sync
+            await c.send('New / */Satellite Sat1')
+
+    run(main())
+
+
+def test_get_single_message(server):
+    server.single('ShowNames', '*/Satellite/Sat1 */Satellite/Sat2')
+
+    async def main():
+        async with AsyncConnect(*server.address) as c:
+            await c.send('ShowNames * Class Satellite')
+            return await c.get_single_message()
+
+    msg = run(main())
+    assert msg.CommandName == 'SHOWNAMES'
+    assert msg.Data == '*/Satellite/Sat1 */Satellite/Sat2'
+
+
+def test_get_report(server):
+    rows = [f'{i} Jul 2022 00:00:00.000, {i}.0' for i in range(1, 20)]
+    server.multi('Report_RM', rows)
+
+    async def main():
+        async with AsyncConnect(*server.address) as c:
+            await c.send('Report_RM */Satellite/Sat1 Style "Position"')
+            return await c.get_report()
+
+    assert run(main()) == rows
+
+
+def test_several_connections():
+    async def main(servers):
+        clients = [AsyncConnect(*server.address) for server in servers]
+        await asyncio.gather(*[c.connect() for c in clients])
+        await asyncio.gather(*[c.send(f'New / */Facility Fac{i}') for i, c in enumerate(clients)])
+        await asyncio.gather(*[c.close() for c in clients])
+
+    with MockConnectServer() as a, MockConnectServer() as b:
+        run(main([a, b]))
+        assert a.commands == ['New / */Facility Fac0']
+        assert b.commands == ['New / */Facility Fac1']
+
+
+def test_sync_client(server):
+    server.single('ShowNames', '*/Facility/Fac0')
+    with Connect(*server.address) as c:
+        c.send('New / */Facility Fac0')
+        assert c.get_class_paths('Facility') == ['*/Facility/Fac0']
+
+
+def test_sync_client_large_report(server):
+    rows = [f'{i} Jul 2022 00:00:00.000, ' + ', '.join(['1234.5678'] * 50) for i in range(2000)]
+    server.multi('Report_RM', rows)
+    with Connect(*server.address) as c:
+        for _ in range(2):
+            c.send('Report_RM */Satellite/Sat1 Style "Position"')
+            assert c.get_report() == rows
+
+
+@pytest.mark.parametrize('data', [b'ACK', b'NAC'])
+def test_parse_ack(data):
+    assert protocol.parse_ack(data) in [protocol.ACK, protocol.NACK]
+
+
+@pytest.mark.parametrize('data', [b'XYZ', b'AC'])
+def test_parse_ack_invalid(data):
+    with pytest.raises(STKConnectError):
+        protocol.parse_ack(data)
+
+
+def test_header_round_trip():
+    header = protocol.encode_header('REPORT_RM', 1234)
+    assert len(header) == protocol.HEADER_SIZE
+    assert protocol.parse_header(header) == ('REPORT_RM', 1234)
+
+    with pytest.raises(STKConnectError):
+        protocol.parse_header(b' ' * protocol.HEADER_SIZE)
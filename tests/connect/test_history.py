@@ -0,0 +1,68 @@
+import pytest
+import numpy as np
+from systemstoolkit.connect import Connect
+from systemstoolkit.connect.history import CommandHistory
+from systemstoolkit.connect.mock_server import MockConnectServer
+from systemstoolkit.exceptions import STKCommandError
+
+
+def test_history_ring_buffer():
+    history = CommandHistory(size=3)
+    for i in range(5):
+        history.record(f'New / */Facility Fac{i}', 'ACK', i)
+    assert len(history) == 3
+    assert history.count == 5
+    assert [entry.Command for entry in history] == [f'New / */Facility Fac{i}' for i in (2, 3, 4)]
+
+
+def test_history_sample():
+    history = CommandHistory(sample=4)
+    for i in range(10):
+        history.record(f'Command {i}', 'ACK', i)
+    assert [entry.Latency for entry in history] == [3, 7]
+
+
+@pytest.mark.parametrize('size, sample', [(0, 1), (1, 0)])
+def test_history_invalid(size, sample):
+    with pytest.raises(ValueError):
+        CommandHistory(size, sample)
+
+
+def test_history_slowest():
+    history = CommandHistory()
+    for latency in [5, 50, 1, 20]:
+        history.record(f'Command {latency}', 'ACK', latency)
+    assert [entry.Latency for entry in history.slowest(2)] == [50, 20]
+
+
+def test_history_save(tmp_path):
+    history = CommandHistory()
+    history.record('New / */Facility Fac0', 'ACK', 1500)
+    history.record('Rename */Facility/Fac0 Fac1', 'NACK', 250)
+    history.save(tmp_path / 'history.npy')
+
+    array = np.load(tmp_path / 'history.npy')
+    assert array['Command'].tolist() == [b'New / */Facility Fac0', b'Rename */Facility/Fac0 Fac1']
+    assert array['Response'].tolist() == [b'ACK', b'NACK']
+    assert array['Latency'].tolist() == [1500, 250]
+    assert array['Time'].dtype == np.dtype('datetime64[ns]')
+    assert CommandHistory().to_array().shape == (0,)
+
+
+def test_connect_history():
+    history = CommandHistory(size=10)
+    with MockConnectServer() as server:
+        server.nack('Rename')
+        with Connect(*server.address, log=history) as c:
+            for i in range(20):
+                c.send(f'New / */Facility Fac{i}')
+            with pytest.raises(STKCommandError):
+                with c.batch():
+                    c.send('New / */Facility Fac20')
+                    c.send('Rename */Facility/Fac20 Fac21')
+            assert c.history is history
+
+    assert history.count == 22
+    assert len(history) == 10
+    assert history[-1].Response == 'NACK'
+    assert all(entry.Latency > 0 for entry in history)
@@ -0,0 +1,69 @@
+import io
+import pytest
+from systemstoolkit.connect import Connect, ConnectHook, ConnectMetrics
+from systemstoolkit.connect.metrics import LatencyMetrics
+from systemstoolkit.connect.mock_server import MockConnectServer
+from systemstoolkit.exceptions import STKCommandError
+
+
+def test_latency_metrics():
+    metrics = LatencyMetrics()
+    for latency in [1000] * 98 + [100_000, 1_000_000]:
+        metrics.add(10, latency)
+    assert metrics.count == 100
+    assert metrics.size == 1000
+    assert metrics.max_latency == 1_000_000
+    assert 1000 <= metrics.percentile(50) < 2000
+    assert 100_000 <= metrics.percentile(99) < 200_000
+    assert metrics.percentile(100) == 1_000_000
+
+
+def test_connect_metrics():
+    output = io.StringIO()
+    metrics = ConnectMetrics(output)
+    with MockConnectServer() as server:
+        server.nack('Rename')
+        server.single('ShowNames', '*/Satellite/Sat1')
+        server.multi('Report_RM', ['a', 'bc'])
+        with Connect(*server.address, hooks=[metrics]) as c:
+            c.send('New / */Satellite Sat1')
+            with c.batch():
+                c.send('SetState */Satellite/Sat1 Cartesian')
+                c.send('SetState */Satellite/Sat1 Cartesian')
+            with pytest.raises(STKCommandError):
+                c.send('Rename */Satellite/Sat1 Sat2')
+            c.get_class_paths('Satellite')
+            c.send('Report_RM */Satellite/Sat1 Style "Position"')
+            c.get_report()
+
+    assert metrics.command_count == 6
+    assert metrics.commands['SetState'].count == 2
+    assert metrics.commands['Rename'].nacks == 1
+    assert metrics.nack_rate == pytest.approx(1 / 6)
+    assert metrics.commands['New'].size == len('New / */Satellite Sat1\n')
+    assert metrics.messages['SHOWNAMES'].size == 40 + len('*/Satellite/Sat1')
+    assert metrics.messages['REPORT_RM'].size == 4 * 40 + len('2abc')
+    assert metrics.bytes_in == 6 * 3 + 1 + 40 + 16 + 4 * 40 + 4
+
+    summary = output.getvalue()
+    assert summary == metrics.summary()
+    assert 'SetState' in summary
+    assert 'NACK rate 16.67%' in summary
+
+
+def test_connect_hook():
+    class Recorder(ConnectHook):
+        def __init__(self):
+            self.events = []
+
+        def on_command(self, command, response, latency):
+            self.events.append((command, response))
+
+        def on_close(self, connect):
+            self.events.append('close')
+
+    hook = Recorder()
+    with MockConnectServer() as server:
+        with Connect(*server.address, hooks=[hook]) as c:
+            c.send('New / */Facility Fac0')
+    assert hook.events == [('New / */Facility Fac0', 'ACK'), 'close']
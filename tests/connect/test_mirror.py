@@ -0,0 +1,111 @@
+import pytest
+from systemstoolkit.connect import Connect
+from systemstoolkit.exceptions import STKCommandError
+from systemstoolkit.connect.mirror import ScenarioMirror, normalize_path, path_class
+from systemstoolkit.connect.mock_server import MockConnectServer
+
+
+@pytest.mark.parametrize('path, output', [
+    ('/Application/STK/Scenario/Example/Satellite/Sat1', '*/Satellite/Sat1'),
+    ('/Application/STK/Scenario/Example/Satellite/Sat1/Sensor/Sen1', '*/Satellite/Sat1/Sensor/Sen1'),
+    ('/Application/STK/Scenario/Example', '/Application/STK/Scenario/Example'),
+    ('*/Facility/Fac1', '*/Facility/Fac1'),
+])
+def test_normalize_path(path, output):
+    assert normalize_path(path) == output
+
+
+def test_path_class():
+    assert path_class('*/Satellite/Sat1/Sensor/Sen1') == 'Sensor'
+
+
+def test_mirror():
+    mirror = ScenarioMirror()
+    assert mirror.get('Satellite') is None
+
+    mirror.set('Satellite', ['/Application/STK/Scenario/Example/Satellite/Sat1'])
+    mirror.set('Sensor', [])
+    mirror.add('*/Satellite/Sat2')
+    mirror.add('*/Satellite/Sat2/Sensor/Sen1')
+    mirror.add('*/Facility/Fac1')
+    assert mirror.get('Satellite') == ['*/Satellite/Sat1', '*/Satellite/Sat2']
+    assert mirror.get('Facility') is None
+
+    mirror.rename('*/Satellite/Sat2', '*/Satellite/Sat3')
+    assert mirror.get('Sensor') == ['*/Satellite/Sat3/Sensor/Sen1']
+
+    mirror.remove('*/Satellite/Sat3')
+    assert mirror.get('Satellite') == ['*/Satellite/Sat1']
+    assert mirror.get('Sensor') == []
+
+    mirror.clear(empty=True)
+    assert mirror.get('Facility') == []
+    assert mirror.get('Scenario') == []
+
+
+def test_connect_mirror():
+    with MockConnectServer() as server:
+        server.single('ShowNames', '/Application/STK/Scenario/Example/Facility/Fac1')
+        with Connect(*server.address) as c:
+            shownames = lambda: [cmd for cmd in server.commands if cmd.startswith('ShowNames')]
+
+            assert [f.path for f in c.get_facilities()] == ['*/Facility/Fac1']
+            fac = c.new_facility('Fac2')
+            assert [f.path for f in c.get_facilities()] == ['*/Facility/Fac1', '*/Facility/Fac2']
+            fac.rename('Fac3')
+            assert c.get_class_paths('Facility') == ['*/Facility/Fac1', '*/Facility/Fac3']
+            fac.unload()
+            assert c.get_class_paths('Facility') == ['*/Facility/Fac1']
+            assert len(shownames()) == 1
+
+            assert len(c.get_class_paths('Facility', refresh=True)) == 1
+            assert len(shownames()) == 2
+
+            # An unloaded scenario has no objects
+            c.new_scenario('Example')
+            c.new_satellite('Sat1')
+            assert len(c.get_locations()) == 0
+            assert [s.path for s in c.get_satellites()] == ['*/Satellite/Sat1']
+            assert len(shownames()) == 2
+
+            c.get_scenario()
+            assert len(shownames()) == 3
+
+
+def test_batch_nack_mirror():
+    with MockConnectServer() as server:
+        server.single('ShowNames', '/Application/STK/Scenario/Example/Satellite/Sat1')
+        with Connect(*server.address) as c:
+            sat = c.get_satellites()[0]
+            server.nack('New')
+            server.nack('Rename')
+            with pytest.raises(STKCommandError):
+                with c.batch():
+                    c.new_satellite('A')
+                    c.new_satellite('B')
+                    # Queued, so the mirror is unchanged until the flush
+                    assert c.mirror.get('Satellite') == ['*/Satellite/Sat1']
+                    sat.rename('Sat2')
+            assert c.get_class_paths('Satellite') == ['*/Satellite/Sat1']
+            assert sat.path == '*/Satellite/Sat1'
+
+            # Unloading is ACKed, so it reaches the mirror on the flush
+            with c.batch():
+                sat.unload()
+                assert c.mirror.get('Satellite') == ['*/Satellite/Sat1']
+            assert c.get_class_paths('Satellite') == []
+            assert len([cmd for cmd in server.commands if cmd.startswith('ShowNames')]) == 1
+
+
+def test_batch_rename():
+    with MockConnectServer() as server:
+        server.single('ShowNames', '/Application/STK/Scenario/Example/Satellite/Sat1')
+        with Connect(*server.address) as c:
+            sat = c.get_satellites()[0]
+            with c.batch():
+                sat.rename('Sat2')
+                # Renaming flushes, so later commands use the new path
+                assert sat.path == '*/Satellite/Sat2'
+                sat.unload()
+            assert server.commands[-2:] == ['Rename */Satellite/Sat1 Sat2', 'Unload / */Satellite/Sat2']
+            assert c.get_class_paths('Satellite') == []
@@ -0,0 +1,64 @@
+import time
+import mock
+import pytest
+import numpy as np
+from systemstoolkit.connect import Connect
+from systemstoolkit.connect.mock_server import MockConnectServer, make_report, main
+from systemstoolkit.connect.reports import parse_report
+
+
+def test_make_report():
+    rows = make_report(5, ncols=2, step=0.5)
+    assert rows[0] == 'Time (UTCG),Column1 (km),Column2 (km)'
+    report = parse_report(rows)
+    assert report.dtype.names == ('Time', 'Column1 (km)', 'Column2 (km)')
+    assert report['Time'][-1] == np.datetime64('2022-07-01T00:00:02')
+
+
+def test_report():
+    rows = make_report(1000)
+    with MockConnectServer() as server:
+        server.report(rows)
+        with Connect(*server.address) as c:
+            c.send('Report_RM */Satellite/Sat1 Style "Cartesian Position"')
+            assert c.get_report() == rows
+
+
+def test_latency():
+    with MockConnectServer(latency=0.05) as server:
+        with Connect(*server.address) as c:
+            start = time.perf_counter()
+            c.send('New / */Facility Fac0')
+            assert time.perf_counter() - start >= 0.05
+
+            # Pipelined commands arrive together, and are answered together
+            start = time.perf_counter()
+            with c.batch():
+                for i in range(10):
+                    c.send(f'New / */Facility Fac{i}')
+            assert time.perf_counter() - start < 0.5
+
+
+def test_stop():
+    server = MockConnectServer()
+    server.stop()
+    with pytest.raises(ConnectionRefusedError):
+        Connect(*server.address).connect()
+
+    with MockConnectServer() as server:
+        pass
+    # Stopping again does nothing
+    server.stop()
+
+
+def test_main():
+    with mock.patch.object(MockConnectServer, 'serve', autospec=True) as serve:
+        main([
+            '--port', '0', '--nack', 'Rename',
+            '--single', 'ShowNames', '*/Satellite/Sat1', '--report-rows', '10',
+        ])
+    server = serve.call_args[0][0]
+    server._server.server_close()
+    assert server.respond('Rename */Satellite/Sat1 Sat2') == b'NACK'
+    assert server.respond('ShowNames * Class Satellite').endswith(b'*/Satellite/Sat1')
+    assert b'Time (UTCG)' in server.respond('Report_RM */Satellite/Sat1 Style "Position"')
@@ -0,0 +1,120 @@
+import threading
+import pytest
+from systemstoolkit.connect import Connect, ConnectPool
+from systemstoolkit.connect.mock_server import MockConnectServer
+from systemstoolkit.exceptions import STKCommandError, STKConnectError
+
+
+@pytest.fixture
+def servers():
+    servers = [MockConnectServer() for _ in range(3)]
+    for server in servers:
+        server.start()
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def new_facility(connect: Connect, name: str) -> str:
+    connect.send(f'New / */Facility {name}')
+    return name.upper()
+
+
+def test_map(servers):
+    names = [f'Fac{i}' for i in range(30)]
+    with ConnectPool([server.address for server in servers]) as pool:
+        assert len(pool) == 3
+        assert pool.map(new_facility, names) == [name.upper() for name in names]
+
+    commands = sorted(command for server in servers for command in server.commands)
+    assert commands == sorted(f'New / */Facility {name}' for name in names)
+
+
+def test_map_spreads_work(servers):
+    # Every worker waits until all three hold a connection at once
+    barrier = threading.Barrier(3, timeout=5)
+
+    def work(connect, name):
+        barrier.wait()
+        return new_facility(connect, name)
+
+    with ConnectPool([server.address for server in servers]) as pool:
+        pool.map(work, ['a', 'b', 'c'])
+    assert all(len(server.commands) == 1 for server in servers)
+
+
+def test_reconnect(servers):
+    failed = []
+
+    def flaky(connect, name):
+        if not failed:
+            failed.append(name)
+            connect._socket.close()
+        return new_facility(connect, name)
+
+    with ConnectPool([servers[0].address]) as pool:
+        assert pool.map(flaky, ['Fac0', 'Fac1']) == ['FAC0', 'FAC1']
+    assert failed == ['Fac0']
+
+
+@pytest.mark.parametrize('retries', [0, 1])
+def test_reconnect_fails(servers, retries):
+    def lost(connect, name):
+        servers[0].stop()
+        connect._socket.close()
+        return new_facility(connect, name)
+
+    with ConnectPool([servers[0].address, servers[1].address], retries=retries) as pool:
+        with pytest.raises(OSError):
+            pool.run(lost, 'Fac0')
+        # The dead connection is dropped, so later work uses the other one
+        assert pool.map(new_facility, ['Fac1', 'Fac2']) == ['FAC1', 'FAC2']
+        assert servers[1].commands == ['New / */Facility Fac1', 'New / */Facility Fac2']
+
+        servers[1].stop()
+        with pytest.raises(OSError):
+            pool.run(lost, 'Fac3')
+        # With no connection left, work fails rather than waiting forever
+        with pytest.raises(STKConnectError):
+            pool.map(new_facility, ['Fac4', 'Fac5'])
+
+
+def test_no_retries(servers):
+    failed = []
+
+    def flaky(connect, name):
+        if not failed:
+            failed.append(name)
+            connect._socket.close()
+        return new_facility(connect, name)
+
+    with ConnectPool([servers[0].address], retries=0) as pool:
+        with pytest.raises(OSError):
+            pool.run(flaky, 'Fac0')
+        # The failed connection is re-established before it is handed out again
+        assert pool.map(flaky, ['Fac1', 'Fac2']) == ['FAC1', 'FAC2']
+    assert servers[0].commands == ['New / */Facility Fac1', 'New / */Facility Fac2']
+
+
+def test_connect_fails(servers):
+    servers[1].stop()
+    pool = ConnectPool([servers[0].address, servers[1].address])
+    with pytest.raises(OSError):
+        pool.connect()
+    # The connection opened before the failure is closed
+    assert pool.connections[0]._socket.fileno() == -1
+
+
+def test_command_error(servers):
+    servers[0].nack('New')
+    with ConnectPool([servers[0].address]) as pool:
+        with pytest.raises(STKCommandError):
+            pool.map(new_facility, ['Fac0'])
+
+
+def test_ports():
+    pool = ConnectPool([5001, ('otherhost', 5002)])
+    assert [(c.host, c.port) for c in pool.connections] == [('localhost', 5001), ('otherhost', 5002)]
+
+    with pytest.raises(ValueError):
+        ConnectPool([])
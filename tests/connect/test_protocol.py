@@ -0,0 +1,38 @@
+import mock
+import pytest
+from systemstoolkit.connect import protocol
+from systemstoolkit.exceptions import STKConnectError
+from tests.connect.fakes import recv_into
+
+
+def make_reader(*replies: bytes, size: int = 16) -> protocol.SocketReader:
+    sock = mock.Mock()
+    sock.recv_into.side_effect = recv_into(*replies)
+    return protocol.SocketReader(sock, size)
+
+
+def test_reader_fragmented():
+    data = protocol.encode_single_message('SHOWNAMES', '*/Satellite/Sat1')
+    reader = make_reader(*[data[i:i + 1] for i in range(len(data))])
+    name, length = protocol.parse_header(reader.read(protocol.HEADER_SIZE))
+    assert (name, length) == ('SHOWNAMES', 16)
+    assert bytes(reader.read(length)) == b'*/Satellite/Sat1'
+
+
+def test_reader_coalesced():
+    reader = make_reader(b'ACKNACKACK')
+    assert [bytes(reader.read(n)) for n in (3, 3, 1, 3)] == [b'ACK', b'NAC', b'K', b'ACK']
+    assert reader._socket.recv_into.call_count == 1
+
+
+def test_reader_grows():
+    data = bytes(range(256)) * 100
+    reader = make_reader(b'AC', b'K' + data[:1000], data[1000:])
+    assert bytes(reader.read(3)) == b'ACK'
+    assert bytes(reader.read(len(data))) == data
+
+
+def test_reader_closed():
+    reader = make_reader(b'AC')
+    with pytest.raises(STKConnectError):
+        reader.read(3)
@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+from systemstoolkit.connect import Connect
+from systemstoolkit.connect.objects import Satellite
+from systemstoolkit.connect.mock_server import MockConnectServer
+from systemstoolkit.connect.reports import parse_report
+
+
+ROWS = [
+    'Time (UTCG),x (km),y (km),z (km)',
+    '1 Jul 2022 00:00:00.000,6678.137000,0.000000,0.000000',
+    '1 Jul 2022 00:00:01.000,6678.133000,7.725000,0.000000',
+    '1 Jul 2022 00:00:02.500,6678.120000,19.310000,0.000000',
+]
+
+
+def test_parse_report():
+    report = parse_report(ROWS)
+    assert report.dtype.names == ('Time', 'x (km)', 'y (km)', 'z (km)')
+    assert report['Time'].dtype == np.dtype('datetime64[ns]')
+    assert report['Time'][2] == np.datetime64('2022-07-01T00:00:02.500')
+    assert report['y (km)'].tolist() == [0.0, 7.725, 19.31]
+
+
+def test_parse_report_names():
+    report = parse_report(ROWS[1:], names=['x', 'y', 'z'], dtype=np.float32)
+    assert report.dtype.names == ('Time', 'x', 'y', 'z')
+    assert report['x'].dtype == np.float32
+    assert parse_report(ROWS[1:]).dtype.names == ('Time', 'Column1', 'Column2', 'Column3')
+
+
+def test_parse_report_empty():
+    report = parse_report(ROWS[:1])
+    assert report.shape == (0,)
+    assert report.dtype.names == ('Time', 'x (km)', 'y (km)', 'z (km)')
+
+
+@pytest.mark.parametrize('rows', [
+    ROWS + ['1 Jul 2022 00:00:03.000,6678.1,0.0'],
+    ROWS + ['1 Jul 2022 00:00:03.000,6678.1,,0.0'],
+    ROWS + ['1 Jul 2022 00:00:03.000,6678.1,Umbra,0.0'],
+])
+def test_parse_report_invalid(rows):
+    with pytest.raises(ValueError):
+        parse_report(rows)
+
+
+def test_object_report():
+    with MockConnectServer() as server:
+        server.multi('Report_RM', ROWS)
+        with Connect(*server.address) as c:
+            sat = Satellite(c, '*/Satellite/Sat1')
+            report = sat.report(
+                'Cartesian Position',
+                (np.datetime64('2022-07-01'), np.datetime64('2022-07-02')),
+                step=1,
+            )
+    assert server.commands == [
+        'Report_RM */Satellite/Sat1 Style "Cartesian Position" TimePeriod '
+        '"01 Jul 2022 00:00:00.000" "02 Jul 2022 00:00:00.000" TimeStep 1'
+    ]
+    assert report.size == 3
+    assert report['x (km)'][0] == 6678.137
@@ -1,8 +1,12 @@
 import pytest
 import mock
+import datetime
+import numpy as np
 from systemstoolkit.connect.session import Connect
-from systemstoolkit.connect.objects import Scenario, Satellite, Sensor
+from systemstoolkit.connect.objects import Scenario, Satellite, Sensor, Facility
+from systemstoolkit.connect.mock_server import MockConnectServer
 from systemstoolkit.exceptions import STKCommandError, STKConnectError
+from tests.connect.fakes import recv_into
 
 
 def test_connect_socket():
@@ -26,8 +30,8 @@ def test_connect_socket_refused():
 ])
 def test_send_command_ack(command):
     with mock.patch('socket.socket') as mock_sock:
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.return_value = b'ACK'
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         with Connect(log=True) as c:
             assert c._socket.connect.call_count == 1
@@ -37,7 +41,9 @@ def test_send_command_ack(command):
             assert sent_command == command.strip()
                 
             # Check that command shows up in the last spot in command log
-            assert c._history[-1] == (command.strip(), 'ACK')
+            assert c.history[-1].Command == command.strip()
+            assert c.history[-1].Response == 'ACK'
+            assert c.history[-1].Latency > 0
 
 
 @pytest.mark.parametrize('command', [
@@ -46,8 +52,8 @@ def test_send_command_ack(command):
 ])
 def test_send_command_nack(command):
     with mock.patch('socket.socket') as mock_sock:
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.side_effect = (b'NAC', b'K')
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'NAC', b'K')
 
         with Connect(log=True) as c:
             with pytest.raises(STKCommandError):
@@ -60,8 +66,8 @@ def test_send_command_nack(command):
 ])
 def test_send_command_invalid_response(command):
     with mock.patch('socket.socket') as mock_sock:
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.return_value = b'NOT A VALID RESPONSE'
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'NOT A VALID RESPONSE', repeat=True)
 
         with Connect(log=True) as c:
             with pytest.raises(STKConnectError):
@@ -70,8 +76,8 @@ def test_send_command_invalid_response(command):
 
 def test_get_single_message():
     with mock.patch('socket.socket') as mock_sock:
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.side_effect = (
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(
             b'STK_COMMAND 10\x00' + b' ' * 25,
             b'A' * 10,
         )
@@ -84,10 +90,10 @@ def test_get_single_message():
 
 def test_get_connect_units():
     with mock.patch('socket.socket') as mock_sock:
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.side_effect = (
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(
             b'ACK',
-            b'UNITS_GET 76\x00                          \n',
+            b'UNITS_GET 75\x00                          \n',
             b'\nDistance  m;\nTime      sec;\nDate      UTCG;\nLatitude  deg;\nLongitude deg;\n',
         )
 
@@ -100,10 +106,10 @@ def test_get_connect_units():
 
 def test_update_connect_units():
     with mock.patch('socket.socket') as mock_sock:
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.side_effect = (
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(
             b'ACK',
-            b'UNITS_GET 76\x00                          \n',
+            b'UNITS_GET 75\x00                          \n',
             b'\nDistance  m;\nTime      sec;\nDate      UTCG;\nLatitude  deg;\nLongitude deg;\n',
         )
 
@@ -121,8 +127,8 @@ def test_new_scenario():
         s.connect()
         assert s._socket.connect.call_count == 1
 
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.return_value = b'ACK'
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
         
         name = 'ScenarioNameHere'
         scenario_obj = s.new_scenario(name)
@@ -138,8 +144,8 @@ def test_new_satellite():
         s.connect()
         assert s._socket.connect.call_count == 1
 
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.return_value = b'ACK'
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
         
         name = 'SatNameHere'
         sat_obj = s.new_satellite(name)
@@ -155,8 +161,8 @@ def test_new_sensor():
         s.connect()
         assert s._socket.connect.call_count == 1
 
-        # Set the recv return value to be ACK so get_ack() works in send()
-        mock_sock.return_value.recv.return_value = b'ACK'
+        # Set the recv_into replies so get_ack() works in send()
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
 
         sat_name = 'SatelliteName'
         sat_obj = s.new_satellite(sat_name)
@@ -177,3 +183,130 @@ def test_new_sensor():
         print('sensor_name:', sen_name)
         assert isinstance(sen_obj, Sensor)
         assert cmd == f'New / {sat_obj.path}/Sensor {sen_name}'
+
+
+def test_batch():
+    commands = [f'New / */Facility Fac{i}' for i in range(5)]
+    with mock.patch('socket.socket') as mock_sock:
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
+
+        with Connect(log=True) as c:
+            with c.batch():
+                for command in commands:
+                    c.send(command)
+                assert c._socket.sendall.call_count == 0
+
+            # All commands are written together, then all ACKs are read
+            assert c._socket.sendall.call_count == 1
+            sent = c._socket.sendall.call_args[0][0].decode()
+            assert sent.splitlines() == commands
+            assert c._socket.recv_into.call_count == 5
+            assert [(e.Command, e.Response) for e in c.history] == [(command, 'ACK') for command in commands]
+
+
+def test_batch_size():
+    with mock.patch('socket.socket') as mock_sock:
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', repeat=True)
+
+        with Connect() as c:
+            with c.batch(size=2):
+                for i in range(5):
+                    c.send(f'New / */Facility Fac{i}')
+            assert c._socket.sendall.call_count == 3
+
+
+def test_batch_nack():
+    with mock.patch('socket.socket') as mock_sock:
+        mock_sock.return_value.recv_into.side_effect = recv_into(b'ACK', b'NAC', b'K', b'ACK')
+
+        with Connect() as c:
+            with pytest.raises(STKCommandError, match='Fac1'):
+                with c.batch():
+                    for i in range(3):
+                        c.send(f'New / */Facility Fac{i}')
+
+            # Every response was read
+            assert c._socket.recv_into.call_count == 4
+            assert c._pending is None
+
+
+def test_batch_message():
+    with mock.patch('socket.socket') as mock_sock:
+        mock_sock.return_value.recv_into.side_effect = recv_into(
+            b'ACK',
+            b'ACK',
+            b'STK_COMMAND 10\x00' + b' ' * 25,
+            b'A' * 10,
+        )
+
+        with Connect() as c:
+            with c.batch():
+                c.send('New / */Facility Fac0')
+                c.send('ShowNames * Class Facility')
+                msg = c.get_single_message()
+            assert msg.Data == 'A' * 10
+            assert c._socket.sendall.call_count == 1
+
+
+def test_new_objects():
+    with MockConnectServer() as server:
+        server.single('ShowNames', '')
+        with Connect(*server.address) as c:
+            facilities = c.new_objects(Facility, ['Fac0', 'Fac1'])
+            assert [f.path for f in facilities] == ['*/Facility/Fac0', '*/Facility/Fac1']
+            assert c.get_class_paths('Facility') == []
+    assert server.commands == ['New / */Facility Fac0', 'New / */Facility Fac1', 'ShowNames * Class Facility']
+
+
+def test_new_objects_nack():
+    with MockConnectServer() as server:
+        server.single('ShowNames', '')
+        server.nack_command('New / */Satellite Sat1')
+        with Connect(*server.address) as c:
+            c.new_scenario('Example')
+            with pytest.raises(STKCommandError):
+                c.new_objects(Satellite, ['Sat0', 'Sat1', 'Sat2'])
+            # STK created the others, but not the NACKed one
+            assert [s.path for s in c.get_satellites()] == ['*/Satellite/Sat0', '*/Satellite/Sat2']
+    assert not any(cmd.startswith('ShowNames') for cmd in server.commands)
+
+
+def test_new_objects_invalid():
+    with MockConnectServer() as server:
+        with Connect(*server.address) as c:
+            with pytest.raises(ValueError):
+                c.new_objects(Facility, ['Fac0', 'Fac 1'])
+    assert server.commands == []
+
+
+def test_new_satellites():
+    epoch = datetime.datetime(2022, 7, 1)
+    states = np.array([[7000e3, 0, 0, 0, 7.5e3, 0], [0, 7000e3, 0, -7.5e3, 0, 0]])
+    with MockConnectServer() as server:
+        with Connect(*server.address) as c:
+            c.new_scenario('Example')
+            sats = c.new_satellites(['Sat0', 'Sat1'], states, epoch, coord='J2000')
+            assert [s.path for s in sats] == ['*/Satellite/Sat0', '*/Satellite/Sat1']
+            assert [s.path for s in c.get_satellites()] == ['*/Satellite/Sat0', '*/Satellite/Sat1']
+
+    assert server.commands[3:] == [
+        'New / */Satellite Sat0',
+        'New / */Satellite Sat1',
+        'SetState */Satellite/Sat0 Cartesian TwoBody UseScenarioInterval 60 J2000 '
+        '"01 Jul 2022 00:00:00.000" 7000000.0 0.0 0.0 0.0 7500.0 0.0',
+        'SetState */Satellite/Sat1 Cartesian TwoBody UseScenarioInterval 60 J2000 '
+        '"01 Jul 2022 00:00:00.000" 0.0 7000000.0 0.0 -7500.0 0.0 0.0',
+    ]
+
+
+@pytest.mark.parametrize('states, epoch, state_type', [
+    ([[7000e3, 0, 0, 0, 7.5e3, 0]], datetime.datetime(2022, 7, 1), 'Cartesian'),
+    ([[7000e3, 0, 0, 0, 7.5e3, 0]] * 2, None, 'Cartesian'),
+    ([[7000e3, 0, 0, 0, 7.5e3, 0]] * 2, datetime.datetime(2022, 7, 1), 'TLE'),
+])
+def test_new_satellites_invalid(states, epoch, state_type):
+    with mock.patch('socket.socket'):
+        with Connect() as c:
+            with pytest.raises(ValueError):
+                c.new_satellites(['Sat0', 'Sat1'], states, epoch, state_type)
+            assert c._socket.sendall.call_count == 0
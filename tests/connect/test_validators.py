@@ -27,6 +27,19 @@ def test_invalid_names(name):
         validators.name(name)
 
 
+def test_names():
+    assert validators.names(iter(['Sat1', 'Sat2'])) == ['Sat1', 'Sat2']
+
+
+@pytest.mark.parametrize('names', [
+    ['Sat1', 'Sat 2'],
+    ['Sat1', 'Sat2', 'SAT1'],
+])
+def test_invalid_group_names(names):
+    with pytest.raises(ValueError):
+        validators.names(names)
+
+
 @pytest.mark.parametrize('value, min, max', [
     (0, None, None),
     (10, 0, None),
@@ -1,5 +1,14 @@
+import io
 import pytest
-from systemstoolkit.files.builders import attitude_file, sensor_pointing_file
+import numpy as np
+from systemstoolkit.files.builders import (
+    attitude_file,
+    sensor_pointing_file,
+    attitude_file_chunks,
+    sensor_pointing_file_chunks,
+    attitude_files,
+    sensor_pointing_files,
+)
 from systemstoolkit.utils import read_file_data
 
 A_FILE_Q = 'data/AttitudeTimeQuaternions.a'
@@ -43,3 +52,93 @@ def test_spfile_builder(file, format, kwargs):
         time, data, format=format, **kwargs,
     )
     print(file)
+
+
+@pytest.mark.parametrize('builder, file, format', [
+    (attitude_file, A_FILE_Q, 'quaternions'),
+    (sensor_pointing_file, SP_FILE_AZEL, 'AzElAngles'),
+])
+def test_builder_write_file(builder, file, format, tmp_path):
+    time, data = read_file_data(file)
+    path = tmp_path / 'out.txt'
+
+    assert builder(time, data, format=format, file=path) is None
+    assert path.read_text() == builder(time, data, format=format)
+
+
+def iter_chunks(time, data, size):
+    for start in range(0, len(time), size):
+        yield time[start:start + size], data[start:start + size]
+
+
+class UnseekableFile(io.StringIO):
+    def seekable(self):
+        return False
+
+
+@pytest.mark.parametrize('builder, chunk_builder, file, format', [
+    (attitude_file, attitude_file_chunks, A_FILE_Q, 'quaternions'),
+    (attitude_file, attitude_file_chunks, A_FILE_A, 'eulerangles'),
+    (sensor_pointing_file, sensor_pointing_file_chunks, SP_FILE_AZEL, 'AzElAngles'),
+])
+def test_chunk_builder(builder, chunk_builder, file, format, tmp_path):
+    time, data = read_file_data(file)
+    expected = builder(time, data, format=format).splitlines()
+
+    path = tmp_path / 'out.txt'
+    points = chunk_builder(iter_chunks(time, data, 100), path, format=format)
+    assert points == len(time)
+
+    lines = path.read_text().splitlines()
+    assert lines[2].split() == ['NumberOfAttitudePoints', str(len(time))]
+    assert lines[:2] + lines[3:] == expected
+
+
+def test_chunk_builder_unseekable():
+    time, data = read_file_data(A_FILE_Q)
+    buf = UnseekableFile()
+    attitude_file_chunks(iter_chunks(time, data, 100), buf, format='quaternions')
+    assert buf.getvalue() == attitude_file(time, data, format='quaternions')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_attitude_files(workers, tmp_path):
+    time, data = read_file_data(A_FILE_Q)
+    vehicles = np.stack([data, data[:, [1, 0, 2, 3]], -data])
+
+    results = attitude_files(time, vehicles, tmp_path, format='quaternions', workers=workers)
+    assert [result.Name for result in results] == ['Vehicle1', 'Vehicle2', 'Vehicle3']
+    for result, vehicle in zip(results, vehicles):
+        assert result.Error is None
+        assert result.Points == len(time)
+        with open(result.Path) as fd:
+            assert fd.read() == attitude_file(time, vehicle, format='quaternions')
+
+
+def test_sensor_pointing_files_report_errors(tmp_path):
+    time, data = read_file_data(SP_FILE_AZEL)
+    vehicles = {'Sat1': data, 'Sat2': np.full_like(data, np.nan)}
+
+    results = sensor_pointing_files(time, vehicles, tmp_path, format='azelangles', workers=2)
+    assert results[0].Error is None
+    assert (tmp_path / 'Sat1.sp').read_text() == sensor_pointing_file(time, data, format='azelangles')
+    assert results[1].Name == 'Sat2'
+    assert results[1].Error.startswith('InvalidDataError')
+
+
+@pytest.mark.parametrize('name', ['Bad/Name', '../Sat1', '..', ''])
+def test_attitude_files_unsafe_names(name, tmp_path):
+    time, data = read_file_data(A_FILE_Q)
+    with pytest.raises(ValueError):
+        attitude_files(time, {'Sat1': data, name: data}, tmp_path / 'out', format='quaternions')
+    assert not any(tmp_path.iterdir())
+
+
+def test_attitude_files_shapes(tmp_path):
+    time, data = read_file_data(A_FILE_Q)
+    with pytest.raises(ValueError):
+        attitude_files(time, data, tmp_path, format='quaternions')
+    with pytest.raises(ValueError):
+        attitude_files(time[1:], data[None], tmp_path, format='quaternions')
+    with pytest.raises(ValueError):
+        attitude_files(time, data[None], tmp_path, names=['A', 'B'], format='quaternions')
@@ -1,16 +1,21 @@
+import io
 import pytest
 import numpy as np
 from dataclasses import asdict
-from systemstoolkit.files.files import AttitudeFile
-from systemstoolkit.files.formats import AttitudeFileFormat
+from systemstoolkit.files.files import AttitudeFile, ChunkedAttitudeFile, SensorPointingFile
+from systemstoolkit.files.formats import AttitudeFileFormat, SensorPointingFileFormat
+from systemstoolkit.files.validators import QuaternionValidator
 from systemstoolkit.utils import read_file_data
 from systemstoolkit.files.keywords import (
     Keyword, Coordinate, CoordinateAxes, CoordinateAxesEpoch,
+    BlockingFactor, Interpolation, InterpolationMethod, InterpolationOrder,
+    AttitudeDeviations, ScenarioEpoch, Sequence, TimeFormat,
 )
 
 
 FILE_Q = 'data/AttitudeTimeQuaternions.a'
 FILE_A = 'data/AttitudeTimeEulerAngles.a'
+FILE_SP = 'data/AttitudeTimeAzElAngles.sp'
 
 @pytest.mark.parametrize('file, format, kwargs', [
     (FILE_Q, 'quaternions', dict()),
@@ -50,3 +55,173 @@ def test_quaternions(file, format, kwargs):
             keyword, value =  str(attr).split(maxsplit=1)
             assert keyword in out
             assert value in out
+
+
+@pytest.mark.parametrize('file, format', [
+    (FILE_Q, 'quaternions'),
+    (FILE_A, 'eulerangles'),
+])
+def test_write(file, format, tmp_path):
+    time, data = read_file_data(file)
+    afile = AttitudeFile(time, data, format=AttitudeFileFormat(format))
+    expected = afile.to_string()
+
+    buf = io.StringIO()
+    afile.write(buf, chunk_size=50)
+    assert buf.getvalue() == expected
+
+    path = tmp_path / f'{format}.a'
+    afile.write(path)
+    assert path.read_text() == expected
+
+
+def test_stream_chunks():
+    time, data = read_file_data(FILE_Q)
+    afile = AttitudeFile(time, data, format=AttitudeFileFormat('quaternions'))
+    chunks = list(afile.stream(chunk_size=100))
+
+    # Header, four data chunks, footer
+    assert len(chunks) == 6
+    assert chunks[0].startswith('stk.v.')
+    assert chunks[-1].endswith('END Attitude\n')
+    assert ''.join(chunks) == afile.to_string()
+
+
+def test_from_file():
+    afile = AttitudeFile.from_file(FILE_A)
+    assert afile.version == '5.0'
+    assert afile.format == AttitudeFileFormat('EulerAngles')
+    assert afile.epoch == ScenarioEpoch(np.datetime64('2002-06-01T12:00:00'))
+    assert afile.axes == Coordinate(CoordinateAxes('J2000'))
+    assert afile.blocking == BlockingFactor(20)
+    assert afile.interp == Interpolation(None, InterpolationOrder(1))
+    assert afile.sequence == Sequence(313)
+    assert afile.time_fmt == TimeFormat('EpSec')
+    assert afile.message is None
+    assert afile.time.dtype == np.dtype('datetime64[ns]')
+    assert afile.data.dtype == np.float64
+    assert afile.data.shape == (721, 3)
+
+
+def test_sensor_pointing_from_file():
+    spfile = SensorPointingFile.from_file(FILE_SP)
+    assert spfile.format == SensorPointingFileFormat('AzElAngles')
+    assert spfile.sequence == Sequence(323)
+    assert spfile.data.shape == (401, 2)
+
+
+@pytest.mark.parametrize('time_fmt', [member.name for member in TimeFormat])
+def test_from_file_round_trip(time_fmt, tmp_path):
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(100) * np.timedelta64(250, 'ms')
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (100, 1))
+    afile = AttitudeFile(
+        time, data,
+        format = AttitudeFileFormat('Quaternions'),
+        axes = Coordinate(CoordinateAxes('TrueOfEpoch'), CoordinateAxesEpoch(time[0])),
+        interp = Interpolation(InterpolationMethod('Hermite'), InterpolationOrder(3)),
+        deviations = AttitudeDeviations('Mild'),
+        time_fmt = TimeFormat(time_fmt),
+    )
+    path = tmp_path / 'file.a'
+    afile.write(path)
+
+    new = AttitudeFile.from_file(path)
+    for name in ['format', 'epoch', 'message', 'axes', 'body', 'interp', 'deviations', 'time_fmt']:
+        assert getattr(new, name) == getattr(afile, name)
+    # Calendar day fractions are only good to about 100 us in float64
+    assert np.all(np.abs(new.time - time) < np.timedelta64(1, 'ms'))
+    assert np.all(new.data == data)
+    if time_fmt not in ['YYYYDDD', 'YYYYMMDD']:
+        new = AttitudeFile.from_file(path, resolution='ms')
+        assert new.to_string() == afile.to_string()
+
+
+@pytest.mark.parametrize('time_fmt', ['EpSec', 'EpMin', 'EpHour', 'EpDays', 'ISOYMD'])
+def test_high_rate_round_trip(time_fmt, tmp_path):
+    # 1 kHz samples with microsecond jitter, an odd epoch, and a long span
+    rng = np.random.default_rng(0)
+    time = np.datetime64('2022-07-11T00:00:00.000123456') + np.timedelta64(10, 'D')
+    time = time + np.arange(1000) * np.timedelta64(1, 'ms') + rng.integers(0, 1000, 1000) * np.timedelta64(1, 'us')
+    data = rng.standard_normal((1000, 4))
+    data /= np.linalg.norm(data, axis=1)[:, None]
+    afile = AttitudeFile(
+        time, data,
+        format = AttitudeFileFormat('Quaternions'),
+        epoch = ScenarioEpoch(np.datetime64('2022-07-01T00:00:00.000000001')),
+        time_fmt = TimeFormat(time_fmt),
+    )
+    path = tmp_path / 'file.a'
+    afile.write(path)
+
+    new = AttitudeFile.from_file(path, resolution='ns', dtype=np.float32)
+    assert new.epoch == afile.epoch
+    assert np.all(new.time == time)
+    assert new.data.dtype == np.float32
+
+
+def test_validator():
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(10) * np.timedelta64(1, 's')
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (10, 1)).astype(np.float32) * 1.001
+    data[3] = 0
+    afile = AttitudeFile(
+        time, data,
+        format = AttitudeFileFormat('Quaternions'),
+        validator = QuaternionValidator(repair=True),
+    )
+    assert afile.rejected.tolist() == [3]
+    assert afile.data.dtype == np.float32
+    assert np.linalg.norm(afile.data, axis=1) == pytest.approx(1)
+
+
+def test_validator_chunk_continuity():
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(8) * np.timedelta64(1, 's')
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (8, 1))
+    # The sign flips exactly at the boundary between the two chunks
+    data[4:] *= -1
+    format = AttitudeFileFormat('Quaternions')
+    validator = QuaternionValidator(repair=True)
+    afile = AttitudeFile(time, data, format=format, validator=validator)
+    chunked = ChunkedAttitudeFile(
+        [(time[:4], data[:4]), (time[4:], data[4:])],
+        format = format,
+        validator = validator,
+    )
+    assert ''.join(chunked.iter_data()) == ''.join(afile.iter_data())
+    assert (afile.data == [0.0, 0.0, 0.6, 0.8]).all()
+
+
+class _NoCopy(np.ndarray):
+    def __deepcopy__(self, memo):
+        raise AssertionError('The data was copied')
+
+
+def test_keywords_do_not_copy():
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(10) * np.timedelta64(1, 's')
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (10, 1))
+    afile = AttitudeFile(
+        time.view(_NoCopy), data.view(_NoCopy),
+        format = AttitudeFileFormat('Quaternions'),
+    )
+    text = afile.to_string()
+    assert afile.keywords() in text
+    assert 'ScenarioEpoch' in afile.keywords()
+
+
+@pytest.mark.parametrize('time_fmt', ['EpSec', 'ISOYMD'])
+def test_parallel(time_fmt, tmp_path):
+    time, data = read_file_data(FILE_Q)
+    afile = AttitudeFile(
+        time, data,
+        format = AttitudeFileFormat('quaternions'),
+        time_fmt = TimeFormat(time_fmt),
+    )
+    expected = afile.to_string()
+
+    # Eight slices over two workers
+    chunks = list(afile.stream(chunk_size=50, workers=2))
+    assert len(chunks) == 10
+    assert ''.join(chunks) == expected
+
+    path = tmp_path / 'file.a'
+    afile.write(path, workers=2)
+    assert path.read_text() == expected
@@ -1,8 +1,97 @@
 import pytest
-from systemstoolkit.files.formats import AttitudeFileFormat
-from systemstoolkit.files.validators import NoValidator
+import numpy as np
+from systemstoolkit.files.formats import AttitudeFileFormat, SensorPointingFileFormat
+from systemstoolkit.files.validators import NoValidator, InvalidDataError
 
 
-def test_afile_format_novalidator():
-    fmt = AttitudeFileFormat.QuatAngVels
-    assert isinstance(fmt.validator, NoValidator)
+QUATERNION = [0.0, 0.0, 0.6, 0.8]
+ANGLES = [10.0, 20.0, 30.0]
+RATES = [0.1, 0.2, 0.3]
+DCM = [0.0, 1.0, 0.0, -1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+VALID_ROWS = {
+    'Quaternions': QUATERNION,
+    'QuatScalarFirst': QUATERNION,
+    'QuatAngVels': QUATERNION + RATES,
+    'AngVels': RATES,
+    'EulerAngles': ANGLES,
+    'EulerAngleRates': RATES,
+    'EulerAnglesAndRates': ANGLES + RATES,
+    'YPRAngles': ANGLES,
+    'YPRAngleRates': RATES,
+    'YPRAnglesAndRates': ANGLES + RATES,
+    'DCM': DCM,
+    'DCMAngVels': DCM + RATES,
+    'ECFVector': [7000.0, 0.0, 0.0],
+    'ECIVector': [0.0, 1.0, 0.0],
+}
+
+INVALID_ROWS = [
+    ('QuatAngVels', [0.0, 0.0, 0.6, 0.9] + RATES),
+    ('QuatAngVels', QUATERNION + [0.1, np.inf, 0.3]),
+    ('AngVels', [0.1, np.nan, 0.3]),
+    ('EulerAngles', [-400.0, 20.0, 30.0]),
+    ('YPRAngles', [10.0, -1e9, 30.0]),
+    ('EulerAnglesAndRates', [500.0, 20.0, 30.0] + RATES),
+    ('EulerAnglesAndRates', [10.0, 20.0, -500.0] + RATES),
+    ('YPRAnglesAndRates', [-500.0, 20.0, 30.0] + RATES),
+    ('YPRAnglesAndRates', ANGLES + [np.nan, 0.2, 0.3]),
+    ('DCM', [1.0, 0.1, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]),
+    ('DCM', [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, -1.0]),
+    ('DCMAngVels', DCM + [0.1, 0.2, np.nan]),
+    ('ECFVector', [0.0, 0.0, 0.0]),
+    ('ECIVector', [np.nan, 1.0, 0.0]),
+]
+
+
+def test_afile_format_validators():
+    for fmt in AttitudeFileFormat:
+        assert not isinstance(fmt.validator, NoValidator)
+
+
+@pytest.mark.parametrize('format, row', VALID_ROWS.items())
+def test_afile_format_valid(format, row):
+    time = np.arange(10)
+    data = np.tile(row, (10, 1))
+    result = AttitudeFileFormat(format).check_data(time, data)
+    assert result.Data is data
+    assert result.Rejected.size == 0
+
+
+@pytest.mark.parametrize('format, row', INVALID_ROWS)
+def test_afile_format_invalid(format, row):
+    time = np.arange(10)
+    data = np.tile(VALID_ROWS[format], (10, 1))
+    data[4] = row
+    result = AttitudeFileFormat(format).check_data(time, data)
+    assert result.Rejected.tolist() == [4]
+    assert result.Time.size == 9
+
+
+@pytest.mark.parametrize('format', VALID_ROWS.keys())
+def test_afile_format_invalid_shape(format):
+    data = np.ones((10, len(VALID_ROWS[format]) + 1))
+    with pytest.raises(InvalidDataError):
+        AttitudeFileFormat(format).check_data(np.arange(10), data)
+
+
+def test_spfile_format_azel():
+    data = np.array([
+        [10.0, 20.0],
+        [400.0, 20.0],
+        [10.0, np.nan],
+        [-400.0, 20.0],
+        [10.0, -1e9],
+        [-10.0, -20.0],
+    ])
+    result = SensorPointingFileFormat('AzElAngles').check_data(np.arange(6), data)
+    assert result.Rejected.tolist() == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize('format', ['EulerAngles', 'YPRAngles'])
+def test_spfile_format_angles(format):
+    data = np.tile(ANGLES, (4, 1))
+    data[1] = [-400.0, 20.0, 30.0]
+    data[3] = [10.0, 20.0, -1e9]
+    result = SensorPointingFileFormat(format).check_data(np.arange(4), data)
+    assert result.Rejected.tolist() == [1, 3]
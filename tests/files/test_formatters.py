@@ -0,0 +1,63 @@
+import io
+import pytest
+import numpy as np
+from systemstoolkit.files.formatters import format_rows, iter_format_rows
+from systemstoolkit.units.time import EpSecTimeUnit, ISOYMDTimeUnit
+from systemstoolkit.utils import read_file_data
+
+FILE_Q = 'data/AttitudeTimeQuaternions.a'
+FILE_A = 'data/AttitudeTimeEulerAngles.a'
+
+
+def format_rows_loop(time, data):
+    # The original row-by-row implementation of AttitudeFile.format_data
+    buf = io.StringIO()
+    for t, row in zip(time, data):
+        print(
+            str(t).rjust(15),
+            ' '.join([f'{x:.6f}'.rjust(15) for x in row]),
+            file=buf
+        )
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize('file', [FILE_Q, FILE_A])
+def test_format_rows_file(file):
+    time, data = read_file_data(file)
+    for time_unit in [EpSecTimeUnit(time[0]), ISOYMDTimeUnit()]:
+        formatted_time = time_unit.convert(time)
+        assert format_rows(formatted_time, data) == format_rows_loop(formatted_time, data)
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float64', 'int64'])
+def test_format_rows_random(dtype):
+    rng = np.random.default_rng(0)
+    n = 5000
+    time = np.concatenate([
+        np.arange(n // 2) * 0.1,
+        rng.random(n // 4) * 1e-6,
+        rng.random(n // 4) * 1e20,
+    ])
+    data = rng.standard_normal((n, 4)) * 10.0 ** rng.integers(-8, 7, (n, 1))
+    data = data.astype(dtype)
+    assert format_rows(time, data) == format_rows_loop(time, data)
+
+
+@pytest.mark.parametrize('time, data', [
+    (np.arange(4.0), np.array([[np.nan], [np.inf], [-np.inf], [-0.0]])),
+    (np.arange(4.0), np.array([[5e-7], [1.5e-6], [-1e-9], [1e9]])),
+    (np.array([-0.0, 1e-4, 9.9e-5, 1e16]), np.ones((4, 2))),
+    (np.array([0.1, 0.2], dtype='float32'), np.ones((2, 3))),
+    (np.array(['a', 'b' * 20]), np.ones((2, 3))),
+    (np.arange(3.0), np.ones((3, 0))),
+])
+def test_format_rows_edge_cases(time, data):
+    assert format_rows(time, data) == format_rows_loop(time, data)
+
+
+def test_iter_format_rows_chunks():
+    time = np.arange(10.0)
+    data = np.ones((10, 4))
+    chunks = list(iter_format_rows(time, data, chunk_size=3))
+    assert len(chunks) == 4
+    assert ''.join(chunks) == format_rows_loop(time, data)
@@ -0,0 +1,116 @@
+import pytest
+import numpy as np
+from systemstoolkit.files.builders import attitude_file
+from systemstoolkit.files.readers import (
+    split_file,
+    parse_data_block,
+    parse_attitude_file,
+    read_attitude_file,
+    MappedAttitudeFile,
+)
+from systemstoolkit.utils import read_file_data
+
+FILE_Q = ('data/AttitudeTimeQuaternions.a', 'Quaternions', (361, 4))
+FILE_A = ('data/AttitudeTimeEulerAngles.a', 'EulerAngles', (721, 3))
+FILE_SP = ('data/AttitudeTimeAzElAngles.sp', 'AzElAngles', (401, 2))
+
+
+@pytest.mark.parametrize('file, format, shape', [FILE_Q, FILE_A, FILE_SP])
+def test_read_attitude_file(file, format, shape):
+    time, data = read_attitude_file(file)
+    assert time.dtype == np.dtype('datetime64[ns]')
+    assert data.dtype == np.float64
+    assert data.shape == shape
+
+    # Agrees with the original line-by-line parser
+    old_time, old_data = read_file_data(file)
+    assert np.all(time.astype('datetime64[ms]') == old_time)
+    assert data == pytest.approx(old_data, abs=1e-5)
+
+
+@pytest.mark.parametrize('file, format, shape', [FILE_Q, FILE_A, FILE_SP])
+def test_split_file(file, format, shape):
+    with open(file) as fd:
+        sections = split_file(fd.read())
+    assert sections.Format == format
+    assert 'scenarioepoch' in sections.Keywords
+    assert 'end' not in sections.Body.lower()
+
+
+def test_parse_written_file():
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(1000) * np.timedelta64(1, 'ms')
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (1000, 1))
+    text = attitude_file(time, data, format='Quaternions')
+
+    new_time, new_data = parse_attitude_file(text)
+    assert np.all(new_time == time)
+    assert np.all(new_data == data)
+
+
+def test_parse_data_block_comments():
+    values = parse_data_block('\n1 2 3 # first\n# skipped\n4 5 6\n')
+    assert values.tolist() == [[1, 2, 3], [4, 5, 6]]
+
+
+@pytest.mark.parametrize('body', [
+    '1 2 3\n4 5\n',
+    '1 2 3\n4 five 6\n',
+    # Ragged rows with a multiple of the column count of values
+    '1 2 3\n4 5\n6 7 8 9',
+    '1 2 3\n4 5 6 7\n8 9 # 10\n',
+])
+def test_parse_data_block_invalid(body):
+    with pytest.raises(ValueError):
+        parse_data_block(body)
+
+
+def test_parse_attitude_file_no_format():
+    with pytest.raises(ValueError):
+        parse_attitude_file('stk.v.11.0\nBEGIN Attitude\nEND Attitude\n')
+
+
+@pytest.mark.parametrize('file, format, shape', [FILE_Q, FILE_A, FILE_SP])
+@pytest.mark.parametrize('stride', [1, 7, 1024])
+def test_mapped_attitude_file(file, format, shape, stride):
+    time, data = read_attitude_file(file)
+
+    with MappedAttitudeFile(file, stride=stride) as mapped:
+        assert len(mapped) == shape[0]
+        assert mapped.format == format
+        assert mapped.index_offset.size == -(-shape[0] // stride)
+
+        for i, j in [(0, 10), (10, 100), (99, 99), (0, shape[0] - 1)]:
+            t, d = mapped.read_window(time[i], time[j])
+            assert np.all(t == time[i:j + 1])
+            assert np.all(d == data[i:j + 1])
+
+
+def test_mapped_attitude_file_outside(tmp_path):
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(100) * np.timedelta64(1, 's')
+    path = tmp_path / 'out.a'
+    attitude_file(time, np.tile([0.0, 0.0, 0.6, 0.8], (100, 1)), format='Quaternions', file=path)
+
+    with MappedAttitudeFile(path, stride=10) as mapped:
+        t, d = mapped.read_window('2022-07-10', '2022-07-11T00:00:05')
+        assert np.all(t == time[:6])
+        t, d = mapped.read_window('2022-07-12', '2022-07-13')
+        assert t.size == 0
+
+
+@pytest.mark.parametrize('block_size', [2 ** 26, 5])
+def test_mapped_attitude_file_comments(block_size, tmp_path, monkeypatch):
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(20) * np.timedelta64(1, 's')
+    text = attitude_file(time, np.tile([0.0, 0.0, 0.6, 0.8], (20, 1)), format='Quaternions')
+    lines = text.splitlines(keepends=True)
+    start = lines.index('AttitudeTimeQuaternions\n') + 1
+    lines[start + 10] = ' ' * 40 + lines[start + 10]
+    lines[start + 5:start + 5] = ['# A comment\n', ' \t\r\n', '\n', ' ' * 40 + '\n']
+    path = tmp_path / 'out.a'
+    path.write_text(''.join(lines))
+
+    monkeypatch.setattr(MappedAttitudeFile, 'block_size', block_size)
+    with MappedAttitudeFile(path, stride=5) as mapped:
+        assert len(mapped) == 20
+        assert np.all(mapped.index_time == time[::5])
+        t, d = mapped.read_window(time[3], time[12])
+        assert np.all(t == time[3:13])
@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+from systemstoolkit.files.builders import attitude_file
+from systemstoolkit.files.formatters import format_rows, iter_format_rows, format_time_column
+from systemstoolkit.files.keywords import TimeFormat
+from systemstoolkit.files.timecache import TimeCache
+from systemstoolkit.utils import read_file_data
+
+
+FILE_Q = 'data/AttitudeTimeQuaternions.a'
+
+
+@pytest.mark.parametrize('time_format', ['EpSec', 'EpDays', 'YYYYDDD', 'ISOYMD'])
+def test_cached_file(time_format):
+    time, data = read_file_data(FILE_Q)
+    cache = TimeCache()
+    expected = attitude_file(time, data, format='quaternions', time_format=time_format)
+
+    for vehicle in [data, -data]:
+        text = attitude_file(time, vehicle, format='quaternions', time_format=time_format, time_cache=cache)
+        assert text == attitude_file(time, vehicle, format='quaternions', time_format=time_format)
+    assert text != expected
+    assert (cache.misses, cache.hits, len(cache)) == (1, 1, 1)
+
+
+def test_format_time_column_widths():
+    # The last chunk has times wider than the field, so the rendered column is padded
+    time = np.array([1.5, 2.25, 3.0, 1e20, 12345678901234567.0])
+    data = np.ones((5, 2))
+    field = format_time_column(time, chunk_size=3)
+    assert field[0].shape[1] > 15
+    assert ''.join(iter_format_rows(time, data, 2, field)) == format_rows(time, data)
+
+
+def test_keys():
+    cache = TimeCache()
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(10) * np.timedelta64(1, 's')
+    epsec = TimeFormat('EpSec')
+
+    first = cache.get(epsec, time, time[0])
+    assert cache.get(epsec, time.copy(), time[0]) is first
+    assert cache.get(epsec, time, time[1]) is not first
+    assert cache.get(TimeFormat('EpMin'), time, time[0]) is not first
+    time[5] += np.timedelta64(1, 's')
+    assert cache.get(epsec, time, time[0]) is not first
+    assert (cache.misses, cache.hits) == (4, 1)
+
+
+def test_eviction():
+    time = np.datetime64('2022-07-11T00:00:00') + np.arange(100) * np.timedelta64(1, 's')
+    epsec = TimeFormat('EpSec')
+    cache = TimeCache()
+    size = cache.get(epsec, time, time[0]).Time.nbytes
+    cache = TimeCache(max_bytes=8 * size)
+
+    entries = [cache.get(epsec, time, epoch) for epoch in time[:20]]
+    assert 0 < len(cache) < 20
+    assert cache.nbytes <= cache.max_bytes
+    # The most recent entry is kept, the first evicted
+    assert cache.get(epsec, time, time[19]) is entries[19]
+    assert cache.get(epsec, time, time[0]) is not entries[0]
+
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
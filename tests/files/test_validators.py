@@ -76,3 +76,84 @@ def test_angle_validator_invalid_values():
     with pytest.raises(InvalidDataError):
         validator = AngleValidator()
         a, b = validator.validate(time, data)
+
+
+def test_quaternion_validator_check(capsys):
+    time = np.arange(10)
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (10, 1))
+    data[[2, 7]] = [1.0, 1.0, 0.0, 0.0]
+    data[5] = np.nan
+
+    result = QuaternionValidator().check(time, data)
+    assert result.Rejected.tolist() == [2, 5, 7]
+    assert result.Time.tolist() == [0, 1, 3, 4, 6, 8, 9]
+    assert result.Data.shape == (7, 4)
+    assert capsys.readouterr().out == ''
+
+
+@pytest.mark.parametrize('validator, data', [
+    (QuaternionValidator(), ONES_SAMPLE_DATA / 2),
+    (AngleValidator(), ONES_SAMPLE_DATA[:, 0:3]),
+    (NoValidator(), ONES_SAMPLE_DATA),
+])
+def test_validator_check_no_copy(validator, data):
+    time = ONES_SAMPLE_TIME
+    result = validator.check(time, data)
+    assert result.Time is time
+    assert result.Data is data
+    assert result.Rejected.size == 0
+
+
+def test_quaternion_validator_blocks(monkeypatch):
+    monkeypatch.setattr('systemstoolkit.files.validators.BLOCK_SIZE', 3)
+    data = np.tile([0.5, 0.5, 0.5, 0.5], (10, 1))
+    data[[0, 4, 9]] *= 2
+    result = QuaternionValidator().check(np.arange(10), data)
+    assert result.Rejected.tolist() == [0, 4, 9]
+
+
+def test_angle_validator_blocks(monkeypatch):
+    monkeypatch.setattr('systemstoolkit.files.validators.BLOCK_SIZE', 3)
+    data = np.tile([10.0, -20.0, 30.0], (10, 1))
+    data[0] = [-400.0, 20.0, 30.0]
+    data[4] = [10.0, -1e9, 30.0]
+    data[9] = [10.0, 20.0, 400.0]
+    result = AngleValidator().check(np.arange(10), data)
+    assert result.Rejected.tolist() == [0, 4, 9]
+
+
+def test_quaternion_validator_repair():
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((100, 4))
+    data /= np.linalg.norm(data, axis=1)[:, None]
+    data[10] *= 1.005
+    data[20] *= 1.5
+    data[30] = np.nan
+    data[40:60] *= -1
+    time = np.arange(100)
+    original = data.copy()
+
+    validator = QuaternionValidator(repair=True)
+    ftime, fdata, rejected = validator.check(time, data)
+    assert rejected.tolist() == [20, 30]
+    assert ftime.size == 98
+    assert np.all(data[~np.isnan(data)] == original[~np.isnan(original)])
+    assert np.linalg.norm(fdata, axis=1) == pytest.approx(1, abs=1e-12)
+    assert np.all(np.einsum('ij,ij->i', fdata[1:], fdata[:-1]) >= 0)
+
+    # Each row is the same rotation as the input row
+    dot = np.abs(np.einsum('ij,ij->i', fdata, original[ftime]))
+    assert dot / np.linalg.norm(original[ftime], axis=1) == pytest.approx(1)
+
+
+def test_quaternion_validator_repair_no_copy():
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (10, 1))
+    result = QuaternionValidator(repair=True).check(ONES_SAMPLE_TIME[:10], data)
+    assert result.Data is data
+
+
+def test_quaternion_validator_repair_no_continuity():
+    data = np.tile([0.0, 0.0, 0.6, 0.8], (10, 1))
+    data[5:] *= -1
+    result = QuaternionValidator(repair=True, continuity=False).check(ONES_SAMPLE_TIME[:10], data)
+    assert result.Data is data
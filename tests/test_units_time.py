@@ -11,6 +11,8 @@ from systemstoolkit.units.time import (
     YYYYDDDTimeUnit,
     YYYYMMDDTimeUnit,
     ISOYMDTimeUnit,
+    civil_from_days,
+    days_from_civil,
 )
 
 UTC_TIMES = [
@@ -58,3 +60,78 @@ def test_epoch_timeunit(time, s, m, h, D):
     for cls, td in zip(EpochTimeUnits, [s, m, h, D]):
         a = cls(epoch=EPOCH)
         assert a.convert(time) == approx(td)
+
+
+@pytest.mark.parametrize('cls', [
+    EpSecTimeUnit, EpMinTimeUnit, EpHrTimeUnit, EpDayTimeUnit,
+    YYYYDDDTimeUnit, YYYYMMDDTimeUnit, ISOYMDTimeUnit,
+])
+def test_to_datetime(cls):
+    time = np.array([
+        '2021-01-01T00:00:00', '2021-01-31T06:00:00',
+        '2021-03-01T12:00:00', '2024-12-31T18:00:00',
+    ], dtype='datetime64[ms]')
+
+    unit = cls(EPOCH)
+    new_time = unit.to_datetime(unit.convert(time))
+    assert new_time.dtype == np.dtype('datetime64[ns]')
+    assert np.all(new_time == time)
+
+
+def test_epoch_to_datetime_nanoseconds():
+    unit = EpSecTimeUnit(EPOCH)
+    time = unit.to_datetime([1e6 + 0.123456789])
+    assert time[0] == EPOCH + np.timedelta64(1_000_000_123_456_789, 'ns')
+
+
+def test_resolution():
+    time = np.datetime64('2021-01-01T00:00:01.000123456')
+
+    # Finer-than-millisecond input is kept by default
+    assert EpSecTimeUnit(EPOCH).convert(time) == 1.000123456
+    assert EpSecTimeUnit(EPOCH, resolution='ms').convert(time) == 1.0
+    assert ISOYMDTimeUnit().convert(time) == '2021-01-01T00:00:01.000123456'
+    assert ISOYMDTimeUnit(resolution='us').convert(time) == '2021-01-01T00:00:01.000123'
+
+    new_time = EpSecTimeUnit(EPOCH, resolution='us').to_datetime([1.000123456])
+    assert new_time.dtype == np.dtype('datetime64[us]')
+
+
+def test_civil_dates():
+    days = np.arange(-800_000, 3_000_000, 97)
+    dates = days.astype('datetime64[D]')
+    year, month, day = civil_from_days(days)
+    assert np.all(year == dates.astype('datetime64[Y]').astype(np.int64) + 1970)
+    assert np.all(month == dates.astype('datetime64[M]').astype(np.int64) % 12 + 1)
+    assert np.all(day == (dates - dates.astype('datetime64[M]')).astype(np.int64) + 1)
+    assert np.all(days_from_civil(year, month, day) == days)
+    # Days past the end of a month run on into the next
+    assert days_from_civil(2021, 2, 29) == days_from_civil(2021, 3, 1)
+
+
+@pytest.mark.parametrize('resolution', ['s', 'ms', 'us', 'ns'])
+def test_isoymd_text(resolution):
+    rng = np.random.default_rng(0)
+    time = np.datetime64('1900-01-01', resolution) + rng.integers(0, 2**62 // 10**9, 1000).astype(f'timedelta64[{resolution}]')
+    unit = ISOYMDTimeUnit(resolution=resolution)
+    assert np.all(unit.convert(time) == time.astype(str))
+    assert unit.convert(time[0]) == str(time[0])
+    assert unit.convert(np.array(['NaT'], dtype=time.dtype))[0] == 'NaT'
+
+
+@pytest.mark.parametrize('cls, text', [
+    (YYYYDDDTimeUnit, '2021365.99999999999999'),
+    (YYYYMMDDTimeUnit, '20211231.99999999999999'),
+])
+def test_utc_text(cls, text):
+    time = np.datetime64('2021-01-01T00:00:00') + np.arange(0, 10**9, 7_777_777) * np.timedelta64(123_456_789, 'ns')
+    unit = cls(resolution='ns')
+    values = unit.to_text(time)
+    assert values.dtype == np.dtype(f'U{len(text)}')
+    # Exact to the nanosecond, unlike float64 values
+    assert np.all(unit.to_datetime(values) == time)
+    assert unit.to_datetime(unit.convert(time)).dtype == time.dtype
+    assert unit.to_text(np.datetime64('2021-12-31T23:59:59.999999999')) == text
+    assert unit.to_datetime(np.array([text[:-7], text[:-7] + '9' * 10]))[1] == np.datetime64('2022-01-01')
+    with pytest.raises(ValueError):
+        cls().to_text(np.datetime64('10000-01-01'))
@@ -2,7 +2,9 @@ import pytest
 import numpy as np
 import datetime
 
-from systemstoolkit.utils import stk_datetime, read_file_data, parse_file_data
+from systemstoolkit.utils import (
+    stk_datetime, read_file_data, parse_file_data, parse_stk_datetime, parse_stk_datetimes
+)
 
 FILE_Q = ('data/AttitudeTimeQuaternions.a', (361, 4))
 FILE_A = ('data/AttitudeTimeEulerAngles.a', (721, 3))
@@ -16,6 +18,16 @@ def test_stk_datetime(input, output) -> None:
     assert stk_datetime(input) == output
 
 
+@pytest.mark.parametrize('input, digits, output', [
+    (np.datetime64('1986-03-04T20:45:00.123456789'), 9, '04 Mar 1986 20:45:00.123456789'),
+    (np.datetime64('1986-03-04T20:45:00.123456789'), 3, '04 Mar 1986 20:45:00.123'),
+    (np.datetime64('1986-03-04T20:45:00.5', 'ns'), 0, '04 Mar 1986 20:45:00'),
+    (datetime.datetime(1986,3,4,20,45,0,123456), 9, '04 Mar 1986 20:45:00.123456000'),
+])
+def test_stk_datetime_digits(input, digits, output) -> None:
+    assert stk_datetime(input, digits) == output
+
+
 def test_stk_datetime_invalid():
     with pytest.raises(TypeError):
         stk_datetime(None)
@@ -40,3 +52,30 @@ def test_parse_file_data(file, shape) -> None:
         text = f.read()
         time, data = parse_file_data(text)
         assert data.shape == shape
+
+
+def test_parse_file_data_precision() -> None:
+    text = 'ScenarioEpoch 1 Jun 2002 12:00:00.000\n0.000123456 0.1 0.2\n1.5 0.3 0.4\n'
+    time, data = parse_file_data(text)
+    assert time.dtype == np.dtype('datetime64[ms]')
+    assert data.dtype == np.float32
+
+    time, data = parse_file_data(text, resolution='ns', dtype='float64')
+    assert time[0] == np.datetime64('2002-06-01T12:00:00.000123456')
+    assert data.tolist() == [[0.1, 0.2], [0.3, 0.4]]
+
+
+@pytest.mark.parametrize('input, output', [
+    ('1 Jun 2002 12:00:00.000000000', '2002-06-01T12:00:00.000000000'),
+    ('01 Jan 2020 03:04:05.6', '2020-01-01T03:04:05.600000000'),
+    ('"04 Mar 1986 20:45:00.123456789"', '1986-03-04T20:45:00.123456789'),
+    ('04 Mar 1986 20:45:00', '1986-03-04T20:45:00.000000000'),
+])
+def test_parse_stk_datetime(input, output) -> None:
+    assert parse_stk_datetime(input) == np.datetime64(output)
+    assert parse_stk_datetimes([input])[0] == np.datetime64(output)
+
+
+def test_parse_stk_datetimes_invalid() -> None:
+    with pytest.raises(ValueError):
+        parse_stk_datetimes(['1 Jun 2002 12:00:00', 'Time (UTCG)'])